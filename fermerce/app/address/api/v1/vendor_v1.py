@@ -36,6 +36,12 @@ async def get_address_list(
     vendor: Vendor = Depends(require_vendor),
     per_page: int = 10,
     page: int = 1,
+    cursor: t.Optional[str] = Query(
+        default=None,
+        description="cursor pagination, send an empty value for the first page "
+        "and the returned next_cursor afterwards",
+    ),
+    count: bool = Query(default=False, description="total_results over all pages"),
     sort_by: t.Optional[SortOrder] = Query(
         default=SortOrder.desc,
         description="order by attribute, e.g. id",
@@ -45,15 +51,21 @@ async def get_address_list(
         description="order by attribute, e.g. id",
     ),
     load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. state"
+    ),
 ):
     return await services.vendor_filter(
         filter_string=filter_string,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         vendor=vendor,
         order_by=order_by,
         sort_by=sort_by,
         load_related=load_related,
+        expand=expand,
     )
 
 
@@ -66,11 +78,15 @@ async def get_address(
     address_id: uuid.UUID,
     vendor: Vendor = Depends(require_vendor),
     load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. state"
+    ),
 ):
     return await services.vendor_get(
         address_id=address_id,
         vendor=vendor,
         load_related=load_related,
+        expand=expand,
     )
 
 
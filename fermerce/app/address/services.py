@@ -2,7 +2,7 @@ import uuid
 import typing as t
 from fastapi import status, Response
 from tortoise.expressions import Q
-from fermerce.app.state.models import State
+from fermerce.app.state.services import state_cache
 from fermerce.app.user.models import User
 from fermerce.app.vendor.models import Vendor
 from fermerce.core.enum.sort_type import SortOrder
@@ -12,7 +12,7 @@ from fermerce.app.address import schemas, models
 
 
 async def user_create(data_in: schemas.IAddressIn, user: User) -> models.Address:
-    get_state = await State.get_or_none(id=data_in.state)
+    get_state = await state_cache.get(data_in.state)
     if not get_state:
         raise error.NotFoundError("shipping state not found")
 
@@ -38,7 +38,7 @@ async def user_create(data_in: schemas.IAddressIn, user: User) -> models.Address
 
 
 async def vendor_create(data_in: schemas.IAddressIn, vendor: Vendor):
-    get_state = await State.get_or_none(id=data_in.state)
+    get_state = await state_cache.get(data_in.state)
     if not get_state:
         raise error.NotFoundError("state not found")
     check_address = await models.Address.get_or_none(
@@ -65,12 +65,14 @@ async def user_get(
     address_id: uuid.UUID,
     user: User,
     load_related: bool = False,
+    expand: str = "",
 ) -> models.Address:
     query = models.Address.filter(id=address_id, users=user)
     result = await filter_and_single(
         model=models.Address,
         query=query,
         load_related=load_related,
+        expand=expand,
     )
     if not result:
         raise error.NotFoundError("address not found")
@@ -81,12 +83,14 @@ async def vendor_get(
     address_id: uuid.UUID,
     vendor: Vendor,
     load_related: bool = False,
+    expand: str = "",
 ) -> models.Address:
     query = models.Address.filter(id=address_id).filter(vendors__in=[vendor])
     result = await filter_and_single(
         model=models.Address,
         query=query,
         load_related=load_related,
+        expand=expand,
     )
     if not result:
         raise error.NotFoundError("address not found")
@@ -106,7 +110,7 @@ async def user_update(
         raise error.NotFoundError("Address not found")
     state = get_address.state
     if state.id != data_in.state:
-        state = await State.get_or_none(id=data_in.state)
+        state = await state_cache.get(data_in.state)
     if not state:
         raise error.NotFoundError("shipping state not found")
 
@@ -153,7 +157,7 @@ async def vendor_update(
         raise error.NotFoundError("Address not found")
     state = get_address.state
     if state.id != data_in.state:
-        state = await State.get_or_none(id=data_in.state)
+        state = await state_cache.get(data_in.state)
     if not state:
         raise error.NotFoundError("state not found")
 
@@ -193,9 +197,12 @@ async def user_filter(
     filter_string: str = "",
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
     load_related: bool = False,
+    expand: str = "",
 ) -> t.List[models.Address]:
     query = models.Address
     if filter_string:
@@ -212,9 +219,12 @@ async def user_filter(
         model=models.Address,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         sort_by=sort_by,
         order_by=order_by,
         load_related=load_related,
+        expand=expand,
     )
 
 
@@ -223,9 +233,12 @@ async def vendor_filter(
     filter_string: str = "",
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
     load_related: bool = False,
+    expand: str = "",
 ) -> t.List[models.Address]:
     query = models.Address
     if filter_string:
@@ -242,9 +255,12 @@ async def vendor_filter(
         model=models.Address,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         sort_by=sort_by,
         order_by=order_by,
         load_related=load_related,
+        expand=expand,
     )
 
 
@@ -5,19 +5,19 @@ from tortoise import fields, models
 
 class Auth(models.Model):
     """
-    The Auth model
+    A login session; ``id`` is the ``jti`` claim of the tokens issued for it
+    and only a sha256 digest of the refresh token is stored.
     """
 
-    id = fields.UUIDField(pk=True, default=uuid.uuid4())
-    refresh_token = fields.CharField(max_length=300, null=True)
-    access_token = fields.CharField(max_length=300, null=True)
-    owner_id = fields.UUIDField(null=True)
-    ip_address = fields.CharField(
-        max_length=20, unique=True, null=False, index=True
-    )
+    id = fields.UUIDField(pk=True, default=uuid.uuid4)
+    refresh_token_hash = fields.CharField(max_length=64, unique=True)
+    owner_id = fields.UUIDField(index=True)
+    ip_address = fields.CharField(max_length=45, null=True)
+    expires_at = fields.DatetimeField(index=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
 
     class Meta:
-        table = "fm_auth_token_manager"
+        table = "fm_auth_session"
 
     @staticmethod
     def get_user_ip(request: Request) -> str:
@@ -10,6 +10,7 @@ class IToken(pyd.BaseModel):
 
 class IToEncode(pyd.BaseModel):
     user_id: str
+    permissions: t.Optional[t.List[str]] = None
 
 
 class ILogin(pyd.BaseModel):
@@ -1,64 +1,57 @@
 import typing as t
 import uuid
-from fastapi import BackgroundTasks, Request
-from fermerce.core.schemas.response import IResponseMessage
+from fastapi import Request
+from fermerce.app.permission.models import Permission
+from fermerce.core.settings import config
 from fermerce.lib.errors import error
-from fermerce.app.auth import schemas, models
+from fermerce.app.auth import schemas, models, sessions
 from fermerce.lib.utils.security import JWTAUTH
-from fermerce.taskiq.auth.tasks import create_token
 
 
-async def login(
-    request: Request,
-    task: BackgroundTasks,
-    user_id: uuid.UUID,
-) -> t.Union[schemas.IToken, IResponseMessage]:
-    get_jwt_data_for_encode = schemas.IToEncode(user_id=str(user_id))
-    access_token, refresh_token = JWTAUTH.jwt_encoder(
-        data=get_jwt_data_for_encode.dict()
-    )
-    if access_token and refresh_token:
-        user_ip = models.Auth.get_user_ip(request)
-        task.add_task(
-            create_token,
-            owner_id=str(user_id),
-            access_token=access_token,
-            refresh_token=refresh_token,
-            user_ip=user_ip,
-        )
-        return schemas.IToken(
-            refresh_token=refresh_token, access_token=access_token
-        )
-    raise error.ServerError("Count not authenticate user")
+async def get_token_data(user_id: uuid.UUID) -> dict:
+    data = schemas.IToEncode(user_id=str(user_id))
+    if config.jwt_permission_claim:
+        data.permissions = await Permission.filter(
+            staffs__user_id=user_id
+        ).values_list("name", flat=True)
+    return data.dict(exclude_none=True)
+
+
+async def start_session(
+    user_id: uuid.UUID, user_ip: str, replaces: t.Optional[uuid.UUID] = None
+) -> schemas.IToken:
+    session = sessions.new_session(user_id, user_ip)
+    data = await get_token_data(user_id)
+    data["jti"] = str(session.id)
+    access_token, refresh_token = JWTAUTH.jwt_encoder(data=data)
+    if not access_token or not refresh_token:
+        raise error.ServerError("could not create token, please try again")
+    session.refresh_token_hash = sessions.hash_token(refresh_token)
+    store = sessions.get_session_store()
+    if replaces is None:
+        await store.create(session)
+    elif not await store.rotate(replaces, session):
+        # the refresh token was spent by a concurrent request
+        raise error.UnauthorizedError()
+    return schemas.IToken(refresh_token=refresh_token, access_token=access_token)
+
+
+async def login(request: Request, user_id: uuid.UUID) -> schemas.IToken:
+    return await start_session(user_id, models.Auth.get_user_ip(request))
 
 
 async def login_token_refresh(
-    data_in: schemas.IRefreshToken, request: Request, task: BackgroundTasks
+    data_in: schemas.IRefreshToken, request: Request
 ) -> schemas.IToken:
-    check_auth_token = await models.Auth.get_or_none(
-        refresh_token=data_in.refresh_token
-    )
-    if not check_auth_token:
+    payload = JWTAUTH.data_decoder(encoded_data=data_in.refresh_token)
+    session = await sessions.get_session_store().get_by_token(data_in.refresh_token)
+    if not session or str(session.id) != payload.get("jti"):
         raise error.UnauthorizedError()
     user_ip: str = models.Auth.get_user_ip(request)
-    JWTAUTH.data_decoder(encoded_data=data_in.refresh_token)
-    if check_auth_token.ip_address != user_ip:
+    if session.ip_address != user_ip:
         raise error.UnauthorizedError()
-    get_jwt_data_for_encode = schemas.IToEncode(
-        user_id=str(check_auth_token.owner_id)
-    )
-    access_token, refresh_token = JWTAUTH.jwt_encoder(
-        data=get_jwt_data_for_encode.dict()
-    )
-    if access_token and refresh_token:
-        task.add_task(
-            create_token,
-            owner_id=str(check_auth_token.owner_id),
-            access_token=access_token,
-            refresh_token=refresh_token,
-            user_ip=user_ip,
-        )
-        return schemas.IToken(
-            refresh_token=refresh_token, access_token=access_token
-        )
-    raise error.ServerError("could not create token, please try again")
+    return await start_session(session.owner_id, user_ip, replaces=session.id)
+
+
+async def revoke_sessions(owner_id: uuid.UUID) -> None:
+    await sessions.get_session_store().revoke_owner(owner_id)
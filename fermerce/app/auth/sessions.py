@@ -0,0 +1,193 @@
+import abc
+import asyncio
+import dataclasses
+import datetime
+import hashlib
+import logging
+import typing as t
+import uuid
+from tortoise import timezone
+from tortoise.transactions import in_transaction
+from fermerce.app.auth.models import Auth
+from fermerce.core.settings import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class Session:
+    id: uuid.UUID
+    owner_id: uuid.UUID
+    refresh_token_hash: str
+    expires_at: datetime.datetime
+    ip_address: t.Optional[str] = None
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def new_session(
+    owner_id: t.Union[uuid.UUID, str], ip_address: t.Optional[str] = None
+) -> Session:
+    """A session without its refresh token yet; its id is the token's jti."""
+    return Session(
+        id=uuid.uuid4(),
+        owner_id=uuid.UUID(str(owner_id)),
+        refresh_token_hash="",
+        expires_at=timezone.now() + config.get_refresh_expires_time(),
+        ip_address=ip_address,
+    )
+
+
+class SessionStore(abc.ABC):
+    @abc.abstractmethod
+    async def create(self, session: Session) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_by_token(self, refresh_token: str) -> t.Optional[Session]:
+        """The live session a refresh token was issued for."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def rotate(self, old_id: uuid.UUID, session: Session) -> bool:
+        """Replace a session with ``session``; False if it was already used."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def revoke(self, session_id: uuid.UUID) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def revoke_owner(self, owner_id: uuid.UUID) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete_expired(self, batch_size: int = 1000) -> int:
+        raise NotImplementedError
+
+
+class DatabaseSessionStore(SessionStore):
+    @staticmethod
+    def to_session(auth: Auth) -> Session:
+        return Session(
+            id=auth.id,
+            owner_id=auth.owner_id,
+            refresh_token_hash=auth.refresh_token_hash,
+            expires_at=auth.expires_at,
+            ip_address=auth.ip_address,
+        )
+
+    async def create(self, session: Session) -> None:
+        await Auth.create(**dataclasses.asdict(session))
+
+    async def get_by_token(self, refresh_token: str) -> t.Optional[Session]:
+        auth = await Auth.get_or_none(
+            refresh_token_hash=hash_token(refresh_token),
+            expires_at__gt=timezone.now(),
+        )
+        return self.to_session(auth) if auth else None
+
+    async def rotate(self, old_id: uuid.UUID, session: Session) -> bool:
+        async with in_transaction() as connection:
+            # the delete settles concurrent refreshes: only one of them sees a row
+            deleted = await Auth.filter(id=old_id).using_db(connection).delete()
+            if not deleted:
+                return False
+            await Auth.create(**dataclasses.asdict(session), using_db=connection)
+        return True
+
+    async def revoke(self, session_id: uuid.UUID) -> None:
+        await Auth.filter(id=session_id).delete()
+
+    async def revoke_owner(self, owner_id: uuid.UUID) -> None:
+        await Auth.filter(owner_id=owner_id).delete()
+
+    async def delete_expired(self, batch_size: int = 1000) -> int:
+        expired = (
+            await Auth.filter(expires_at__lte=timezone.now())
+            .limit(batch_size)
+            .values_list("id", flat=True)
+        )
+        if not expired:
+            return 0
+        return await Auth.filter(id__in=expired).delete()
+
+
+class MemorySessionStore(SessionStore):
+    """Sessions held in this process, for tests and single-worker deployments.
+
+    Entries are keyed the way a key-value server would hold them, by id and by
+    token hash, so a networked store can follow the same layout.
+    """
+
+    def __init__(self) -> None:
+        self.sessions: t.Dict[uuid.UUID, Session] = {}
+        self.by_token: t.Dict[str, uuid.UUID] = {}
+
+    async def create(self, session: Session) -> None:
+        self.sessions[session.id] = session
+        self.by_token[session.refresh_token_hash] = session.id
+
+    async def get_by_token(self, refresh_token: str) -> t.Optional[Session]:
+        session_id = self.by_token.get(hash_token(refresh_token))
+        session = self.sessions.get(session_id)
+        if session is None or session.expires_at <= timezone.now():
+            return None
+        return session
+
+    async def rotate(self, old_id: uuid.UUID, session: Session) -> bool:
+        if old_id not in self.sessions:
+            return False
+        await self.revoke(old_id)
+        await self.create(session)
+        return True
+
+    async def revoke(self, session_id: uuid.UUID) -> None:
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            self.by_token.pop(session.refresh_token_hash, None)
+
+    async def revoke_owner(self, owner_id: uuid.UUID) -> None:
+        for session in list(self.sessions.values()):
+            if session.owner_id == owner_id:
+                await self.revoke(session.id)
+
+    async def delete_expired(self, batch_size: int = 1000) -> int:
+        now = timezone.now()
+        expired = [
+            session.id
+            for session in self.sessions.values()
+            if session.expires_at <= now
+        ][:batch_size]
+        for session_id in expired:
+            await self.revoke(session_id)
+        return len(expired)
+
+
+_store: t.Optional[SessionStore] = None
+
+
+def get_session_store() -> SessionStore:
+    global _store
+    if _store is None:
+        if config.auth_session_store == "memory":
+            _store = MemorySessionStore()
+        else:
+            _store = DatabaseSessionStore()
+    return _store
+
+
+async def run_cleanup(interval: t.Optional[float] = None) -> None:
+    interval = interval or config.auth_session_cleanup_interval
+    store = get_session_store()
+    while True:
+        try:
+            while await store.delete_expired():
+                pass
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("session cleanup failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,92 @@
+import asyncio
+import datetime
+import uuid
+import pytest
+from starlette.requests import Request
+from tortoise import timezone
+from fermerce.app.auth import schemas, services, sessions
+from fermerce.lib.errors import error
+
+
+def make_request(ip: str = "10.0.0.1") -> Request:
+    return Request({"type": "http", "headers": [], "client": (ip, 4000)})
+
+
+@pytest.fixture(params=["memory", "database"])
+def store(request, monkeypatch):
+    if request.param == "database":
+        request.getfixturevalue("db")
+        store = sessions.DatabaseSessionStore()
+    else:
+        store = sessions.MemorySessionStore()
+    monkeypatch.setattr(sessions, "_store", store)
+    return store
+
+
+async def refresh(token: schemas.IToken, ip: str = "10.0.0.1") -> schemas.IToken:
+    return await services.login_token_refresh(
+        schemas.IRefreshToken(refresh_token=token.refresh_token), make_request(ip)
+    )
+
+
+async def test_refresh_rotates_the_refresh_token(store):
+    user_id = uuid.uuid4()
+    first = await services.login(make_request(), user_id)
+    second = await refresh(first)
+    assert second.refresh_token != first.refresh_token
+    third = await refresh(second)
+    assert await store.get_by_token(first.refresh_token) is None
+    assert await store.get_by_token(second.refresh_token) is None
+    session = await store.get_by_token(third.refresh_token)
+    assert session.owner_id == user_id
+
+
+async def test_a_spent_refresh_token_is_rejected(store):
+    token = await services.login(make_request(), uuid.uuid4())
+    await refresh(token)
+    with pytest.raises(error.UnauthorizedError):
+        await refresh(token)
+
+
+async def test_concurrent_refreshes_of_one_token_let_one_through(store):
+    token = await services.login(make_request(), uuid.uuid4())
+    results = await asyncio.gather(
+        *[refresh(token) for _ in range(5)], return_exceptions=True
+    )
+    assert len([r for r in results if isinstance(r, schemas.IToken)]) == 1
+    assert all(
+        isinstance(r, error.UnauthorizedError)
+        for r in results
+        if not isinstance(r, schemas.IToken)
+    )
+
+
+async def test_refresh_from_another_ip_is_rejected(store):
+    token = await services.login(make_request(), uuid.uuid4())
+    with pytest.raises(error.UnauthorizedError):
+        await refresh(token, ip="10.0.0.2")
+    assert await refresh(token)
+
+
+async def test_revoked_sessions_cannot_refresh(store):
+    user_id = uuid.uuid4()
+    tokens = [await services.login(make_request(), user_id) for _ in range(2)]
+    other = await services.login(make_request(), uuid.uuid4())
+    await services.revoke_sessions(user_id)
+    for token in tokens:
+        with pytest.raises(error.UnauthorizedError):
+            await refresh(token)
+    assert await refresh(other)
+
+
+async def test_delete_expired_keeps_live_sessions(store):
+    live = await services.login(make_request(), uuid.uuid4())
+    for _ in range(3):
+        session = sessions.new_session(uuid.uuid4())
+        session.refresh_token_hash = uuid.uuid4().hex
+        session.expires_at = timezone.now() - datetime.timedelta(seconds=1)
+        await store.create(session)
+    assert await store.delete_expired(batch_size=2) == 2
+    assert await store.delete_expired(batch_size=2) == 1
+    assert await store.delete_expired() == 0
+    assert await store.get_by_token(live.refresh_token)
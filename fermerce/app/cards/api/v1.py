@@ -26,12 +26,16 @@ async def get_cards(
         default="", description="order by attribute, e.g. id, created_at"
     ),
     load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, none for saved cards"
+    ),
     user: User = Depends(dependency.require_user),
 ):
     return await services.get_saved_cards(
         user=user,
         filter_string=filter_string,
         load_related=load_related,
+        expand=expand,
         select=select,
     )
 
@@ -41,11 +45,15 @@ async def get_card(
     card_id: uuid.UUID,
     user: User = Depends(dependency.require_user),
     load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, none for saved cards"
+    ),
 ):
     return await services.get_saved_card(
         card_id=card_id,
         user=user,
         load_related=load_related,
+        expand=expand,
     )
 
 
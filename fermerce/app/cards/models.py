@@ -19,3 +19,4 @@ class SaveCard(models.Model):
 
     class Meta:
         table = "fm_save_payment_card"
+        expandable = ()
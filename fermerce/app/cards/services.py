@@ -34,12 +34,14 @@ async def get_saved_card(
     card_id: uuid.UUID,
     user: User,
     load_related: bool = False,
+    expand: str = "",
 ) -> models.SaveCard:
     query = models.SaveCard.filter(id=card_id, user=user)
     get_card = await filter_and_single(
         query=query,
         model=models.SaveCard,
         load_related=load_related,
+        expand=expand,
     )
     if get_card:
         return get_card
@@ -50,6 +52,7 @@ async def get_saved_cards(
     user: User,
     filter_string: str,
     load_related: bool = False,
+    expand: str = "",
 ) -> t.List[models.SaveCard]:
     query = models.SaveCard.filter(user=user)
     if filter_string:
@@ -62,5 +65,6 @@ async def get_saved_cards(
         query=query,
         model=models.SaveCard,
         load_related=load_related,
+        expand=expand,
     )
     return get_cards
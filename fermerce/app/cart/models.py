@@ -13,7 +13,16 @@ class Cart(models.Model):
     selling_unit: fields.ForeignKeyRelation[
         ProductSellingUnit
     ] = fields.ForeignKeyField("models.ProductSellingUnit")
+    # stock currently held back for this cart, handed back once reserved_until passes
+    reserved_quantity = fields.IntField(default=0, null=False)
+    reserved_until = fields.DatetimeField(null=True, index=True)
     created_at: fields.DatetimeField(auto_now=True)
 
     class Meta:
         table = "fm_cart"
+        expandable = (
+            "product",
+            "selling_unit",
+            "product__cover_media",
+            "selling_unit__unit",
+        )
@@ -0,0 +1,107 @@
+import asyncio
+import datetime
+import logging
+import typing as t
+import uuid
+from collections import Counter
+from tortoise import timezone
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.expressions import F
+from tortoise.transactions import in_transaction
+from fermerce.app.cart.models import Cart
+from fermerce.app.selling_units.models import ProductSellingUnit
+from fermerce.core.settings import config
+
+logger = logging.getLogger(__name__)
+
+
+def get_reservation_expiry() -> datetime.datetime:
+    return timezone.now() + datetime.timedelta(seconds=config.cart_reservation_ttl)
+
+
+async def take_stock(
+    selling_unit_id: uuid.UUID,
+    quantity: int,
+    connection: t.Optional[BaseDBAsyncClient] = None,
+) -> bool:
+    """Decrement stock with one conditional UPDATE; False when too little is left.
+
+    The row is only locked for the statement itself, so concurrent carts on the
+    same selling unit never wait on a read-modify-write round trip.
+    """
+    if quantity <= 0:
+        return True
+    updated = (
+        await ProductSellingUnit.filter(id=selling_unit_id, size__gte=quantity)
+        .using_db(connection)
+        .update(size=F("size") - quantity)
+    )
+    return updated > 0
+
+
+async def return_stock(
+    selling_unit_id: uuid.UUID,
+    quantity: int,
+    connection: t.Optional[BaseDBAsyncClient] = None,
+) -> None:
+    if quantity > 0:
+        await ProductSellingUnit.filter(id=selling_unit_id).using_db(connection).update(
+            size=F("size") + quantity
+        )
+
+
+async def release_cart(
+    cart: Cart, connection: t.Optional[BaseDBAsyncClient] = None
+) -> None:
+    """Hand a cart's reserved stock back, unless the sweeper already did."""
+    if not cart.reserved_quantity:
+        return
+    released = (
+        await Cart.filter(id=cart.id, reserved_quantity=cart.reserved_quantity)
+        .using_db(connection)
+        .update(reserved_quantity=0, reserved_until=None)
+    )
+    if released:
+        await return_stock(cart.selling_unit_id, cart.reserved_quantity, connection)
+    cart.reserved_quantity = 0
+    cart.reserved_until = None
+
+
+async def release_expired(batch_size: int = 500) -> int:
+    """Release reservations whose ttl has passed; returns how many carts were freed."""
+    expired = (
+        await Cart.filter(reserved_quantity__gt=0, reserved_until__lt=timezone.now())
+        .limit(batch_size)
+        .values_list("id", "selling_unit_id", "reserved_quantity")
+    )
+    if not expired:
+        return 0
+    released_count = 0
+    to_return = Counter()
+    async with in_transaction() as connection:
+        for cart_id, selling_unit_id, quantity in expired:
+            # a cart touched since the select above keeps its new reservation
+            released = (
+                await Cart.filter(id=cart_id, reserved_quantity=quantity)
+                .using_db(connection)
+                .update(reserved_quantity=0, reserved_until=None)
+            )
+            if released:
+                to_return[selling_unit_id] += quantity
+                released_count += 1
+        for selling_unit_id, quantity in to_return.items():
+            await return_stock(selling_unit_id, quantity, connection)
+    return released_count
+
+
+async def run_sweeper(interval: t.Optional[float] = None) -> None:
+    interval = interval or config.reservation_sweep_interval
+    while True:
+        try:
+            while await release_expired():
+                pass
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("reservation sweep failed")
+        await asyncio.sleep(interval)
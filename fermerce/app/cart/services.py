@@ -2,16 +2,31 @@ import typing as t
 import uuid
 from fastapi import status, Response
 from tortoise.expressions import Q
+from tortoise.transactions import in_transaction
 from fermerce.app.cart.models import Cart
 from fermerce.app.selling_units.models import ProductSellingUnit
 from fermerce.app.user.models import User
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.services.base import filter_and_list
 from fermerce.lib.errors import error
-from fermerce.app.cart import models, schemas
+from fermerce.app.cart import models, reservation, schemas
 from fermerce.app.product.models import Product
 
 
+async def get_stock_error(
+    selling_unit_id: uuid.UUID, product: Product
+) -> error.BadDataError:
+    size = (
+        await ProductSellingUnit.filter(id=selling_unit_id)
+        .first()
+        .values_list("size", flat=True)
+    )
+    if not size:
+        await Product.filter(id=product.id).update(in_stock=False)
+        return error.BadDataError("Product is out of stock")
+    return error.BadDataError(f"only {size} of {product.name} left for this product")
+
+
 async def create(data_in: schemas.ICartIn, user: User) -> models.Cart:
     get_product = await Product.get_or_none(id=data_in.product_id)
     if not get_product:
@@ -19,22 +34,20 @@ async def create(data_in: schemas.ICartIn, user: User) -> models.Cart:
     selling_unit = await ProductSellingUnit.get_or_none(id=data_in.selling_unit)
     if not selling_unit:
         raise error.NotFoundError("Product selling unit not found")
-    if selling_unit.size == 0:
-        raise error.BadDataError("Product is out of stock")
-    if selling_unit.size < data_in.quantity:
-        raise error.BadDataError(
-            f"only {selling_unit.size} of {get_product.name} left for this product"
+    async with in_transaction() as connection:
+        if not await reservation.take_stock(
+            selling_unit.id, data_in.quantity, connection
+        ):
+            raise await get_stock_error(selling_unit.id, get_product)
+        new_cart = await Cart.create(
+            user=user,
+            product=get_product,
+            quantity=data_in.quantity,
+            selling_unit=selling_unit,
+            reserved_quantity=data_in.quantity,
+            reserved_until=reservation.get_reservation_expiry(),
+            using_db=connection,
         )
-    else:
-        selling_unit.update_from_dict(dict(size=selling_unit.size - data_in.quantity))
-        await selling_unit.save()
-
-    new_cart = await Cart.create(
-        user=user,
-        product=get_product,
-        quantity=data_in.quantity,
-        selling_unit=selling_unit,
-    )
     if not new_cart:
         raise error.ServerError("Error add product to cart")
     return new_cart
@@ -52,39 +65,37 @@ async def update(
     selling_unit = await ProductSellingUnit.get_or_none(id=data_in.selling_unit)
     if not selling_unit:
         raise error.NotFoundError("Product selling unit not found")
-    if selling_unit.size == 0:
-        await Product.filter(id=data_in.product_id).update(in_stock=False)
-        raise error.BadDataError("Product is out of stock")
-    if selling_unit != get_cart.selling_unit:
-        if (
-            selling_unit.size < get_cart.quantity
-            or selling_unit.size < data_in.quantity
+    async with in_transaction() as connection:
+        if selling_unit.id != get_cart.selling_unit_id:
+            await reservation.release_cart(get_cart, connection)
+        # only the difference to what the cart already holds touches the stock row
+        needed = data_in.quantity - get_cart.reserved_quantity
+        if needed > 0 and not await reservation.take_stock(
+            selling_unit.id, needed, connection
         ):
-            raise error.BadDataError(
-                f"only {selling_unit.size} quantity of {get_product.name} left for this product"
-            )
-    if get_cart.quantity != data_in.quantity:
-        if data_in.quantity < get_cart.quantity:
-            selling_unit.update_from_dict(
-                dict(size=selling_unit.size + (get_cart.quantity - data_in.quantity))
+            raise await get_stock_error(selling_unit.id, get_product)
+        if needed < 0:
+            await reservation.return_stock(selling_unit.id, -needed, connection)
+        to_update = dict(
+            product_id=get_product.id,
+            selling_unit_id=selling_unit.id,
+            quantity=data_in.quantity,
+            reserved_quantity=data_in.quantity,
+            reserved_until=reservation.get_reservation_expiry(),
+        )
+        updated = (
+            await Cart.filter(
+                id=get_cart.id, reserved_quantity=get_cart.reserved_quantity
             )
-            await selling_unit.save()
-        if selling_unit.size > get_cart.quantity:
-            selling_unit.update_from_dict(
-                dict(size=selling_unit.size + (get_cart.quantity - data_in.quantity))
+            .using_db(connection)
+            .update(**to_update)
+        )
+        if not updated:
+            raise error.DuplicateError(
+                "Cart was changed by another request, please try again"
             )
-            await selling_unit.save()
-
-    else:
-        selling_unit.update_from_dict(dict(size=selling_unit.size - data_in.quantity))
-        await selling_unit.save()
-
-    get_cart.update_from_dict(dict(quantity=data_in.quantity))
-    try:
-        await get_cart.save()
-        return get_cart
-    except:
-        raise error.ServerError("Error add product to cart")
+    get_cart.update_from_dict(to_update)
+    return get_cart
 
 
 async def get(cart_id: uuid.UUID, user: User) -> models.Cart:
@@ -99,9 +110,12 @@ async def filter(
     filter_string: str = None,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = "id",
     load_related: bool = False,
+    expand: str = "",
     select: str = "",
 ) -> t.List[models.Cart]:
     query = Cart.filter(user=user)
@@ -112,9 +126,12 @@ async def filter(
         query=query,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         sort_by=sort_by,
         order_by=order_by,
         load_related=load_related,
+        expand=expand,
         select=select,
     )
 
@@ -125,9 +142,7 @@ async def delete(cart_id: uuid.UUID, user: User):
     get_cart = await Cart.get_or_none(id=cart_id, user=user)
     if not get_cart:
         raise error.NotFoundError("Cart not found")
-    get_selling_unit = await ProductSellingUnit.get_or_none(id=get_cart.selling_unit.id)
-    if get_selling_unit:
-        get_selling_unit.update_from_dict(dict(size=get_cart.quantity))
-        await get_selling_unit.save()
-    await get_cart.delete()
+    async with in_transaction() as connection:
+        await reservation.release_cart(get_cart, connection)
+        await get_cart.delete(using_db=connection)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,112 @@
+import asyncio
+import datetime
+import logging
+import uuid
+import pytest
+from tortoise import timezone
+from fermerce.app.cart import reservation
+from fermerce.app.cart.models import Cart
+from fermerce.app.measuring_unit.models import MeasuringUnit
+from fermerce.app.product.models import Product
+from fermerce.app.selling_units.models import ProductSellingUnit
+from fermerce.app.user.models import User
+from fermerce.app.vendor.models import Vendor
+
+
+@pytest.fixture
+async def selling_unit(db):
+    vendor = await Vendor.create(business_name="v", password="x", phone_number="1")
+    product = await Product.create(
+        name="Tomato", slug="tomato", description="d", vendor=vendor, sku="t1"
+    )
+    unit = await MeasuringUnit.create(unit="kg")
+    return await ProductSellingUnit.create(
+        unit=unit, size=20, price=10, product=product
+    )
+
+
+async def get_stock(selling_unit: ProductSellingUnit) -> int:
+    return await ProductSellingUnit.get(id=selling_unit.id).values_list(
+        "size", flat=True
+    )
+
+
+async def reserve(
+    selling_unit: ProductSellingUnit, quantity: int, expires_in: float
+) -> Cart:
+    name = uuid.uuid4().hex[:16]
+    user = await User.create(
+        id=uuid.uuid4(), username=name, email=f"{name}@test", lastname=name
+    )
+    assert await reservation.take_stock(selling_unit.id, quantity)
+    return await Cart.create(
+        product_id=selling_unit.product_id,
+        user=user,
+        selling_unit=selling_unit,
+        quantity=quantity,
+        reserved_quantity=quantity,
+        reserved_until=timezone.now() + datetime.timedelta(seconds=expires_in),
+    )
+
+
+async def test_take_stock_refuses_more_than_is_left(selling_unit):
+    assert await reservation.take_stock(selling_unit.id, 15)
+    assert not await reservation.take_stock(selling_unit.id, 6)
+    assert await get_stock(selling_unit) == 5
+    assert await reservation.take_stock(selling_unit.id, 0)
+
+
+async def test_concurrent_take_stock_never_oversells(selling_unit):
+    taken = await asyncio.gather(
+        *[reservation.take_stock(selling_unit.id, 3) for _ in range(10)]
+    )
+    assert taken.count(True) == 6
+    assert await get_stock(selling_unit) == 2
+
+
+async def test_release_expired_returns_only_expired_stock(selling_unit):
+    expired = await reserve(selling_unit, 4, expires_in=-60)
+    live = await reserve(selling_unit, 6, expires_in=600)
+    assert await get_stock(selling_unit) == 10
+
+    assert await reservation.release_expired() == 1
+    assert await get_stock(selling_unit) == 14
+    await expired.refresh_from_db()
+    await live.refresh_from_db()
+    assert (expired.reserved_quantity, expired.reserved_until) == (0, None)
+    assert live.reserved_quantity == 6
+    assert await reservation.release_expired() == 0
+
+
+async def test_release_expired_works_in_batches(selling_unit):
+    for quantity in (1, 2, 3):
+        await reserve(selling_unit, quantity, expires_in=-60)
+    assert await reservation.release_expired(batch_size=2) == 2
+    assert await reservation.release_expired(batch_size=2) == 1
+    assert await get_stock(selling_unit) == 20
+
+
+async def test_release_cart_after_the_sweeper_returns_nothing(selling_unit):
+    cart = await reserve(selling_unit, 5, expires_in=-60)
+    assert await reservation.release_expired() == 1
+    await reservation.release_cart(cart)
+    assert await get_stock(selling_unit) == 20
+
+
+async def test_sweeper_logs_failures_and_keeps_running(monkeypatch, caplog):
+    calls = []
+
+    async def failing(batch_size: int = 500) -> int:
+        calls.append(batch_size)
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(reservation, "release_expired", failing)
+    with caplog.at_level(logging.ERROR, logger=reservation.__name__):
+        sweeper = asyncio.create_task(reservation.run_sweeper(interval=0.01))
+        await asyncio.sleep(0.05)
+        sweeper.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await sweeper
+    assert len(calls) > 1
+    assert "reservation sweep failed" in caplog.text
+    assert "database is down" in caplog.text
@@ -39,6 +39,12 @@ async def get_product_category_list(
     ),
     per_page: int = 10,
     page: int = 1,
+    cursor: t.Optional[str] = Query(
+        default=None,
+        description="cursor pagination, send an empty value for the first page "
+        "and the returned next_cursor afterwards",
+    ),
+    count: bool = Query(default=False, description="total_results over all pages"),
     sort_by: t.Optional[SortOrder] = Query(
         default=SortOrder.desc, description="order by attribute, e.g. id"
     ),
@@ -50,6 +56,8 @@ async def get_product_category_list(
         filter_string=filter_string,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         select=select,
         order_by=order_by,
         sort_by=sort_by,
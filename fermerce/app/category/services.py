@@ -6,6 +6,7 @@ from fermerce.core.schemas.response import ITotalCount
 from fermerce.core.services.base import filter_and_list
 from fermerce.lib.errors import error
 from fermerce.app.category import schemas, models
+from fermerce.taskiq.product.tasks import refresh_product_search_documents
 from fastapi import Response
 
 
@@ -39,6 +40,8 @@ async def filter(
     filter_string: str,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     select: str = None,
     order_by: str = None,
     sort_by: SortOrder = SortOrder.asc,
@@ -52,6 +55,8 @@ async def filter(
         query=query,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         select=select,
         sort_by=sort_by,
         order_by=order_by,
@@ -78,8 +83,16 @@ async def update(
     check_name = await models.ProductCategory.get_or_none(name=data_in.name)
     if check_name and check_name.id != product_category_id:
         raise error.DuplicateError("product category already exists")
+    renamed = check_product_category.name != data_in.name
     check_product_category.update_from_dict(data_in.dict())
     await check_product_category.save()
+    if renamed:
+        product_ids = await check_product_category.products.all().values_list(
+            "id", flat=True
+        )
+        await refresh_product_search_documents.kiq(
+            product_ids=[str(product_id) for product_id in product_ids]
+        )
     return check_product_category
 
 
@@ -87,9 +100,15 @@ async def update(
 async def delete(
     product_category_id: uuid.UUID,
 ) -> None:
+    product_ids = await models.ProductCategory.filter(
+        id=product_category_id
+    ).values_list("products__id", flat=True)
     deleted_product_category = await models.ProductCategory.filter(
         id=product_category_id
     ).delete()
     if not deleted_product_category:
         raise error.NotFoundError("product category does not exist")
+    await refresh_product_search_documents.kiq(
+        product_ids=[str(product_id) for product_id in product_ids if product_id]
+    )
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -4,7 +4,9 @@ from fermerce.app.charge import services
 from fermerce.app.user.models import User
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import IResponseMessage
+from fermerce.lib.paystack import client as paystack_client
 from fermerce.lib.paystack.refund import schemas as charge_schemas
+from fermerce.app.staff.dependency import require_super_admin_or_admin
 from fermerce.app.user import dependency
 
 router = APIRouter(prefix="/payments", tags=["payments"])
@@ -22,6 +24,12 @@ async def get_payment_list_by_admin(
     ),
     per_page: int = 10,
     page: int = 1,
+    cursor: t.Optional[str] = Query(
+        default=None,
+        description="cursor pagination, send an empty value for the first page "
+        "and the returned next_cursor afterwards",
+    ),
+    count: bool = Query(default=False, description="total_results over all pages"),
     sort_by: t.Optional[SortOrder] = Query(
         default=SortOrder.desc, description="order by attribute, e.g. id"
     ),
@@ -29,6 +37,9 @@ async def get_payment_list_by_admin(
         default="id", description="order by attribute, e.g. id"
     ),
     load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. order,refund"
+    ),
 ):
     return await services.list_charges(
         select=select,
@@ -36,12 +47,25 @@ async def get_payment_list_by_admin(
         user=None,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         sort_by=sort_by,
         order_by=order_by,
         load_related=load_related,
+        expand=expand,
     )
 
 
+@router.get(
+    "/admin/gateway",
+    status_code=status.HTTP_200_OK,
+    response_model=dict,
+    dependencies=[Depends(require_super_admin_or_admin)],
+)
+async def get_payment_gateway_metrics():
+    return paystack_client.get_metrics()
+
+
 # @router.get(
 #     "/trends",
 #     status_code=status.HTTP_200_OK,
@@ -42,12 +42,16 @@ async def create_payment(
 async def get_payment_by_id(
     payment_id: uuid.UUID,
     load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. order,refund"
+    ),
     user: User = Depends(dependency.require_user),
 ):
     return await services.get_charges(
         payment_id=payment_id,
         user=user,
         load_related=load_related,
+        expand=expand,
     )
 
 
@@ -76,6 +80,12 @@ async def get_payment_list(
     ),
     per_page: int = 10,
     page: int = 1,
+    cursor: t.Optional[str] = Query(
+        default=None,
+        description="cursor pagination, send an empty value for the first page "
+        "and the returned next_cursor afterwards",
+    ),
+    count: bool = Query(default=False, description="total_results over all pages"),
     sort_by: t.Optional[SortOrder] = Query(
         default=SortOrder.desc, description="order by attribute, e.g. id"
     ),
@@ -83,6 +93,9 @@ async def get_payment_list(
         default="id", description="order by attribute, e.g. id"
     ),
     load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. order,refund"
+    ),
 ):
     return await services.list_charges(
         select=select,
@@ -90,7 +103,10 @@ async def get_payment_list(
         user=user,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         sort_by=sort_by,
         order_by=order_by,
         load_related=load_related,
+        expand=expand,
     )
@@ -13,6 +13,7 @@ class Charge(models.Model):
 
     class Meta:
         table = "fm_payment"
+        expandable = ("order", "status", "refund")
 
     @staticmethod
     def generate_order_reference():
@@ -3,7 +3,7 @@ import typing as t
 import uuid
 from tortoise.expressions import Q
 from fermerce.app.cards.models import SaveCard
-from fermerce.app.status.models import Status
+from fermerce.app.status import services as status_services
 from fermerce.app.order.models import Order, OrderItem
 from fermerce.app.user.models import User
 from fermerce.core.enum.frequent_duration import Frequent
@@ -37,7 +37,7 @@ async def create_order_charge(
         raise error.BadDataError("This order has already been paid for")
     total_price = utils.get_product_total_price(order_items)
     if total_price > 0:
-        get_status, _ = await Status.get_or_create(name="processing")
+        get_status = await status_services.get_or_create_by_name("processing")
         new_payment = await models.Charge.create(
             order=get_order,
             total=total_price,
@@ -94,7 +94,7 @@ async def create_charges_url(
             return generate_url.data
         raise error.BadDataError(generate_url.message)
 
-    get_status, _ = await Status.get_or_create(name="processing")
+    get_status = await status_services.get_or_create_by_name("processing")
     new_payment = await models.Charge.create(
         order=get_order,
         total=total_price,
@@ -124,7 +124,7 @@ async def verify_charges(
     if get_unfinished_payment:
         response = await services.charge_verification(get_unfinished_payment.reference)
         if response.status:
-            get_status, _ = await Status.get_or_create(name="completed")
+            get_status = await status_services.get_or_create_by_name("completed")
             get_unfinished_payment.update_from_dict(
                 {"status": get_status, "is_verified": response.status}
             )
@@ -142,6 +142,7 @@ async def get_charges(
     payment_id: uuid.UUID,
     user: User,
     load_related: bool = False,
+    expand: str = "",
 ) -> models.Charge:
     query = models.Charge
     if user:
@@ -150,6 +151,7 @@ async def get_charges(
         model=models.Charge,
         query=query,
         load_related=load_related,
+        expand=expand,
         order_by="id",
     )
     if not result:
@@ -161,10 +163,13 @@ async def list_charges(
     filter_string: str,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     select: str = "",
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
     load_related: bool = False,
+    expand: str = "",
     user: User = None,
 ) -> t.List[models.Charge]:
     query = models.Charge
@@ -182,10 +187,13 @@ async def list_charges(
         query=query,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         select=select,
         order_by=order_by,
         sort_by=sort_by,
         load_related=load_related,
+        expand=expand,
     )
 
 
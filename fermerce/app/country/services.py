@@ -4,11 +4,15 @@ from fastapi import status
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import ITotalCount
 from fermerce.core.services.base import filter_and_list
+from fermerce.core.services.reference import ReferenceCache
 from fermerce.lib.errors import error
 from fermerce.app.country import schemas, models
 from fastapi import Response
 
 
+country_cache = ReferenceCache(models.Country)
+
+
 # create permission
 async def create(
     data_in: schemas.ICountryIn,
@@ -19,13 +23,14 @@ async def create(
     new_type = await models.Country.create(**data_in.dict())
     if not new_type:
         raise error.ServerError("Internal server error")
+    country_cache.invalidate()
     return new_type
 
 
 async def get(
     country_id: uuid.UUID,
 ) -> models.Country:
-    perm = await models.Country.get_or_none(id=country_id)
+    perm = await country_cache.get(country_id)
     if not perm:
         raise error.NotFoundError("country not found")
     return perm
@@ -36,6 +41,8 @@ async def filter(
     filter_string: str,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     select: str = "",
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
@@ -48,6 +55,8 @@ async def filter(
         query=query,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         select=select,
         order_by=order_by,
         sort_by=sort_by,
@@ -75,6 +84,7 @@ async def update(
         return check_country
     check_country.update_from_dict(data_in.dict())
     await check_country.save()
+    country_cache.invalidate()
     return check_country
 
 
@@ -85,4 +95,5 @@ async def delete(
     deleted_country = await models.Country.filter(id=country_id).delete()
     if not deleted_country:
         raise error.NotFoundError("country does not exist")
+    country_cache.invalidate()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,74 @@
+import datetime
+import pytest
+from fermerce.app.country import models, services
+from fermerce.core.enum.sort_type import SortOrder
+from fermerce.core.services.base import filter_and_list
+from fermerce.lib.errors import error
+
+
+@pytest.fixture
+async def countries(db):
+    # rows share created_at in fives, so pages also depend on the id tie break
+    start = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+    await models.Country.bulk_create(
+        [
+            models.Country(
+                name=f"country {index:02}",
+                created_at=start + datetime.timedelta(minutes=index // 5),
+            )
+            for index in range(25)
+        ]
+    )
+    return await models.Country.all().order_by("created_at", "id")
+
+
+async def read_all(filter_string: str = None, **kwargs):
+    # an empty cursor asks for the first page in cursor mode
+    pages, cursor = [], ""
+    while cursor is not None:
+        page = await services.filter(
+            filter_string, cursor=cursor, per_page=10, **kwargs
+        )
+        pages.append(page["results"])
+        cursor = page["next_cursor"]
+    return pages
+
+
+@pytest.mark.parametrize("sort_by", [SortOrder.asc, SortOrder.desc])
+async def test_cursor_pages_cover_every_row_once(countries, sort_by):
+    pages = await read_all(sort_by=sort_by)
+    assert [len(page) for page in pages] == [10, 10, 5]
+    ids = [row["id"] for page in pages for row in page]
+    expected = [country.id for country in countries]
+    if sort_by == SortOrder.desc:
+        expected.reverse()
+    assert ids == expected
+
+
+async def test_cursor_pages_with_select_leave_out_cursor_fields(countries):
+    pages = await read_all(select="name", sort_by=SortOrder.asc)
+    rows = [row for page in pages for row in page]
+    assert all(list(row) == ["name"] for row in rows)
+    assert [row["name"] for row in rows] == [country.name for country in countries]
+
+
+async def test_cursor_follows_the_filter(countries):
+    pages = await read_all(filter_string="country 1", sort_by=SortOrder.asc)
+    assert [row["name"] for page in pages for row in page] == [
+        country.name for country in countries if country.name.startswith("country 1")
+    ]
+
+
+async def test_invalid_cursor_is_rejected(countries):
+    with pytest.raises(error.BadDataError):
+        await filter_and_list(
+            model=models.Country, query=models.Country, cursor="not-a-cursor"
+        )
+
+
+@pytest.mark.parametrize("cursor", [None, ""])
+async def test_total_results_is_the_page_length_unless_counted(countries, cursor):
+    page = await services.filter(None, per_page=10, page=3, cursor=cursor)
+    assert page["total_results"] == len(page["results"])
+    page = await services.filter(None, per_page=10, cursor=cursor, count=True)
+    assert page["total_results"] == 25
@@ -5,11 +5,15 @@ from tortoise.expressions import Q
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import ITotalCount
 from fermerce.core.services.base import filter_and_list
+from fermerce.core.services.reference import ReferenceCache
 from fermerce.lib.errors import error
 from fermerce.app.delivery_mode import schemas, models
 from fastapi import Response
 
 
+delivery_mode_cache = ReferenceCache(models.DeliveryMode)
+
+
 async def create(
     data_in: schemas.IDeliveryModeIn,
 ) -> models.DeliveryMode:
@@ -21,13 +25,14 @@ async def create(
     new_delivery_mode = await models.DeliveryMode.create(**data_in.dict())
     if not new_delivery_mode:
         raise error.ServerError("Internal server error")
+    delivery_mode_cache.invalidate()
     return new_delivery_mode
 
 
 async def get(
     delivery_mode_id: uuid.UUID,
 ) -> models.DeliveryMode:
-    delivery_mode = await models.DeliveryMode.get_or_none(id=delivery_mode_id)
+    delivery_mode = await delivery_mode_cache.get(delivery_mode_id)
     if not delivery_mode:
         raise error.NotFoundError("delivery type not found")
     return delivery_mode
@@ -37,6 +42,8 @@ async def filter(
     filter_string: str,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     select: str = None,
     order_by: str = None,
     sort_by: SortOrder = SortOrder.asc,
@@ -49,6 +56,8 @@ async def filter(
         query=query,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         select=select,
         order_by=order_by,
         sort_by=sort_by,
@@ -79,6 +88,7 @@ async def update(
         return check_delivery_mode
     check_delivery_mode.update_from_dict(data_in.dict())
     await check_delivery_mode.save()
+    delivery_mode_cache.invalidate()
     return check_delivery_mode
 
 
@@ -90,4 +100,5 @@ async def delete(
     ).delete()
     if not deleted_delivery_mode:
         raise error.NotFoundError("delivery type does not exist")
+    delivery_mode_cache.invalidate()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
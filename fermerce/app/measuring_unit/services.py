@@ -4,11 +4,15 @@ from fastapi import status
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import ITotalCount
 from fermerce.core.services.base import filter_and_list
+from fermerce.core.services.reference import ReferenceCache
 from fermerce.lib.errors import error
 from fermerce.app.measuring_unit import schemas, models
 from fastapi import Response
 
 
+measuring_unit_cache = ReferenceCache(models.MeasuringUnit, name_field="unit")
+
+
 async def create(
     data_in: schemas.IMeasuringUnitIn,
 ) -> models.MeasuringUnit:
@@ -20,13 +24,14 @@ async def create(
     new_type = await models.MeasuringUnit.create(**data_in.dict())
     if not new_type:
         raise error.ServerError("Internal server error")
+    measuring_unit_cache.invalidate()
     return new_type
 
 
 async def get(
     unit_id: uuid.UUID,
 ) -> models.MeasuringUnit:
-    perm = await models.MeasuringUnit.get_or_none(id=unit_id)
+    perm = await measuring_unit_cache.get(unit_id)
     if not perm:
         raise error.NotFoundError("measuring unit not found")
     return perm
@@ -36,6 +41,8 @@ async def filter(
     filter_string: str,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     select: str = None,
     order_by: str = None,
     sort_by: SortOrder = SortOrder.asc,
@@ -48,6 +55,8 @@ async def filter(
         query=query,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         select=select,
         sort_by=sort_by,
         order_by=order_by,
@@ -74,6 +83,7 @@ async def update(
         return check_measuring_unit
     check_measuring_unit.update_from_dict(data_in.dict())
     await check_measuring_unit.save()
+    measuring_unit_cache.invalidate()
     return check_measuring_unit
 
 
@@ -85,4 +95,5 @@ async def delete(
     ).delete()
     if not deleted_measuring_unit:
         raise error.NotFoundError("measuring unit does not exist")
+    measuring_unit_cache.invalidate()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,9 +1,9 @@
 import typing as t
-from fastapi import APIRouter, Depends, Form, Header, Request, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, Form, Header, Request, Response, UploadFile
 from fermerce.app.medias import schemas, services
 from fermerce.core.settings import config
 from fermerce.app.user.dependency import require_user
+from fermerce.app.staff.dependency import require_super_admin_or_admin
 from fermerce.lib.shared.dependency import AppAuth
 
 router = APIRouter(
@@ -29,24 +29,34 @@ async def create_resource(
 
 
 @router.put("/{uri}", dependencies=[Depends(require_user)])
-async def update_resource(uri: str, file: UploadFile = Form()):
-    return await services.update(uri=uri, media_obj=file)
+async def update_resource(request: Request, uri: str, file: UploadFile = Form()):
+    return await services.update(request=request, uri=uri, media_obj=file)
 
 
-@router.get("/{uri}", name=config.media_url_endpoint_name)
-async def get_resource(uri: str) -> StreamingResponse:
-    return await services.get(uri)
+@router.get(
+    "/cache/stats",
+    response_model=dict,
+    dependencies=[Depends(require_super_admin_or_admin)],
+)
+async def get_cache_stats():
+    return services.get_cache_stats()
+
+
+@router.get("/{uri}", name=config.media_url_endpoint_name, response_class=Response)
+async def get_resource(request: Request, uri: str) -> Response:
+    return await services.get(request, uri)
 
 
 @router.get(
     "/{uri}/download",
+    response_class=Response,
     dependencies=[
         Depends(require_user),
         Depends(AppAuth.verify_file_upload_api_key),
     ],
 )
-async def download_resource(uri: str) -> StreamingResponse:
-    return await services.download(uri)
+async def download_resource(request: Request, uri: str) -> Response:
+    return await services.download(request, uri)
 
 
 @router.delete(
@@ -0,0 +1,185 @@
+import json
+import os
+import time
+import typing as t
+from collections import OrderedDict
+import anyio
+from fastapi import Response
+from fermerce.app.medias.storage import (
+    Data,
+    LocalStorage,
+    Storage,
+    StoredFile,
+)
+from fermerce.core.settings import config
+
+
+class ByteCache:
+    """In-process LRU of stored files, bounded by their total size in bytes."""
+
+    def __init__(self, max_bytes: int, ttl: float, max_entry_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+        self.size = 0
+        self._data: "OrderedDict[str, t.Tuple[float, StoredFile]]" = OrderedDict()
+
+    def get(self, name: str) -> t.Optional[StoredFile]:
+        entry = self._data.get(name)
+        if entry is None:
+            return None
+        expires_at, stored = entry
+        if expires_at < time.monotonic():
+            self.delete(name)
+            return None
+        self._data.move_to_end(name)
+        return stored
+
+    def set(self, stored: StoredFile, ttl: t.Optional[float] = None) -> None:
+        if stored.data is None or stored.size > self.max_entry_bytes:
+            return
+        self.delete(stored.name)
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl)
+        self._data[stored.name] = (expires_at, stored)
+        self.size += stored.size
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self._data.popitem(last=False)
+            self.size -= evicted.size
+
+    def delete(self, name: str) -> None:
+        entry = self._data.pop(name, None)
+        if entry is not None:
+            self.size -= entry[1].size
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CachedStorage(Storage):
+    """Serve hot files from memory, then an optional shared disk directory.
+
+    Writes and deletes through this storage invalidate both tiers here; other
+    workers sharing the disk tier drop their memory copy once it expires.
+    """
+
+    def __init__(
+        self,
+        backend: Storage,
+        max_bytes: int,
+        ttl: float,
+        max_entry_bytes: int,
+        disk_dir: t.Optional[str] = None,
+    ) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.memory = ByteCache(max_bytes, ttl, max_entry_bytes)
+        self.disk = LocalStorage(disk_dir) if disk_dir else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def pack(stored: StoredFile) -> bytes:
+        # the backend's validators go in a header line, so every tier and
+        # worker answers conditional requests for a file the same way
+        header = dict(
+            content_type=stored.content_type,
+            etag=stored.etag,
+            modified_at=stored.modified_at,
+        )
+        return json.dumps(header).encode() + b"\n" + stored.data
+
+    async def read_disk(self, name: str) -> t.Optional[StoredFile]:
+        cached = await self.disk.get(name)
+        if cached is None or cached.modified_at + self.ttl < time.time():
+            return None
+        try:
+            contents = await anyio.Path(cached.path).read_bytes()
+            header, _, data = contents.partition(b"\n")
+            header = json.loads(header)
+        except (OSError, ValueError):
+            return None
+        if len(data) > self.memory.max_entry_bytes:
+            return None
+        return StoredFile(
+            name=name,
+            size=len(data),
+            content_type=header["content_type"],
+            etag=header["etag"],
+            modified_at=header["modified_at"],
+            data=data,
+        )
+
+    async def get(self, name: str) -> t.Optional[StoredFile]:
+        stored = self.memory.get(name)
+        if stored is not None:
+            self.hits += 1
+            return stored
+        if self.disk:
+            stored = await self.read_disk(name)
+            if stored is not None:
+                self.disk_hits += 1
+                self.memory.set(stored)
+                return stored
+        self.misses += 1
+        stored = await self.backend.get(name)
+        if stored is not None and stored.data is not None:
+            self.memory.set(stored)
+            if self.disk and stored.size <= self.memory.max_entry_bytes:
+                await self.disk.put(name, self.pack(stored))
+        return stored
+
+    async def put(self, name: str, data: Data, content_type: str = None) -> str:
+        await self.invalidate([name])
+        return await self.backend.put(name, data=data, content_type=content_type)
+
+    async def delete_many(self, names: t.List[str]) -> None:
+        await self.invalidate(names)
+        await self.backend.delete_many(names)
+
+    async def invalidate(self, names: t.List[str]) -> None:
+        for name in names:
+            self.memory.delete(name)
+        if self.disk:
+            await self.disk.delete_many(names)
+
+    def response(
+        self,
+        stored: StoredFile,
+        start: int,
+        end: int,
+        status_code: int,
+        headers: t.Dict[str, str],
+    ) -> Response:
+        if stored.data is not None:
+            return super().response(stored, start, end, status_code, headers)
+        return self.backend.response(stored, start, end, status_code, headers)
+
+    def stats(self) -> t.Dict[str, t.Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return dict(
+            hits=self.hits,
+            disk_hits=self.disk_hits,
+            misses=self.misses,
+            hit_ratio=(self.hits + self.disk_hits) / lookups if lookups else 0,
+            entries=len(self.memory),
+            size=self.memory.size,
+            max_size=self.memory.max_bytes,
+        )
+
+
+def with_cache(backend: Storage, drive_name: str) -> Storage:
+    if not config.media_cache_size:
+        return backend
+    disk_dir = config.media_cache_dir
+    return CachedStorage(
+        backend,
+        max_bytes=config.media_cache_size,
+        ttl=config.media_cache_ttl,
+        max_entry_bytes=config.media_cache_max_entry,
+        disk_dir=os.path.join(disk_dir, drive_name) if disk_dir else None,
+    )
@@ -1,7 +1,23 @@
-from deta import Deta  # Import Deta
+import os
+from fermerce.app.medias.cache import with_cache
+from fermerce.app.medias.storage import (
+    DetaStorage,
+    LocalStorage,
+    MemoryStorage,
+    Storage,
+)
 from fermerce.core.settings import config
 
-deta = Deta(config.deta_space_key)
 
-product_drive = deta.Drive("product_drive")
-vendor_drive = deta.Drive("vendor_drive")
+def get_storage(drive_name: str) -> Storage:
+    if config.media_storage == "local":
+        backend = LocalStorage(os.path.join(config.media_root, drive_name))
+    elif config.media_storage == "memory":
+        backend = MemoryStorage()
+    else:
+        backend = DetaStorage(drive_name)
+    return with_cache(backend, drive_name)
+
+
+product_drive = get_storage("product_drive")
+vendor_drive = get_storage("vendor_drive")
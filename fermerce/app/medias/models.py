@@ -10,6 +10,10 @@ class Media(models.Model):
     url = fields.CharField(max_length=300, unique=True)
     content_type = fields.CharField(max_length=30)
     alt = fields.CharField(max_length=50, unique=True)
+    # sha256 of the uploaded bytes; identical uploads share the stored files
+    content_hash = fields.CharField(max_length=64, null=True, index=True)
+    # rendition name (thumbnail, card, full) -> url
+    renditions = fields.JSONField(null=True)
 
     class Meta:
         table = "fm_media"
@@ -73,5 +77,19 @@ class Media(models.Model):
         unique_filename = f"{uuid.uuid4().hex}.{extension}"
         return unique_filename
 
+    @staticmethod
+    def get_file_name(content_hash: str, rendition: str, extension: str) -> str:
+        return f"{content_hash[:32]}-{rendition}.{extension}"
+
+    def get_file_names(self) -> t.List[str]:
+        """Names of every stored file backing this media."""
+        if not self.content_hash:
+            return [self.alt]
+        extension = self.content_type.split("/")[-1]
+        return [
+            self.get_file_name(self.content_hash, rendition, extension)
+            for rendition in (self.renditions or {"full": None})
+        ]
+
     def get_file_type(self, content_type: str, to_check: str):
         return content_type.lower().endswith("/" + to_check.lower())
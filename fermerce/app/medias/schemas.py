@@ -12,6 +12,7 @@ class IMediaOut(pyd.BaseModel):
     url: pyd.AnyUrl
     content_type: t.Optional[str]
     alt: t.Optional[str]
+    renditions: t.Optional[t.Dict[str, str]]
 
     class Config:
         orm_mode = True
@@ -1,10 +1,94 @@
+import asyncio
+import copy
 import typing as t
+import uuid
 from fermerce.core.schemas.response import IResponseMessage
 from fermerce.lib.errors import error
-from fastapi import Request, UploadFile, status
-from fastapi.responses import StreamingResponse
+from email.utils import formatdate
+from fastapi import HTTPException, Request, Response, UploadFile, status
 from fermerce.app.medias import models, schemas, utils
+from fermerce.app.medias.cache import CachedStorage
 from fermerce.app.medias.drives import product_drive
+from fermerce.app.medias.storage import Data
+
+
+async def put_renditions(
+    request: Request,
+    content_hash: str,
+    files: t.Dict[str, Data],
+    content_type: str,
+) -> t.Dict[str, str]:
+    """Store every rendition under its content-hash name; returns their urls."""
+    extension = content_type.split("/")[1]
+    names = {
+        rendition: models.Media.get_file_name(content_hash, rendition, extension)
+        for rendition in files
+    }
+    await asyncio.gather(
+        *[
+            product_drive.put(
+                name=names[rendition], data=data, content_type=content_type
+            )
+            for rendition, data in files.items()
+        ]
+    )
+    return {
+        rendition: models.Media.convert_image_name_to_url(
+            media_url=name, request=request
+        )
+        for rendition, name in names.items()
+    }
+
+
+async def get_or_put_renditions(
+    request: Request, media: UploadFile, content_hash: str
+) -> t.Tuple[t.Dict[str, str], str]:
+    """Urls and content type of an upload's renditions, stored once per hash."""
+    existing = await models.Media.filter(content_hash=content_hash).first()
+    if existing and existing.renditions:
+        return existing.renditions, existing.content_type
+    files, content_type = await utils.process_file(media)
+    urls = await put_renditions(request, content_hash, files, content_type)
+    return urls, content_type
+
+
+async def store(
+    request: Request, media: UploadFile, desire_alt: str = None
+) -> models.Media:
+    content_hash = await utils.hash_file(media)
+    urls, content_type = await get_or_put_renditions(request, media, content_hash)
+    file_name = models.Media.generate_unique_name(
+        media, desired_file_type=content_type.split("/")[1]
+    )
+    media_id = uuid.uuid4()
+    return await models.Media.create(
+        id=media_id,
+        # the files are shared, the url stays unique to this media
+        url=f"{urls['full']}?media={media_id}",
+        content_type=content_type,
+        alt=desire_alt if desire_alt else file_name,
+        content_hash=content_hash,
+        renditions=urls,
+    )
+
+
+async def release_files(medias: t.List[models.Media]) -> None:
+    """Delete the files of removed medias that no other media still uses."""
+    hashes = {media.content_hash for media in medias if media.content_hash}
+    in_use = set()
+    if hashes:
+        in_use = set(
+            await models.Media.filter(content_hash__in=hashes).values_list(
+                "content_hash", flat=True
+            )
+        )
+    file_names = [
+        name
+        for media in medias
+        if media.content_hash not in in_use
+        for name in media.get_file_names()
+    ]
+    await product_drive.delete_many(file_names)
 
 
 async def create(
@@ -18,38 +102,22 @@ async def create(
         )
         if bad_types:
             raise error.BadDataError("Unsupported media type, expected")
-        to_out = []
-        for media in media_objs:
-            file_bytes, content_type = await utils.compress_file(media)
-            file_name = models.Media.generate_unique_name(
-                media, desired_file_type=content_type.split("/")[1]
-            )
-            result = product_drive.put(
-                name=file_name, data=file_bytes, content_type=content_type
-            )
-            if result is not None:
-                get_url = models.Media.convert_image_name_to_url(
-                    media_url=result, request=request
-                )
-                result = await models.Media.create(
-                    url=get_url,
-                    content_type=content_type,
-                    alt=desire_alt if desire_alt else file_name,
-                )
-                to_out.append(result)
-        return to_out
-
+        return await asyncio.gather(
+            *[store(request, media, desire_alt) for media in media_objs]
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise error.ServerError("Error while creating resource" + str(e))
 
 
-async def update(uri: str, media_obj: UploadFile) -> IResponseMessage:
+async def update(request: Request, uri: str, media_obj: UploadFile) -> IResponseMessage:
     try:
         get_media = await models.Media.get_or_none(alt=uri)
         if not get_media:
             raise error.NotFoundError(f"Resource with URI {uri} not found")
         bad_types = models.Media.check_file_type(
-            file_type=models.Media.all_allowed_files, media_objs=[media_obj]
+            file_type=models.Media.all_allowed_files(), media_objs=[media_obj]
         )
         if bad_types:
             raise error.BadDataError("Unsupported media type")
@@ -59,46 +127,85 @@ async def update(uri: str, media_obj: UploadFile) -> IResponseMessage:
             raise error.BadDataError(
                 f"Invalid file extension. Expected {expected_extension} but got {actual_extension}."
             )
-        file_bytes = utils.compress_file(file=media_obj)
-        if file_bytes:
-            product_drive.put(name=uri, data=file_bytes)
+        content_hash = await utils.hash_file(media_obj)
+        if content_hash == get_media.content_hash:
             return IResponseMessage(message="Resource updated successfully")
+        old_media = copy.copy(get_media)
+        urls, content_type = await get_or_put_renditions(
+            request, media_obj, content_hash
+        )
+        get_media.update_from_dict(
+            dict(
+                url=f"{urls['full']}?media={get_media.id}",
+                content_type=content_type,
+                content_hash=content_hash,
+                renditions=urls,
+            )
+        )
+        await get_media.save()
+        await release_files([old_media])
+        return IResponseMessage(message="Resource updated successfully")
+    except HTTPException:
+        raise
     except Exception:
         raise error.ServerError(
             f"Error while updating resource with URI {uri}. Make sure you are uploading a valid file."
         )
 
 
-async def get(uri: str) -> StreamingResponse:
-    check_file = product_drive.get(uri)
-    if not check_file:
+async def serve(
+    request: Request, uri: str, headers: t.Optional[t.Dict[str, str]] = None
+) -> Response:
+    """Respond with a stored file, honouring conditional and Range requests."""
+    stored = await product_drive.get(uri)
+    if not stored:
         raise error.NotFoundError("Resource Not found")
-    return StreamingResponse(
-        content=check_file.iter_chunks(chunk_size=1024),
-        status_code=status.HTTP_200_OK,
-    )
+    headers = {"ETag": stored.etag, "Accept-Ranges": "bytes", **(headers or {})}
+    if stored.modified_at:
+        headers["Last-Modified"] = formatdate(stored.modified_at, usegmt=True)
+    if utils.is_not_modified(request.headers, stored.etag, stored.modified_at):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
+    start, end, status_code = 0, stored.size - 1, status.HTTP_200_OK
+    byte_range = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if byte_range and (not if_range or if_range == stored.etag):
+        try:
+            requested = utils.parse_range(byte_range, stored.size)
+        except ValueError:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{stored.size}"},
+            )
+        if requested:
+            start, end = requested
+            status_code = status.HTTP_206_PARTIAL_CONTENT
+            headers["Content-Range"] = f"bytes {start}-{end}/{stored.size}"
+    return product_drive.response(stored, start, end, status_code, headers)
 
-async def download(
-    uri: str,
-) -> StreamingResponse:
-    check_file = product_drive.get(uri)
-    if not check_file:
-        raise error.NotFoundError("Resource Not found")
+
+def get_cache_stats() -> t.Dict[str, t.Any]:
+    if isinstance(product_drive, CachedStorage):
+        return product_drive.stats()
+    return {}
+
+
+async def get(request: Request, uri: str) -> Response:
+    return await serve(request, uri)
+
+
+async def download(request: Request, uri: str) -> Response:
     headers = {
         "Content-Disposition": f"attachment; filename={uri}",
     }
-    return StreamingResponse(
-        check_file.iter_chunks(chunk_size=1024),
-        headers=headers,
-        status_code=status.HTTP_200_OK,
-    )
+    return await serve(request, uri, headers=headers)
 
 
 async def delete_many(data_in: schemas.IMediaDeleteIn) -> IResponseMessage:
-    check_file = await models.Media.filter(url__in=data_in.uris).delete()
-    if check_file:
-        product_drive.delete_many(data_in.uris)
+    medias = await models.Media.filter(url__in=data_in.uris)
+    if medias:
+        await models.Media.filter(id__in=[media.id for media in medias]).delete()
+        await release_files(medias)
         return IResponseMessage(message="Resource deleted successfully")
     raise error.NotFoundError("Resource Not found")
 
@@ -107,6 +214,6 @@ async def delete_one(uri: str) -> IResponseMessage:
     check_file = await models.Media.get_or_none(alt=uri)
     if check_file:
         await check_file.delete()
-        product_drive.delete(uri)
+        await release_files([check_file])
         return IResponseMessage(message="Resource deleted successfully")
     raise error.NotFoundError("Resource Not found")
@@ -0,0 +1,303 @@
+import abc
+import dataclasses
+import hashlib
+import mimetypes
+import os
+import re
+import shutil
+import time
+import typing as t
+import uuid
+import anyio
+from deta import Deta  # Import Deta
+from fastapi import Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from fermerce.core.settings import config
+
+# read size when streaming stored files, large enough to keep syscalls rare
+CHUNK_SIZE = 1024 * 1024
+
+Data = t.Union[bytes, t.BinaryIO]
+
+# media files are named after their content hash, see Media.get_file_name
+HASHED_NAME = re.compile(r"[0-9a-f]{32}-")
+
+
+@dataclasses.dataclass
+class StoredFile:
+    name: str
+    size: int
+    content_type: str
+    etag: str
+    modified_at: t.Optional[float] = None
+    path: t.Optional[str] = None
+    data: t.Optional[bytes] = None
+
+
+def guess_content_type(name: str) -> str:
+    return mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+def make_etag(data: bytes) -> str:
+    return f'"{hashlib.md5(data).hexdigest()}"'
+
+
+class Storage(abc.ABC):
+    """Where media files live.
+
+    Backends keep ``put``/``get``/``delete_many`` semantics; ``get`` returns
+    the file's metadata and ``response`` turns it into an http response for
+    the inclusive byte range ``start``-``end``.
+    """
+
+    @abc.abstractmethod
+    async def put(self, name: str, data: Data, content_type: str = None) -> str:
+        """Store ``data``; file objects are copied in chunks, never read whole."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get(self, name: str) -> t.Optional[StoredFile]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete_many(self, names: t.List[str]) -> None:
+        raise NotImplementedError
+
+    async def delete(self, name: str) -> None:
+        await self.delete_many([name])
+
+    def response(
+        self,
+        stored: StoredFile,
+        start: int,
+        end: int,
+        status_code: int,
+        headers: t.Dict[str, str],
+    ) -> Response:
+        return Response(
+            content=stored.data[start : end + 1],
+            status_code=status_code,
+            headers=headers,
+            media_type=stored.content_type,
+        )
+
+
+class MemoryStorage(Storage):
+    """Files kept in a dict; for tests and local development."""
+
+    def __init__(self) -> None:
+        self.files: t.Dict[str, StoredFile] = {}
+
+    async def put(self, name: str, data: Data, content_type: str = None) -> str:
+        if not isinstance(data, bytes):
+            data = data.read()
+        self.files[name] = StoredFile(
+            name=name,
+            size=len(data),
+            content_type=content_type or guess_content_type(name),
+            etag=make_etag(data),
+            modified_at=time.time(),
+            data=data,
+        )
+        return name
+
+    async def get(self, name: str) -> t.Optional[StoredFile]:
+        return self.files.get(name)
+
+    async def delete_many(self, names: t.List[str]) -> None:
+        for name in names:
+            self.files.pop(name, None)
+
+
+class LargeChunkFileResponse(FileResponse):
+    chunk_size = CHUNK_SIZE
+
+
+class LocalStorage(Storage):
+    """Files on local disk, served straight from the file without buffering."""
+
+    def __init__(self, root: str) -> None:
+        self.root = os.path.abspath(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def get_path(self, name: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, name))
+        if os.path.dirname(path) != self.root:
+            raise ValueError(f"invalid file name {name}")
+        return path
+
+    def write(self, path: str, data: Data) -> None:
+        # write then rename so readers never see a partial file
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, "wb") as file:
+            if isinstance(data, bytes):
+                file.write(data)
+            else:
+                shutil.copyfileobj(data, file, CHUNK_SIZE)
+        os.replace(temp_path, path)
+
+    async def put(self, name: str, data: Data, content_type: str = None) -> str:
+        await run_in_threadpool(self.write, self.get_path(name), data)
+        return name
+
+    async def get(self, name: str) -> t.Optional[StoredFile]:
+        try:
+            path = self.get_path(name)
+            stat = await anyio.to_thread.run_sync(os.stat, path)
+        except (OSError, ValueError):
+            return None
+        return StoredFile(
+            name=name,
+            size=stat.st_size,
+            content_type=guess_content_type(name),
+            etag=f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"',
+            modified_at=stat.st_mtime,
+            path=path,
+        )
+
+    def remove(self, names: t.List[str]) -> None:
+        for name in names:
+            try:
+                os.remove(self.get_path(name))
+            except (OSError, ValueError):
+                pass
+
+    async def delete_many(self, names: t.List[str]) -> None:
+        await run_in_threadpool(self.remove, names)
+
+    async def iter_range(
+        self, path: str, start: int, end: int
+    ) -> t.AsyncIterator[bytes]:
+        async with await anyio.open_file(path, "rb") as file:
+            await file.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await file.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    def response(
+        self,
+        stored: StoredFile,
+        start: int,
+        end: int,
+        status_code: int,
+        headers: t.Dict[str, str],
+    ) -> Response:
+        if start == 0 and end == stored.size - 1:
+            return LargeChunkFileResponse(
+                stored.path,
+                status_code=status_code,
+                headers=headers,
+                media_type=stored.content_type,
+            )
+        return StreamingResponse(
+            self.iter_range(stored.path, start, end),
+            status_code=status_code,
+            headers={**headers, "Content-Length": str(end - start + 1)},
+            media_type=stored.content_type,
+        )
+
+
+class DetaStorage(Storage):
+    """Deta Drive, streamed in chunks from the threadpool.
+
+    Drive has no stat call, so ``get`` opens the download for its length and
+    only reads the body when it is small enough for the media cache.
+    """
+
+    def __init__(self, drive_name: str) -> None:
+        self.drive_name = drive_name
+        self.drive = self.open_drive()
+
+    def open_drive(self):
+        return Deta(config.deta_space_key).Drive(self.drive_name)
+
+    def open(self, name: str):
+        # a drive per download: the sdk connection serves one response at a time
+        return self.open_drive().get(name)
+
+    @staticmethod
+    def get_size(body) -> t.Optional[int]:
+        # the sdk wraps the http response without exposing its headers
+        response = getattr(body, "_DriveStreamingBody__stream", None)
+        length = response.getheader("content-length") if response else None
+        return int(length) if length and length.isdigit() else None
+
+    @staticmethod
+    def get_etag(name: str, size: int, data: t.Optional[bytes]) -> str:
+        if HASHED_NAME.match(name):
+            return f'"{os.path.splitext(name)[0]}"'
+        if data is not None:
+            return make_etag(data)
+        # older uploads have unique names and are never written twice
+        return f'"{size:x}-{hashlib.md5(name.encode()).hexdigest()}"'
+
+    async def put(self, name: str, data: Data, content_type: str = None) -> str:
+        # the sdk uploads file objects in parts
+        return await run_in_threadpool(
+            self.drive.put, name=name, data=data, content_type=content_type
+        )
+
+    def stat(self, name: str) -> t.Optional[StoredFile]:
+        body = self.open(name)
+        if body is None:
+            return None
+        try:
+            size, data = self.get_size(body), None
+            if size is None or size <= config.media_cache_max_entry:
+                data = body.read()
+                size = len(data)
+        finally:
+            body.close()
+        return StoredFile(
+            name=name,
+            size=size,
+            content_type=guess_content_type(name),
+            etag=self.get_etag(name, size, data),
+            data=data,
+        )
+
+    async def get(self, name: str) -> t.Optional[StoredFile]:
+        return await run_in_threadpool(self.stat, name)
+
+    def iter_range(self, name: str, start: int, end: int) -> t.Iterator[bytes]:
+        body = self.open(name)
+        if body is None:
+            return
+        try:
+            position = 0
+            # Drive downloads cannot start mid file, so earlier chunks are skipped
+            for chunk in body.iter_chunks(chunk_size=CHUNK_SIZE):
+                if position + len(chunk) > start:
+                    yield chunk[max(start - position, 0) : end + 1 - position]
+                position += len(chunk)
+                if position > end:
+                    break
+        finally:
+            body.close()
+
+    def response(
+        self,
+        stored: StoredFile,
+        start: int,
+        end: int,
+        status_code: int,
+        headers: t.Dict[str, str],
+    ) -> Response:
+        if stored.data is not None:
+            return super().response(stored, start, end, status_code, headers)
+        # a sync iterator, which starlette runs in the threadpool
+        return StreamingResponse(
+            self.iter_range(stored.name, start, end),
+            status_code=status_code,
+            headers={**headers, "Content-Length": str(end - start + 1)},
+            media_type=stored.content_type,
+        )
+
+    async def delete_many(self, names: t.List[str]) -> None:
+        if names:
+            await run_in_threadpool(self.drive.delete_many, names)
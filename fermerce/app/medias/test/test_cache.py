@@ -0,0 +1,102 @@
+import pytest
+from fermerce.app.medias.cache import ByteCache, CachedStorage
+from fermerce.app.medias.storage import MemoryStorage, StoredFile
+
+
+def make_file(name: str, size: int) -> StoredFile:
+    return StoredFile(
+        name=name,
+        size=size,
+        content_type="image/webp",
+        etag=f'"{name}"',
+        data=b"x" * size,
+    )
+
+
+def make_storage(backend: MemoryStorage, disk_dir=None) -> CachedStorage:
+    return CachedStorage(
+        backend, max_bytes=100, ttl=60, max_entry_bytes=50, disk_dir=disk_dir
+    )
+
+
+@pytest.fixture
+async def backend():
+    backend = MemoryStorage()
+    await backend.put("a.webp", b"a" * 10)
+    # validators as Deta derives them, unlike the md5 the disk tier could compute
+    backend.files["a.webp"].etag = '"backend-etag"'
+    backend.files["a.webp"].modified_at = None
+    return backend
+
+
+def test_byte_cache_evicts_least_recently_used():
+    cache = ByteCache(max_bytes=30, ttl=60, max_entry_bytes=20)
+    for name in ("a", "b", "c"):
+        cache.set(make_file(name, 10))
+    assert cache.get("a")
+    cache.set(make_file("d", 10))
+    assert cache.get("b") is None
+    assert [cache.get(name).name for name in ("a", "c", "d")] == ["a", "c", "d"]
+    assert cache.size == 30
+
+
+def test_byte_cache_expires_entries():
+    cache = ByteCache(max_bytes=30, ttl=60, max_entry_bytes=20)
+    cache.set(make_file("a", 10), ttl=-1)
+    cache.set(make_file("b", 10))
+    assert cache.get("a") is None
+    assert cache.get("b")
+    assert (len(cache), cache.size) == (1, 10)
+
+
+def test_byte_cache_skips_large_or_unbuffered_files():
+    cache = ByteCache(max_bytes=100, ttl=60, max_entry_bytes=20)
+    cache.set(make_file("large", 21))
+    unbuffered = make_file("unbuffered", 10)
+    unbuffered.data = None
+    cache.set(unbuffered)
+    assert len(cache) == 0 and cache.size == 0
+
+
+async def test_cached_storage_counts_hits_and_misses(backend):
+    storage = make_storage(backend)
+    assert (await storage.get("a.webp")).etag == '"backend-etag"'
+    assert await storage.get("a.webp")
+    assert await storage.get("missing.webp") is None
+    stats = storage.stats()
+    assert (stats["hits"], stats["disk_hits"], stats["misses"]) == (1, 0, 2)
+    assert stats["hit_ratio"] == pytest.approx(1 / 3)
+    assert (stats["entries"], stats["size"], stats["max_size"]) == (1, 10, 100)
+
+
+async def test_cached_storage_bypasses_large_files(backend):
+    await backend.put("large.webp", b"l" * 51)
+    storage = make_storage(backend)
+    for _ in range(2):
+        assert (await storage.get("large.webp")).size == 51
+    assert storage.stats()["misses"] == 2
+    assert len(storage.memory) == 0
+
+
+async def test_put_and_delete_invalidate_both_tiers(backend, tmp_path):
+    storage = make_storage(backend, disk_dir=str(tmp_path))
+    await storage.get("a.webp")
+    assert list(tmp_path.iterdir())
+    await storage.put("a.webp", b"new")
+    assert (await storage.get("a.webp")).data == b"new"
+    assert storage.stats()["misses"] == 2
+
+    await storage.delete_many(["a.webp"])
+    assert not list(tmp_path.iterdir())
+    assert await storage.get("a.webp") is None
+
+
+async def test_disk_tier_keeps_the_backend_validators(backend, tmp_path):
+    await make_storage(backend, disk_dir=str(tmp_path)).get("a.webp")
+    # another worker sharing the disk tier
+    worker = make_storage(backend, disk_dir=str(tmp_path))
+    stored = await worker.get("a.webp")
+    assert worker.stats()["disk_hits"] == 1
+    assert stored.data == b"a" * 10
+    assert (stored.etag, stored.modified_at) == ('"backend-etag"', None)
+    assert stored.content_type == "image/webp"
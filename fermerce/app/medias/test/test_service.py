@@ -0,0 +1,167 @@
+import tempfile
+from email.utils import formatdate
+import pytest
+from fastapi import FastAPI, UploadFile
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from fermerce.app.medias import models, schemas, services
+from fermerce.app.medias.api.v1 import router
+from fermerce.app.medias.storage import MemoryStorage
+from fermerce.lib.errors import error
+
+app = FastAPI()
+app.include_router(router)
+
+
+def make_request(headers: dict = None) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "scheme": "http",
+            "server": ("testserver", 80),
+            "root_path": "",
+            "path": "/",
+            "query_string": b"",
+            "headers": [
+                (key.lower().encode(), value.encode())
+                for key, value in (headers or {}).items()
+            ],
+            "router": app.router,
+        }
+    )
+
+
+@pytest.fixture
+def make_upload():
+    files = []
+
+    def make(contents: bytes, filename: str = "clip.mp4") -> UploadFile:
+        file = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        file.write(contents)
+        file.seek(0)
+        files.append(file)
+        content_type = "image/png" if filename.endswith(".png") else "video/mp4"
+        return UploadFile(
+            file, filename=filename, headers=Headers({"content-type": content_type})
+        )
+
+    yield make
+    for file in files:
+        file.close()
+
+
+@pytest.fixture
+def drive(monkeypatch):
+    drive = MemoryStorage()
+    monkeypatch.setattr(services, "product_drive", drive)
+    return drive
+
+
+async def test_identical_uploads_share_files_but_not_rows(db, drive, make_upload):
+    first = await services.store(make_request(), make_upload(b"same clip"))
+    second = await services.store(make_request(), make_upload(b"same clip"))
+    assert first.id != second.id
+    assert first.alt != second.alt and first.url != second.url
+    assert first.content_hash == second.content_hash
+    assert first.renditions == second.renditions
+    assert list(drive.files) == first.get_file_names()
+
+
+async def test_deleting_one_owner_keeps_the_shared_files(db, drive, make_upload):
+    first = await services.store(make_request(), make_upload(b"same clip"))
+    second = await services.store(make_request(), make_upload(b"same clip"))
+    await services.delete_one(first.alt)
+    assert await models.Media.exists(id=second.id)
+    assert list(drive.files) == second.get_file_names()
+
+    await services.delete_many(schemas.IMediaDeleteIn(uris=[second.url]))
+    assert not await models.Media.exists(id=second.id)
+    assert drive.files == {}
+
+
+async def test_update_replaces_only_the_updated_media(db, drive, make_upload):
+    first = await services.store(make_request(), make_upload(b"same clip"))
+    second = await services.store(make_request(), make_upload(b"same clip"))
+    await services.update(make_request(), second.alt, make_upload(b"new clip"))
+    await first.refresh_from_db()
+    await second.refresh_from_db()
+    assert first.content_hash != second.content_hash
+    assert set(drive.files) == {*first.get_file_names(), *second.get_file_names()}
+
+    await services.update(make_request(), first.alt, make_upload(b"new clip"))
+    await first.refresh_from_db()
+    assert first.content_hash == second.content_hash
+    assert list(drive.files) == second.get_file_names()
+
+
+@pytest.fixture
+async def stored(drive):
+    await drive.put("clip.mp4", b"0123456789", content_type="video/mp4")
+    return await drive.get("clip.mp4")
+
+
+async def test_serve_returns_the_whole_file(stored):
+    response = await services.serve(make_request(), "clip.mp4")
+    assert response.status_code == 200
+    assert response.body == b"0123456789"
+    assert response.headers["etag"] == stored.etag
+    assert response.headers["accept-ranges"] == "bytes"
+    assert "last-modified" in response.headers
+
+
+async def test_serve_missing_file_is_not_found(drive):
+    with pytest.raises(error.NotFoundError):
+        await services.serve(make_request(), "missing.mp4")
+
+
+@pytest.mark.parametrize(
+    "byte_range, body, content_range",
+    [
+        ("bytes=2-5", b"2345", "bytes 2-5/10"),
+        ("bytes=7-", b"789", "bytes 7-9/10"),
+        ("bytes=-3", b"789", "bytes 7-9/10"),
+        ("bytes=8-100", b"89", "bytes 8-9/10"),
+    ],
+)
+async def test_serve_range_is_partial_content(stored, byte_range, body, content_range):
+    response = await services.serve(make_request({"Range": byte_range}), "clip.mp4")
+    assert response.status_code == 206
+    assert response.body == body
+    assert response.headers["content-range"] == content_range
+
+
+@pytest.mark.parametrize("byte_range", ["bytes=10-", "bytes=-0"])
+async def test_serve_unsatisfiable_range(stored, byte_range):
+    response = await services.serve(make_request({"Range": byte_range}), "clip.mp4")
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */10"
+
+
+async def test_serve_ignores_range_when_if_range_is_stale(stored):
+    request = make_request({"Range": "bytes=0-1", "If-Range": '"stale"'})
+    response = await services.serve(request, "clip.mp4")
+    assert response.status_code == 200
+    assert response.body == b"0123456789"
+
+    request = make_request({"Range": "bytes=0-1", "If-Range": stored.etag})
+    response = await services.serve(request, "clip.mp4")
+    assert response.status_code == 206
+    assert response.body == b"01"
+
+
+async def test_serve_not_modified(stored):
+    request = make_request({"If-None-Match": f'W/"other", {stored.etag}'})
+    response = await services.serve(request, "clip.mp4")
+    assert response.status_code == 304
+    assert response.headers["etag"] == stored.etag
+
+    request = make_request({"If-None-Match": '"other"'})
+    assert (await services.serve(request, "clip.mp4")).status_code == 200
+
+    since = formatdate(stored.modified_at + 60, usegmt=True)
+    request = make_request({"If-Modified-Since": since})
+    assert (await services.serve(request, "clip.mp4")).status_code == 304
+    since = formatdate(stored.modified_at - 60, usegmt=True)
+    request = make_request({"If-Modified-Since": since})
+    assert (await services.serve(request, "clip.mp4")).status_code == 200
@@ -0,0 +1,125 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+import pytest
+from fastapi import UploadFile
+from PIL import Image
+from fermerce.app.medias import utils
+from fermerce.core.settings import config
+from fermerce.lib.errors import error
+
+
+def make_noise(width: int, height: int) -> Image.Image:
+    # random pixels barely compress, so budgets are hard to meet
+    return Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+
+
+def test_renditions_stay_within_their_budgets():
+    buffer = BytesIO()
+    make_noise(1200, 900).save(buffer, format="PNG")
+    renditions = utils.make_renditions(buffer.getvalue())
+    assert set(renditions) == set(utils.RENDITIONS)
+    for name, (dimension, max_size) in utils.RENDITIONS.items():
+        assert len(renditions[name]) <= max_size * 1024
+        assert max(Image.open(BytesIO(renditions[name])).size) <= dimension
+
+
+def test_fit_image_keeps_full_size_while_quality_is_enough():
+    image = Image.new("RGB", (400, 300), "green")
+    data = utils.fit_image(image, 10 * 1024)
+    assert Image.open(BytesIO(data)).size == (400, 300)
+
+
+def test_fit_image_scales_down_when_the_lowest_quality_is_too_big():
+    image = make_noise(400, 400)
+    max_bytes = 4 * 1024
+    assert utils.search_quality(image, max_bytes) is None
+    data = utils.fit_image(image, max_bytes)
+    assert len(data) <= max_bytes
+    width, height = Image.open(BytesIO(data)).size
+    assert width < 400 and width == height
+
+
+async def test_image_pool_turns_uploads_away_past_the_queue_size(monkeypatch):
+    pool = ThreadPoolExecutor(max_workers=1)
+    slots = asyncio.Semaphore(0)
+    monkeypatch.setattr(utils, "_pool", pool)
+    monkeypatch.setattr(utils, "_slots", slots)
+    monkeypatch.setattr(config, "image_queue_size", 1)
+    waiting = asyncio.create_task(utils.run_in_image_pool(sum, [1, 2]))
+    await asyncio.sleep(0)
+    with pytest.raises(error.ServiceUnavailableError) as raised:
+        await utils.run_in_image_pool(sum, [3])
+    assert raised.value.status_code == 503
+    slots.release()
+    assert await waiting == 3
+    assert await utils.run_in_image_pool(sum, [3]) == 3
+    pool.shutdown()
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-0", (0, 0)),
+        ("bytes=0-99", (0, 99)),
+        ("bytes=10-", (10, 99)),
+        ("bytes=90-200", (90, 99)),
+        ("bytes=-10", (90, 99)),
+        ("bytes=-500", (0, 99)),
+        (" bytes = 5 - 6 ", (5, 6)),
+    ],
+)
+def test_parse_range(header, expected):
+    assert utils.parse_range(header, 100) == expected
+
+
+@pytest.mark.parametrize(
+    "header", ["items=0-1", "bytes=0-1,5-6", "bytes=-", "bytes=a-b", "bytes=9-3"]
+)
+def test_parse_range_ignores_unusable_headers(header):
+    assert utils.parse_range(header, 100) is None
+
+
+@pytest.mark.parametrize(
+    "header, size", [("bytes=100-", 100), ("bytes=-0", 100), ("bytes=-5", 0)]
+)
+def test_parse_range_rejects_unsatisfiable_ranges(header, size):
+    with pytest.raises(ValueError):
+        utils.parse_range(header, size)
+
+
+@pytest.fixture
+def upload():
+    # rolls over to disk like starlette's spooled uploads
+    file = tempfile.SpooledTemporaryFile(max_size=1024)
+    contents = os.urandom(utils.CHUNK_SIZE * 2 + 123)
+    file.write(contents)
+    file.seek(100)
+    yield UploadFile(file, filename="photo.png"), contents
+    file.close()
+
+
+async def test_hash_upload_digests_the_whole_file_and_rewinds(upload):
+    file, contents = upload
+    digest = await utils.hash_upload(file, max_size=len(contents))
+    assert digest == hashlib.sha256(contents).hexdigest()
+    assert file.file.tell() == 0
+    assert await file.read() == contents
+
+
+async def test_hash_upload_rejects_files_over_the_limit(upload):
+    file, contents = upload
+    with pytest.raises(error.BadDataError):
+        await utils.hash_upload(file, max_size=len(contents) - 1)
+
+
+async def test_hash_file_applies_the_limit_for_the_file_type(upload, monkeypatch):
+    file, contents = upload
+    monkeypatch.setattr(config, "max_image_upload_size", utils.CHUNK_SIZE)
+    with pytest.raises(error.BadDataError):
+        await utils.hash_file(file)
+    monkeypatch.setattr(config, "max_image_upload_size", len(contents))
+    assert await utils.hash_file(file) == hashlib.sha256(contents).hexdigest()
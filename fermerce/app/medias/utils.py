@@ -1,52 +1,237 @@
+import asyncio
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 import typing as t
 from fastapi import UploadFile
 from PIL import Image
 import mimetypes
+from email.utils import parsedate_to_datetime
+from fermerce.app.medias.storage import CHUNK_SIZE, Data
+from fermerce.core.settings import config
 from fermerce.lib.errors import error
 
+MIN_QUALITY = 40
+MAX_QUALITY = 85
+# images are never stored larger than this on their longest side
+MAX_DIMENSION = 2048
+# rendition name -> (longest side in px, max size in KB)
+RENDITIONS: t.Dict[str, t.Tuple[int, int]] = {
+    "thumbnail": (160, 20),
+    "card": (480, 60),
+    "full": (MAX_DIMENSION, 200),
+}
 
-async def compress_file(
-    file: UploadFile, max_size: int = 200
-) -> t.Tuple[bytes, str]:
-    # Read the file contents
-    contents = await file.read()
+_pool: t.Optional[ProcessPoolExecutor] = None
+_slots: t.Optional[asyncio.Semaphore] = None
+_waiting = 0
+
+
+def encode_webp(image: Image.Image, quality: int) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format="WEBP", quality=quality, method=4)
+    return buffer.getvalue()
+
+
+def scale_image(image: Image.Image, scale: float) -> Image.Image:
+    size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+    return image.resize(size, Image.LANCZOS)
+
+
+def search_quality(image: Image.Image, max_bytes: int) -> t.Optional[bytes]:
+    """Highest quality encoding that fits ``max_bytes``, or None."""
+    best = None
+    low, high = MIN_QUALITY, MAX_QUALITY
+    while low <= high:
+        quality = (low + high) // 2
+        data = encode_webp(image, quality)
+        if len(data) <= max_bytes:
+            best = data
+            low = quality + 1
+        else:
+            high = quality - 1
+    return best
+
+
+def fit_image(image: Image.Image, max_bytes: int) -> bytes:
+    """Encode ``image`` as WEBP under ``max_bytes``.
+
+    Quality is binary searched first; only when the lowest quality is still too
+    large is the largest fitting scale binary searched at that quality.
+    """
+    data = encode_webp(image, MAX_QUALITY)
+    if len(data) <= max_bytes:
+        return data
+    data = search_quality(image, max_bytes)
+    if data is not None:
+        return data
+
+    # bytes shrink roughly with area, so the first guess is usually close
+    smallest = encode_webp(image, MIN_QUALITY)
+    low, high = 0.05, min(1.0, (max_bytes / len(smallest)) ** 0.5 * 1.2)
+    best = None
+    for _ in range(6):
+        scale = (low + high) / 2
+        data = encode_webp(scale_image(image, scale), MIN_QUALITY)
+        if len(data) <= max_bytes:
+            best, low = data, scale
+        else:
+            high = scale
+    return best or encode_webp(scale_image(image, low), MIN_QUALITY)
+
+
+def open_image(contents: bytes) -> Image.Image:
+    image = Image.open(BytesIO(contents))
+    image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    image.thumbnail((MAX_DIMENSION, MAX_DIMENSION), Image.LANCZOS)
+    return image
+
+
+def make_renditions(contents: bytes) -> t.Dict[str, bytes]:
+    """Decode once and encode every rendition; runs in the image workers."""
+    image = open_image(contents)
+    renditions = {}
+    for name, (dimension, max_size) in RENDITIONS.items():
+        resized = image.copy()
+        resized.thumbnail((dimension, dimension), Image.LANCZOS)
+        renditions[name] = fit_image(resized, max_size * 1024)
+    return renditions
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    global _pool, _slots
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=config.image_workers)
+        _slots = asyncio.Semaphore(config.image_workers)
+    return _pool
+
+
+def shutdown_image_pool() -> None:
+    global _pool, _slots
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool, _slots = None, None
 
-    # Get the file type
-    file_type = mimetypes.guess_type(file.filename)[0]
 
-    # Compress the file based on its type
-    if file_type and file_type.startswith("image"):
-        # Open the image
-        image = Image.open(BytesIO(contents))
-
-        # Compress the image
-        while True:
-            # Save the image with the desired quality
-            buffer = BytesIO()
-            image.save(buffer, format="WEBP", optimize=True, quality=70)
-            buffer.seek(0)
-
-            # Check the file size of the compressed image
-            size = len(buffer.getvalue()) / 1024
-            if size < max_size:
-                break
-
-            # Decrease the quality and try again
-            image = image.resize(
-                (int(image.size[0] * 0.9), int(image.size[1] * 0.9)),
-                Image.ANTIALIAS,
+async def run_in_image_pool(func: t.Callable, *args: t.Any) -> t.Any:
+    """Run ``func`` in the image pool, waiting for a free worker.
+
+    At most ``image_queue_size`` jobs may wait; beyond that uploads are turned
+    away instead of piling up in memory.
+    """
+    global _waiting
+    pool = get_image_pool()
+    if _waiting >= config.image_queue_size:
+        raise error.ServiceUnavailableError("Too many uploads in progress, try again")
+    _waiting += 1
+    try:
+        await _slots.acquire()
+    finally:
+        _waiting -= 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+    finally:
+        _slots.release()
+
+
+async def hash_upload(file: UploadFile, max_size: int) -> str:
+    """sha256 of an upload, read in chunks; rejects files over ``max_size`` bytes.
+
+    Starlette spools uploads to disk past 1MB, so this keeps memory flat
+    however large the file is.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    await file.seek(0)
+    while True:
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_size:
+            raise error.BadDataError(
+                f"{file.filename} is larger than {max_size // (1024 * 1024)}MB"
             )
+        digest.update(chunk)
+    await file.seek(0)
+    return digest.hexdigest()
+
+
+def get_file_type(file: UploadFile) -> str:
+    """``image`` or ``video``, the kinds of upload that can be stored."""
+    file_type = mimetypes.guess_type(file.filename)[0]
+    if file_type and file_type.startswith(("image", "video")):
+        return file_type.split("/")[0]
+    # Unsupported file type
+    raise ValueError("Unsupported file type")
+
+
+async def hash_file(file: UploadFile) -> str:
+    """sha256 of an upload, within the size limit for its file type."""
+    if get_file_type(file) == "image":
+        return await hash_upload(file, config.max_image_upload_size)
+    return await hash_upload(file, config.max_video_upload_size)
+
+
+async def process_file(file: UploadFile) -> t.Tuple[t.Dict[str, Data], str]:
+    """Return the renditions to store and their content type.
+
+    Uploads are hashed first with ``hash_file``, which also enforces the size
+    limit, so duplicates never reach the image workers. Videos are returned as
+    the spooled upload itself for the storage to copy.
+    """
+    if get_file_type(file) == "image":
+        contents = await file.read()
+        try:
+            renditions = await run_in_image_pool(make_renditions, contents)
+        except (OSError, ValueError, Image.DecompressionBombError):
+            raise error.BadDataError(f"{file.filename} is not a valid image")
+        return renditions, "image/webp"
+    return {"full": file.file}, "video/mp4"
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    return etag in [tag.strip().removeprefix("W/") for tag in header.split(",")]
+
+
+def is_not_modified(
+    headers: t.Mapping[str, str], etag: str, modified_at: t.Optional[float]
+) -> bool:
+    if_none_match = headers.get("if-none-match")
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and modified_at:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(modified_at) <= since
+    return False
+
+
+def parse_range(header: str, size: int) -> t.Optional[t.Tuple[int, int]]:
+    """Inclusive (start, end) of a single ``bytes=`` range.
 
-        # Return the compressed image
-        content_type = "image/webp"
-        return buffer.getvalue(), content_type
-    elif file_type and file_type.startswith("video"):
-        max_size = 1024 * 1024  # 1 megabyte in bytes
-
-        if file.size > max_size:
-            return contents, "video/mp4"
-        raise error.BadDataError("file  file size is too large")
-    else:
-        # Unsupported file type
-        raise ValueError("Unsupported file type")
+    Returns None for headers that should be ignored (malformed or multiple
+    ranges) and raises ValueError when the range cannot be satisfied.
+    """
+    unit, _, ranges = header.partition("=")
+    if unit.strip() != "bytes" or "," in ranges:
+        return None
+    first, _, last = (part.strip() for part in ranges.partition("-"))
+    if not (first or last) or not all(p.isdigit() for p in (first, last) if p):
+        return None
+    if not first:
+        if int(last) == 0 or size == 0:
+            raise ValueError("empty suffix range")
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        raise ValueError("range starts after the end of the file")
+    if start > end:
+        return None
+    return start, min(end, size - 1)
@@ -2,8 +2,11 @@ import uuid
 import typing as t
 from fastapi import APIRouter, Depends, Query, status
 from fermerce.app.message import services, schemas
-from fermerce.app.staff.dependency import require_super_admin_or_admin
-from fermerce.app.staff.models import Staff
+from fermerce.app.staff.dependency import (
+    StaffAccess,
+    require_permissions,
+    require_super_admin_or_admin,
+)
 from fermerce.core.enum.sort_type import SortOrder
 
 router = APIRouter(prefix="/messages", tags=["Message"])
@@ -12,19 +15,23 @@ router = APIRouter(prefix="/messages", tags=["Message"])
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_message(
     data_in: schemas.IMessageIn,
-    staff: Staff = Depends(require_super_admin_or_admin),
+    access: StaffAccess = Depends(
+        require_permissions("super_admin", "admin", load_staff=True)
+    ),
 ):
-    return await services.create(data_in=data_in, staff=staff)
+    return await services.create(data_in=data_in, staff=access.staff)
 
 
 @router.put("/{message_id}", status_code=status.HTTP_200_OK)
 async def update_message(
     message_id: uuid.UUID,
     data_in: schemas.IMessageIn,
-    staff: Staff = Depends(require_super_admin_or_admin),
+    access: StaffAccess = Depends(
+        require_permissions("super_admin", "admin", load_staff=True)
+    ),
 ):
     return await services.update(
-        message_id=message_id, data_in=data_in, staff=staff
+        message_id=message_id, data_in=data_in, staff=access.staff
     )
 
 
@@ -38,6 +45,12 @@ async def get_messages(
     vendor_id: uuid.UUID,
     per_page: int = 10,
     page: int = 1,
+    cursor: t.Optional[str] = Query(
+        default=None,
+        description="cursor pagination, send an empty value for the first page "
+        "and the returned next_cursor afterwards",
+    ),
+    count: bool = Query(default=False, description="total_results over all pages"),
     select: t.Optional[str] = Query(
         default="", description="select order direct attributes, e.g. id"
     ),
@@ -51,13 +64,19 @@ async def get_messages(
         default="id", description="order by attribute, e.g. id"
     ),
     load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. sender,vendor"
+    ),
 ):
     return await services.filter(
         vendor_id=vendor_id,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         select=select,
         load_related=load_related,
+        expand=expand,
         filter_string=filter_string,
         order_by=order_by,
         sort_by=sort_by,
@@ -66,7 +85,7 @@ async def get_messages(
 
 @router.delete("/{message_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_message(
-    message_id: uuid.UUID, _: Staff = Depends(require_super_admin_or_admin)
+    message_id: uuid.UUID, _: StaffAccess = Depends(require_super_admin_or_admin)
 ) -> None:
     return await services.delete(
         message_id=message_id,
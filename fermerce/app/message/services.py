@@ -55,8 +55,11 @@ async def filter(
     vendor_id: uuid.UUID,
     per_page: int = 10,
     page: int = 1,
+    cursor: str = None,
+    count: bool = False,
     select: str = "",
     load_related: bool = False,
+    expand: str = "",
     filter_string: str = None,
     sort_by: SortOrder = SortOrder.desc,
     order_by: str = "created_at",
@@ -69,10 +72,13 @@ async def filter(
         query=query,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         select=select,
         order_by=order_by,
         sort_by=sort_by,
         load_related=load_related,
+        expand=expand,
     )
     return results
 
@@ -23,6 +23,12 @@ async def get_all_orders(
     ),
     per_page: int = 10,
     page: int = 1,
+    cursor: t.Optional[str] = Query(
+        default=None,
+        description="cursor pagination, send an empty value for the first page "
+        "and the returned next_cursor afterwards",
+    ),
+    count: bool = Query(default=False, description="total_results over all pages"),
     sort_by: t.Optional[SortOrder] = Query(
         default=SortOrder.desc, description="order by attribute, e.g. id"
     ),
@@ -33,6 +39,8 @@ async def get_all_orders(
     return await services.filter(
         filter_string=filter_string,
         page=page,
+        cursor=cursor,
+        count=count,
         per_page=per_page,
         sort_by=sort_by,
         order_by=order_by,
@@ -23,6 +23,12 @@ async def get_user_orders(
     ),
     per_page: int = 10,
     page: int = 1,
+    cursor: t.Optional[str] = Query(
+        default=None,
+        description="cursor pagination, send an empty value for the first page "
+        "and the returned next_cursor afterwards",
+    ),
+    count: bool = Query(default=False, description="total_results over all pages"),
     sort_by: t.Optional[SortOrder] = Query(
         default=SortOrder.desc, description="order by attribute, e.g. id"
     ),
@@ -34,16 +40,22 @@ async def get_user_orders(
     ),
     user: User = Depends(require_user),
     load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. payment,order_items"
+    ),
 ):
     return await services.filter(
         filter_string=filter_string,
         page=page,
+        cursor=cursor,
+        count=count,
         per_page=per_page,
         sort_by=sort_by,
         order_by=order_by,
         user=user,
         select=select,
         load_related=load_related,
+        expand=expand,
     )
 
 
@@ -52,11 +64,15 @@ async def get_order(
     order_id: uuid.UUID,
     user: User = Depends(require_user),
     load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. payment,order_items"
+    ),
 ):
     return await services.get_order(
         order_id=order_id,
         user=user,
         load_related=load_related,
+        expand=expand,
     )
 
 
@@ -75,13 +91,25 @@ async def get_order_items(
     order_id: str,
     user: User = Depends(require_user),
     load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. product,selling_unit"
+    ),
     per_page: int = 10,
     page: int = 1,
+    cursor: t.Optional[str] = Query(
+        default=None,
+        description="cursor pagination, send an empty value for the first page "
+        "and the returned next_cursor afterwards",
+    ),
+    count: bool = Query(default=False, description="total_results over all pages"),
 ):
     return await services.get_order_items(
         order_id=order_id,
         user=user,
         load_related=load_related,
+        expand=expand,
         page=page,
+        cursor=cursor,
+        count=count,
         per_page=per_page,
     )
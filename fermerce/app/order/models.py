@@ -26,6 +26,15 @@ class Order(models.Model):
 
     class Meta:
         table = "fm_order"
+        expandable = (
+            "shipping_address",
+            "delivery_mode",
+            "payment",
+            "order_items",
+            "shipping_address__state",
+            "order_items__product",
+            "order_items__status",
+        )
 
 
 class OrderItem(models.Model):
@@ -48,3 +57,35 @@ class OrderItem(models.Model):
 
     class Meta:
         table = "fm_order_item"
+        expandable = (
+            "order",
+            "product",
+            "selling_unit",
+            "status",
+            "promo_codes",
+            "trackings",
+            "selling_unit__unit",
+        )
+
+
+class OrderRouting(models.Model):
+    """Placed orders in placement order, read by the batch router past its
+    watermark."""
+
+    id = fields.BigIntField(pk=True)
+    order_id = fields.UUIDField(unique=True)
+    created_at = fields.DatetimeField(auto_now_add=True, index=True)
+    # set once the order is linked to a warehouse; unset rows are retried
+    routed_at = fields.DatetimeField(null=True, index=True)
+
+    class Meta:
+        table = "fm_order_routing"
+
+
+class RoutingWatermark(models.Model):
+    name = fields.CharField(max_length=50, pk=True)
+    position = fields.BigIntField(default=0)
+    modified_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "fm_routing_watermark"
@@ -0,0 +1,202 @@
+import datetime
+import logging
+import typing as t
+import uuid
+from pypika import Table
+from tortoise import timezone
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.fields.relational import ManyToManyFieldInstance
+from tortoise.transactions import in_transaction
+from fermerce.app.order.models import (
+    Order,
+    OrderItem,
+    OrderRouting,
+    RoutingWatermark,
+)
+from fermerce.app.vendor.models import Vendor
+from fermerce.app.warehouse.models import WereHouse
+
+WAREHOUSE_ORDERS: ManyToManyFieldInstance = WereHouse._meta.fields_map["orders"]
+VENDOR_ORDERS: ManyToManyFieldInstance = Vendor._meta.fields_map["orders"]
+
+WATERMARK = "order_routing"
+
+logger = logging.getLogger(__name__)
+
+# (owner id, related id) rows of a many to many through table
+Link = t.Tuple[str, str]
+
+
+async def get_warehouse_by_state(
+    connection: BaseDBAsyncClient, state_ids: t.Iterable[t.Any]
+) -> t.Dict[str, str]:
+    """The warehouse serving each state, the oldest one where there are several.
+
+    Read in the routing transaction rather than cached, so a warehouse added
+    or removed through the api is seen by the workers on their next order.
+    """
+    warehouses = await (
+        WereHouse.filter(state_id__in=list(state_ids))
+        .order_by("created")
+        .using_db(connection)
+        .values_list("id", "state_id")
+    )
+    by_state: t.Dict[str, str] = {}
+    for warehouse_id, state_id in warehouses:
+        by_state.setdefault(str(state_id), str(warehouse_id))
+    return by_state
+
+
+async def insert_links(
+    connection: BaseDBAsyncClient,
+    relation: ManyToManyFieldInstance,
+    links: t.Set[Link],
+) -> int:
+    """Add the missing ``links`` to a through table with one INSERT.
+
+    Through tables have no unique constraint, so rows already present are
+    read first and skipped; this is what keeps routing safe to retry.
+    """
+    if not links:
+        return 0
+    table = Table(relation.through)
+    owner_key, related_key = relation.backward_key, relation.forward_key
+    existing_query = (
+        connection.query_class.from_(table)
+        .select(owner_key, related_key)
+        .where(table[related_key].isin(list({related for _, related in links})))
+    )
+    existing = {
+        (str(row[owner_key]), str(row[related_key]))
+        for row in await connection.execute_query_dict(str(existing_query))
+    }
+    missing = sorted(links - existing)
+    if missing:
+        insert_query = (
+            connection.query_class.into(table)
+            .columns(owner_key, related_key)
+            .insert(*missing)
+        )
+        await connection.execute_query(str(insert_query))
+    return len(missing)
+
+
+async def route_orders(order_ids: t.Iterable[t.Union[str, uuid.UUID]]) -> int:
+    """Link orders to the warehouse of their shipping state and their items to
+    the vendors selling them; returns how many orders were found.
+
+    Orders given a warehouse are marked routed in ``OrderRouting``.
+    """
+    order_ids = [str(order_id) for order_id in order_ids]
+    if not order_ids:
+        return 0
+    async with in_transaction() as connection:
+        # concurrent retries of the same orders wait here instead of both inserting
+        locked = (
+            await Order.filter(id__in=order_ids)
+            .select_for_update()
+            .using_db(connection)
+            .values_list("id", flat=True)
+        )
+        if not locked:
+            return 0
+        orders = await (
+            Order.filter(id__in=locked)
+            .using_db(connection)
+            .values_list("id", "shipping_address__state_id")
+        )
+        warehouse_by_state = await get_warehouse_by_state(
+            connection, {state_id for _, state_id in orders if state_id is not None}
+        )
+        items = await (
+            OrderItem.filter(order_id__in=locked)
+            .using_db(connection)
+            .values_list("id", "product__vendor_id")
+        )
+        warehouse_links = {
+            (warehouse_by_state[str(state_id)], str(order_id))
+            for order_id, state_id in orders
+            if str(state_id) in warehouse_by_state
+        }
+        vendor_links = {
+            (str(vendor_id), str(item_id))
+            for item_id, vendor_id in items
+            if vendor_id is not None
+        }
+        await insert_links(connection, WAREHOUSE_ORDERS, warehouse_links)
+        await insert_links(connection, VENDOR_ORDERS, vendor_links)
+        if warehouse_links:
+            await OrderRouting.filter(
+                order_id__in=[order_id for _, order_id in warehouse_links]
+            ).using_db(connection).update(routed_at=timezone.now())
+    return len(locked)
+
+
+async def route_pending(batch_size: int, settle_time: float = 0) -> int:
+    """Route the next batch of queued orders past the watermark and advance it.
+
+    Orders queued less than ``settle_time`` seconds ago wait for the next run:
+    a checkout still committing may hold a lower id than one already visible.
+    Orders left without a warehouse stay unrouted for ``retry_unrouted``.
+    Returns how many queued orders the batch covered.
+    """
+    await RoutingWatermark.get_or_create(name=WATERMARK)
+    settled_at = timezone.now() - datetime.timedelta(seconds=settle_time)
+    async with in_transaction() as connection:
+        # one runner at a time; a second one waits and then sees the new position
+        watermark = (
+            await RoutingWatermark.filter(name=WATERMARK)
+            .select_for_update()
+            .using_db(connection)
+            .get()
+        )
+        queued = (
+            await OrderRouting.filter(
+                id__gt=watermark.position, created_at__lte=settled_at
+            )
+            .order_by("id")
+            .limit(batch_size)
+            .using_db(connection)
+            .values_list("id", "order_id")
+        )
+        if not queued:
+            return 0
+        await route_orders([order_id for _, order_id in queued])
+        unrouted = (
+            await OrderRouting.filter(
+                id__gt=watermark.position,
+                id__lte=queued[-1][0],
+                routed_at__isnull=True,
+            )
+            .using_db(connection)
+            .count()
+        )
+        if unrouted:
+            logger.warning("%d orders have no warehouse for their state yet", unrouted)
+        watermark.position = queued[-1][0]
+        await watermark.save(using_db=connection)
+    return len(queued)
+
+
+async def retry_unrouted(batch_size: int) -> int:
+    """Route again orders the watermark passed without a warehouse, such as
+    those placed before their state had one; returns how many are still left.
+    """
+    watermark = await RoutingWatermark.get_or_none(name=WATERMARK)
+    if watermark is None:
+        return 0
+    unrouted = (
+        await OrderRouting.filter(id__lte=watermark.position, routed_at__isnull=True)
+        .order_by("id")
+        .limit(batch_size)
+        .values_list("order_id", flat=True)
+    )
+    if not unrouted:
+        return 0
+    await route_orders(unrouted)
+    remaining = await OrderRouting.filter(
+        order_id__in=unrouted, routed_at__isnull=True
+    ).count()
+    if remaining:
+        logger.warning("%d orders are still waiting for a warehouse", remaining)
+    return remaining
@@ -1,17 +1,21 @@
+import asyncio
 import datetime
 import typing as t
 import uuid
 from tortoise.expressions import Q
+from tortoise.transactions import in_transaction
+from fermerce.app.cart import reservation
 from fermerce.app.cart.models import Cart
 from fermerce.app.promo_code.models import ProductPromoCode
-from fermerce.app.delivery_mode.models import DeliveryMode
-from fermerce.app.status.models import Status
+from fermerce.app.delivery_mode.services import delivery_mode_cache
+from fermerce.app.status import services as status_services
 from fermerce.app.address.models import Address
 from fermerce.app.user.models import User
 from fermerce.app.order import models, schemas
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import IResponseMessage
 from fermerce.core.services.base import filter_and_list, filter_and_single
+from fermerce.core.settings import config
 from fermerce.lib.errors import error
 from fermerce.taskiq.warehouse.tasks import add_order_to_warehouse_and_vendor
 
@@ -20,54 +24,81 @@ async def create(
     data_in: schemas.IOrderIn,
     user: User,
 ) -> schemas.IOrderSuccessOut:
-    get_shipping_address = await Address.get_or_none(id=data_in.address_id)
+    cart_query = Cart.filter(user=user)
+    if data_in.cart_ids:
+        cart_query = cart_query.filter(id__in=data_in.cart_ids)
+    (
+        get_shipping_address,
+        get_delivery_mode,
+        get_carts,
+        get_initial_status,
+    ) = await asyncio.gather(
+        Address.get_or_none(id=data_in.address_id),
+        delivery_mode_cache.get(data_in.delivery_mode),
+        cart_query,
+        status_services.get_or_create_by_name("pending"),
+    )
     if not get_shipping_address:
         raise error.NotFoundError("Shipping shipping_address does not exist")
-    get_delivery_mode = await DeliveryMode.get_or_none(id=data_in.delivery_mode)
     if not get_delivery_mode:
         raise error.NotFoundError("Order delivery mode not found")
-    get_carts = (
-        await Cart.filter(user=user, id__in=data_in.cart_ids)
-        .prefetch_related("product", "selling_unit")
-        .all()
-    )
     if not get_carts:
         raise error.NotFoundError(
             "No product in cart, please add product to cart to continue"
         )
-    get_initial_status = await Status.get_or_none(name__icontains="pending")
-    if not get_initial_status:
-        get_initial_status = await Status.create(name="pending")
-
-    new_order = await models.Order.create(
-        user=user,
-        shipping_address=get_shipping_address,
-        delivery_mode=get_delivery_mode,
-        is_completed=False,
-    )
 
-    if new_order:
-        order_items_list = [
-            models.OrderItem(
-                status=get_initial_status,
-                product=item.product,
-                quantity=item.quantity,
-                selling_unit=item.selling_unit,
-                order=new_order,
+    async with in_transaction() as connection:
+        for cart in get_carts:
+            # the sweeper hands back stock of carts left alone past their ttl
+            missing = cart.quantity - cart.reserved_quantity
+            if missing > 0 and not await reservation.take_stock(
+                cart.selling_unit_id, missing, connection
+            ):
+                raise error.BadDataError(
+                    "Some products in your cart are no longer in stock"
+                )
+        new_order = await models.Order.create(
+            user=user,
+            shipping_address=get_shipping_address,
+            delivery_mode=get_delivery_mode,
+            is_complete=False,
+            using_db=connection,
+        )
+        await models.OrderItem.bulk_create(
+            [
+                models.OrderItem(
+                    status=get_initial_status,
+                    product_id=cart.product_id,
+                    quantity=cart.quantity,
+                    selling_unit_id=cart.selling_unit_id,
+                    order=new_order,
+                )
+                for cart in get_carts
+            ],
+            using_db=connection,
+        )
+        # a cart changed or released since it was read fails the whole order
+        deleted_count = (
+            await Cart.filter(
+                Q(
+                    *[
+                        Q(id=cart.id, reserved_quantity=cart.reserved_quantity)
+                        for cart in get_carts
+                    ],
+                    join_type=Q.OR,
+                )
             )
-            for item in get_carts
-        ]
-
-        if order_items_list:
-            results = await models.OrderItem.bulk_create(order_items_list)
-            if results:
-                await add_order_to_warehouse_and_vendor(order_id=new_order.id)
-                deleted_count = await Cart.filter(
-                    user=user, id__in=data_in.cart_ids
-                ).delete()
-                if deleted_count == len(get_carts):
-                    return schemas.IOrderSuccessOut(order_id=new_order.id)
-    raise error.ServerError("Error creating order, please try again")
+            .using_db(connection)
+            .delete()
+        )
+        if deleted_count != len(get_carts):
+            raise error.DuplicateError(
+                "Your cart changed while placing the order, please try again"
+            )
+        await models.OrderRouting.create(order_id=new_order.id, using_db=connection)
+    if not config.route_orders_in_batches:
+        await add_order_to_warehouse_and_vendor.kiq(order_id=str(new_order.id))
+    return schemas.IOrderSuccessOut(order_id=new_order.id)
 
 
 async def update_order_status(data_in: schemas.IOrderUpdate) -> dict:
@@ -77,7 +108,7 @@ async def update_order_status(data_in: schemas.IOrderUpdate) -> dict:
         )
         if not get_user_order_item:
             raise error.NotFoundError("Order item is not found")
-        get_status = await Status.get_or_none(id=data_in.status_id)
+        get_status = await status_services.status_cache.get(data_in.status_id)
         if not get_status:
             raise error.NotFoundError("Status is not found")
         get_user_order_item.status = get_status
@@ -129,9 +160,12 @@ async def filter(
     filter_string: str = "",
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     order_by: str = "id",
     sort_by: t.Optional[SortOrder] = SortOrder.asc,
     load_related: bool = False,
+    expand: str = "",
     select: str = "",
 ) -> models.Order:
     query = models.Order
@@ -145,8 +179,11 @@ async def filter(
         sort_by=sort_by,
         order_by=order_by,
         page=page,
+        cursor=cursor,
+        count=count,
         per_page=per_page,
         load_related=load_related,
+        expand=expand,
         select=select,
     )
     return result
@@ -156,12 +193,14 @@ async def get_order(
     user: User,
     order_id: uuid.UUID,
     load_related: bool = False,
+    expand: str = "",
 ) -> models.Order:
     query = models.Order.filter(id=order_id, user=user)
     result = await filter_and_single(
         model=models.Order,
         query=query,
         load_related=load_related,
+        expand=expand,
     )
     if result:
         return result
@@ -172,15 +211,21 @@ async def get_order_items(
     user: User,
     order_id: uuid.UUID,
     load_related: bool = False,
+    expand: str = "",
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
 ) -> models.OrderItem:
     query = models.OrderItem.filter(order__user=user, order__id=order_id)
     results = await filter_and_list(
         model=models.OrderItem,
         query=query,
         load_related=load_related,
+        expand=expand,
         page=page,
+        cursor=cursor,
+        count=count,
         per_page=per_page,
     )
     if results:
@@ -0,0 +1,134 @@
+import asyncio
+import uuid
+import pytest
+from tortoise import Tortoise
+from fermerce.app.address.models import Address
+from fermerce.app.country.models import Country
+from fermerce.app.delivery_mode.models import DeliveryMode
+from fermerce.app.order import routing
+from fermerce.app.measuring_unit.models import MeasuringUnit
+from fermerce.app.order.models import Order, OrderItem, OrderRouting
+from fermerce.app.product.models import Product
+from fermerce.app.selling_units.models import ProductSellingUnit
+from fermerce.app.state.models import State
+from fermerce.app.status.models import Status
+from fermerce.app.user.models import User
+from fermerce.app.vendor.models import Vendor
+from fermerce.app.warehouse.models import WereHouse
+
+
+@pytest.fixture
+async def place(db):
+    country = await Country.create(name="Nigeria")
+    user = await User.create(username="buyer", email="buyer@test", lastname="b")
+    delivery_mode = await DeliveryMode.create(name="fast", price=1)
+
+    async def place(state: State) -> Order:
+        address = await Address.create(street="s", city="c", state=state)
+        order = await Order.create(
+            order_id=uuid.uuid4().hex[:10],
+            user=user,
+            shipping_address=address,
+            delivery_mode=delivery_mode,
+        )
+        await OrderRouting.create(order_id=order.id)
+        return order
+
+    place.country = country
+    return place
+
+
+async def get_warehouse_links():
+    rows = await Tortoise.get_connection("default").execute_query_dict(
+        "SELECT fm_warehouse_review_id, order_id FROM fm__rel_order_warehouse"
+    )
+    return sorted((row["fm_warehouse_review_id"], row["order_id"]) for row in rows)
+
+
+async def get_vendor_links():
+    rows = await Tortoise.get_connection("default").execute_query_dict(
+        "SELECT fm_vendor_id, orderitem_id FROM fm_vendor_orders"
+    )
+    return sorted((row["fm_vendor_id"], row["orderitem_id"]) for row in rows)
+
+
+async def add_item(order: Order, vendor: Vendor) -> OrderItem:
+    product = await Product.create(
+        name=uuid.uuid4().hex,
+        slug=uuid.uuid4().hex,
+        description="d",
+        vendor=vendor,
+        sku=uuid.uuid4().hex[:10],
+    )
+    unit = await MeasuringUnit.create(unit=uuid.uuid4().hex[:10])
+    selling_unit = await ProductSellingUnit.create(
+        unit=unit, size=1, price=10, product=product
+    )
+    status, _ = await Status.get_or_create(name="pending")
+    return await OrderItem.create(
+        order=order,
+        product=product,
+        selling_unit=selling_unit,
+        status=status,
+        tracking_id=uuid.uuid4().hex[:10],
+    )
+
+
+async def test_route_orders_links_the_oldest_warehouse_and_each_vendor(place):
+    kano = await State.create(name="Kano", country=place.country)
+    oldest = await WereHouse.create(street="a", city="Kano", state=kano)
+    await WereHouse.create(street="b", city="Kano 2", state=kano)
+    order = await place(kano)
+    first, second = [
+        await Vendor.create(business_name=name, password="x", phone_number=name)
+        for name in ("first", "second")
+    ]
+    items = [await add_item(order, first), await add_item(order, second)]
+
+    assert await routing.route_orders([order.id]) == 1
+    assert await get_warehouse_links() == [(str(oldest.id), str(order.id))]
+    assert await get_vendor_links() == sorted(
+        [(str(first.id), str(items[0].id)), (str(second.id), str(items[1].id))]
+    )
+
+
+async def test_route_orders_can_be_retried(place):
+    kano = await State.create(name="Kano", country=place.country)
+    await WereHouse.create(street="a", city="Kano", state=kano)
+    vendor = await Vendor.create(business_name="v", password="x", phone_number="1")
+    orders = [await place(kano) for _ in range(3)]
+    for order in orders:
+        await add_item(order, vendor)
+
+    await routing.route_orders([orders[0].id])
+    await asyncio.gather(
+        routing.route_orders([order.id for order in orders]),
+        routing.route_orders([order.id for order in orders]),
+    )
+    await routing.route_orders([order.id for order in orders])
+    assert len(await get_warehouse_links()) == 3
+    assert len(await get_vendor_links()) == 3
+    assert await routing.route_orders([uuid.uuid4()]) == 0
+
+
+async def test_route_pending_keeps_orders_without_a_warehouse(place):
+    kano = await State.create(name="Kano", country=place.country)
+    lagos = await State.create(name="Lagos", country=place.country)
+    await WereHouse.create(street="a", city="Kano", state=kano)
+    routed = await place(kano)
+    waiting = await place(lagos)
+
+    assert await routing.route_pending(batch_size=10) == 2
+    assert await routing.route_pending(batch_size=10) == 0
+    assert await OrderRouting.get(order_id=routed.id).values_list(
+        "routed_at", flat=True
+    )
+    assert not await OrderRouting.get(order_id=waiting.id).values_list(
+        "routed_at", flat=True
+    )
+    assert await routing.retry_unrouted(batch_size=10) == 1
+
+    warehouse = await WereHouse.create(street="b", city="Lagos", state=lagos)
+    assert await routing.retry_unrouted(batch_size=10) == 0
+    assert (str(warehouse.id), str(waiting.id)) in await get_warehouse_links()
+    assert not await OrderRouting.filter(routed_at__isnull=True).exists()
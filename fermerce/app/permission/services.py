@@ -4,11 +4,17 @@ from fastapi import status
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import ITotalCount
 from fermerce.core.services.base import filter_and_list
+from fermerce.core.services.reference import ReferenceCache
 from fermerce.lib.errors import error
 from fermerce.app.permission import schemas, models
+from fermerce.app.user.dependency import clear_principals
+from fermerce.app.staff.dependency import clear_staff_access
 from fastapi import Response
 
 
+permission_cache = ReferenceCache(models.Permission)
+
+
 # create permission
 async def create(
     data_in: schemas.IPermissionIn,
@@ -19,13 +25,14 @@ async def create(
     new_type = await models.Permission.create(**data_in.dict())
     if not new_type:
         raise error.ServerError("Internal server error")
+    permission_cache.invalidate()
     return new_type
 
 
 async def get(
     permission_id: uuid.UUID,
 ) -> models.Permission:
-    perm = await models.Permission.get_or_none(id=permission_id)
+    perm = await permission_cache.get(permission_id)
     if not perm:
         raise error.NotFoundError("permission not found")
     return perm
@@ -36,6 +43,8 @@ async def filter(
     filter_string: str,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     select: str = "",
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
@@ -49,6 +58,8 @@ async def filter(
         model=models.Permission,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         sort_by=sort_by,
         order_by=order_by,
         select=select,
@@ -73,7 +84,11 @@ async def update(
         raise error.DuplicateError("permission already exists")
     elif check_name and check_name.id == permission_id:
         return check_permission
-    await check_permission.update_from_dict(data_in.dict())
+    check_permission.update_from_dict(data_in.dict())
+    await check_permission.save()
+    permission_cache.invalidate()
+    clear_principals()
+    clear_staff_access()
     return check_permission
 
 
@@ -86,4 +101,7 @@ async def delete(
     ).delete()
     if not deleted_permission:
         raise error.NotFoundError("permission does not exist")
+    permission_cache.invalidate()
+    clear_principals()
+    clear_staff_access()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,37 @@
+import pytest
+from fermerce.app.permission import models
+from fermerce.app.permission.services import permission_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(db):
+    permission_cache.invalidate()
+
+
+async def test_cache_sees_created_permissions(db):
+    assert await permission_cache.get_by_name("admin") is None
+    await models.Permission.create(name="admin")
+    permission_cache.invalidate()
+    assert (await permission_cache.get_by_name("ADMIN")).name == "admin"
+
+
+async def test_invalidate_during_a_load_is_not_lost(db, monkeypatch):
+    class WriteDuringLoad:
+        @staticmethod
+        async def all():
+            rows = await models.Permission.all()
+            # another request writes once the rows were read
+            await models.Permission.create(name="dispatcher")
+            permission_cache.invalidate()
+            return rows
+
+    monkeypatch.setattr(permission_cache, "model", WriteDuringLoad)
+    assert await permission_cache.get_by_name("dispatcher") is None
+    monkeypatch.setattr(permission_cache, "model", models.Permission)
+    assert await permission_cache.get_by_name("dispatcher")
+
+
+async def test_get_or_create_by_name_invalidates(db):
+    created = await permission_cache.get_or_create_by_name("auditor")
+    assert (await permission_cache.get(created.id)).name == "auditor"
+    assert await permission_cache.get_many([created.id]) == [created]
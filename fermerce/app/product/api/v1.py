@@ -33,21 +33,34 @@ async def get_products_list(
     ),
     per_page: int = 10,
     page: int = 1,
+    cursor: t.Optional[str] = Query(
+        default=None,
+        description="cursor pagination, send an empty value for the first page "
+        "and the returned next_cursor afterwards",
+    ),
+    count: bool = Query(default=False, description="total_results over all pages"),
     sort_by: t.Optional[SortOrder] = Query(
         default=SortOrder.desc, description="order by attribute, e.g. id"
     ),
     order_by: t.Optional[str] = Query(
-        default="id", description="order by attribute, e.g. id"
+        default=None,
+        description="order by attribute, e.g. id; searches with a filter are "
+        "ranked by relevance unless this is set",
     ),
     is_suspended: t.Optional[bool] = False,
     in_stock: t.Optional[bool] = False,
     search_type: t.Optional[SearchType] = SearchType._and,
     load_related: t.Optional[bool] = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. vendor,categories"
+    ),
 ):
     return await services.filter(
         filter_string=filter_string,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         select=select,
         sort_by=sort_by,
         order_by=order_by,
@@ -55,12 +68,19 @@ async def get_products_list(
         in_stock=in_stock,
         search_type=search_type,
         load_related=load_related,
+        expand=expand,
     )
 
 
 @router.get("/{slug}", response_model=schemas.IProductOut)
-async def get_product(slug: str, load_related: bool = False):
-    return await services.get(slug=slug, load_related=load_related)
+async def get_product(
+    slug: str,
+    load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. vendor,categories"
+    ),
+):
+    return await services.get(slug=slug, load_related=load_related, expand=expand)
 
 
 @router.put("/{product_id}", response_model=schemas.IProductOut)
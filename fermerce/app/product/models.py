@@ -13,6 +13,17 @@ from fermerce.lib.utils.random_string import random_str
 class Product(models.Model):
     class Meta:
         table = "fm_product"
+        expandable = (
+            "vendor",
+            "cover_media",
+            "categories",
+            "galleries",
+            "details",
+            "measurement_units",
+            "measurement_units__unit",
+            "promo_codes",
+            "vendor__logo",
+        )
 
     id = fields.UUIDField(pk=True, default=uuid.uuid4)
     name = fields.CharField(max_length=50, null=False)
@@ -53,3 +64,17 @@ class Product(models.Model):
     def make_slug(name: str, random_length: int = 10) -> str:
         slug = f"{name.replace(' ', '-').replace('_', '-')[:30]}-{random_str(random_length).strip().lower()}"
         return slug
+
+
+class ProductSearchDocument(models.Model):
+    class Meta:
+        table = "fm_product_search"
+
+    id = fields.UUIDField(pk=True, default=uuid.uuid4)
+    product: fields.OneToOneRelation[Product] = fields.OneToOneField(
+        "models.Product", related_name="search_document", on_delete=fields.CASCADE
+    )
+    # name, sku, description, details, categories and vendor name in one string;
+    # postgres indexes it through a generated tsvector column and a trigram index
+    document = fields.TextField(default="")
+    modified_at = fields.DatetimeField(auto_now=True)
@@ -0,0 +1,207 @@
+import typing as t
+import uuid
+from tortoise import connections
+from tortoise.expressions import Q, Subquery
+from fermerce.app.product import models
+from fermerce.app.vendor.models import Vendor
+from fermerce.core.enum.sort_type import SearchType, SortOrder
+from fermerce.core.services.base import (
+    filter_and_list,
+    get_expansion_tree,
+    get_expansions,
+    get_relation_fields,
+)
+from fermerce.core.services.serializer import get_serializer
+from fermerce.lib.db.config import is_postgres
+
+
+SEARCH_TABLE = models.ProductSearchDocument._meta.db_table
+# "simple" keeps product names and skus as typed instead of stemming them as english
+SEARCH_CONFIG = "simple"
+
+SETUP_SQL = f"""
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+ALTER TABLE {SEARCH_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}', document)) STORED;
+CREATE INDEX IF NOT EXISTS idx_{SEARCH_TABLE}_vector
+    ON {SEARCH_TABLE} USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_{SEARCH_TABLE}_trgm
+    ON {SEARCH_TABLE} USING GIN (document gin_trgm_ops);
+"""
+
+# full-text matches rank first, the trigram term keeps typos and partial skus findable
+MATCH_SQL = f"""
+FROM {SEARCH_TABLE} AS d
+JOIN {models.Product._meta.db_table} AS p ON p.id = d.product_id
+JOIN {Vendor._meta.db_table} AS v ON v.id = p.vendor_id
+CROSS JOIN websearch_to_tsquery('{SEARCH_CONFIG}', $4) AS q
+WHERE (d.search_vector @@ q OR $1 <% d.document)
+    AND p.is_suspended = $2
+    AND (p.in_stock OR NOT $3)
+    AND NOT v.is_suspended
+"""
+RANKED_SQL = f"""
+SELECT d.product_id,
+    ts_rank(d.search_vector, q) + word_similarity($1, d.document) AS rank
+{MATCH_SQL}
+ORDER BY rank DESC, d.product_id
+LIMIT $5 OFFSET $6
+"""
+COUNT_SQL = f"SELECT COUNT(*) AS total {MATCH_SQL}"
+
+
+def build_document(product: models.Product) -> str:
+    parts = [
+        product.name,
+        product.slug,
+        product.sku,
+        product.description,
+        product.vendor.business_name,
+    ]
+    parts.extend(category.name for category in product.categories)
+    for detail in product.details:
+        parts.extend((detail.title, detail.description))
+    return " ".join(part for part in parts if part).lower()
+
+
+async def refresh_documents(product_ids: t.Iterable[uuid.UUID]) -> None:
+    product_ids = list(product_ids)
+    if not product_ids:
+        return
+    products = await models.Product.filter(id__in=product_ids).prefetch_related(
+        "vendor", "categories", "details"
+    )
+    existing = {
+        document.product_id: document
+        for document in await models.ProductSearchDocument.filter(
+            product_id__in=product_ids
+        )
+    }
+    to_create = []
+    to_update = []
+    for product in products:
+        document = build_document(product)
+        search_document = existing.get(product.id)
+        if search_document is None:
+            to_create.append(
+                models.ProductSearchDocument(product=product, document=document)
+            )
+        elif search_document.document != document:
+            search_document.document = document
+            to_update.append(search_document)
+    if to_create:
+        await models.ProductSearchDocument.bulk_create(to_create)
+    if to_update:
+        await models.ProductSearchDocument.bulk_update(to_update, fields=["document"])
+
+
+async def setup_search_index(batch_size: int = 500) -> None:
+    """Create the postgres search column and indexes, then index missing products."""
+    if is_postgres():
+        await connections.get("default").execute_script(SETUP_SQL)
+    while True:
+        missing = (
+            await models.Product.filter(search_document__id__isnull=True)
+            .limit(batch_size)
+            .values_list("id", flat=True)
+        )
+        if not missing:
+            break
+        await refresh_documents(missing)
+
+
+async def search(
+    filter_string: str,
+    per_page: int = 10,
+    page: int = 1,
+    cursor: t.Optional[str] = None,
+    count: bool = False,
+    select: str = "",
+    load_related: bool = False,
+    expand: str = "",
+    sort_by: SortOrder = SortOrder.asc,
+    order_by: t.Optional[str] = None,
+    is_suspended: bool = False,
+    in_stock: bool = False,
+    search_type: SearchType = SearchType._and,
+):
+    """Products matching ``filter_string``, ranked by relevance on postgres.
+
+    A ``search_type`` of or matches any word of ``filter_string``, and
+    matches the whole string. Asking for a cursor or an ``order_by`` lists the matches in that fixed
+    order through ``filter_and_list`` instead.
+    """
+    term = filter_string.strip().lower()
+    words = term.split() if search_type == SearchType._or else [term]
+    if cursor is not None or order_by or not is_postgres():
+        # subqueries rather than joins, tortoise drops joins from COUNT queries
+        matches = models.ProductSearchDocument.filter(
+            Q(*[Q(document__icontains=word) for word in words], join_type=Q.OR)
+        )
+        query = models.Product.filter(
+            id__in=Subquery(matches.values("product_id")),
+            vendor_id__in=Subquery(Vendor.filter(is_suspended=False).values("id")),
+            is_suspended=is_suspended,
+        )
+        if in_stock:
+            query = query.filter(in_stock=True)
+        return await filter_and_list(
+            model=models.Product,
+            query=query,
+            per_page=per_page,
+            page=page,
+            cursor=cursor,
+            count=count,
+            select=select,
+            load_related=load_related,
+            expand=expand,
+            sort_by=sort_by if order_by else SortOrder.asc,
+            order_by=order_by or "created_at,id",
+        )
+
+    page = max(page, 1)
+    connection = connections.get("default")
+    values = [term, is_suspended, in_stock, " or ".join(words)]
+    total = None
+    if count:
+        rows = await connection.execute_query_dict(COUNT_SQL, values)
+        total = rows[0]["total"]
+    rows = await connection.execute_query_dict(
+        RANKED_SQL, [*values, per_page + 1, (page - 1) * per_page]
+    )
+    has_more = len(rows) > per_page
+    product_ids = [row["product_id"] for row in rows[:per_page]]
+
+    query = models.Product.filter(id__in=product_ids)
+    serializer = get_serializer(models.Product)
+    if select:
+        to_pre_fetch = get_relation_fields(models.Product)
+        columns = [
+            col.strip()
+            for col in select.split(",")
+            if col.strip() in models.Product._meta.fields
+            and col.strip() not in to_pre_fetch
+        ]
+        if "id" not in columns:
+            columns.append("id")
+        items = serializer.from_values(columns, await query.values_list(*columns))
+    else:
+        expansions = get_expansions(models.Product, expand, load_related)
+        if expansions:
+            expansion_tree = get_expansion_tree(expansions)
+            query = query.prefetch_related(*expansions)
+            items = [
+                serializer.with_relations(product, expansion_tree)
+                for product in await query
+            ]
+        else:
+            items = [serializer.to_dict(product) for product in await query]
+    position = {product_id: index for index, product_id in enumerate(product_ids)}
+    items.sort(key=lambda item: position[item["id"]])
+    return {
+        "previous": page - 1 if page > 1 else None,
+        "next": page + 1 if has_more else None,
+        "next_cursor": None,
+        "total_results": len(items) if total is None else total,
+        "results": items,
+    }
@@ -11,7 +11,7 @@ from fermerce.core.enum.sort_type import SearchType, SortOrder
 from fermerce.core.schemas.response import ITotalCount, IResponseMessage
 from fermerce.core.services.base import filter_and_list, filter_and_single
 from fermerce.lib.errors import error
-from fermerce.app.product import models, schemas
+from fermerce.app.product import models, schemas, search
 from fermerce.app.category.models import ProductCategory
 from fermerce.app.medias.models import Media
 
@@ -41,8 +41,9 @@ async def create(vendor: Vendor, data_in: schemas.IProductIn) -> models.Product:
     if data_in.galleries:
         media_galleries_obj = await Media.filter(id__in=data_in.galleries).all()
         await new_product.galleries.add(*media_galleries_obj)
-        if new_product:
-            return new_product
+    await search.refresh_documents([new_product.id])
+    if new_product:
+        return new_product
     raise error.ServerError("Error while creating product")
 
 
@@ -78,14 +79,15 @@ async def update(
     updated_product = await models.Product.filter(id=product_id).update(**to_update)
 
     if updated_product:
+        await search.refresh_documents([product_id])
         return IResponseMessage(message="product updated successfully")
     raise error.ServerError("Error while creating product")
 
 
-async def get(slug: str, load_related: bool) -> schemas.IProductOut:
+async def get(slug: str, load_related: bool, expand: str = "") -> schemas.IProductOut:
     query = models.Product.filter(slug=slug)
     result = await filter_and_single(
-        query=query, load_related=load_related, model=models.Product
+        query=query, load_related=load_related, model=models.Product, expand=expand
     )
     if not result:
         raise error.NotFoundError("Product not found")
@@ -97,14 +99,33 @@ async def filter(
     filter_string: str,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     select: str = "",
     load_related: bool = False,
+    expand: str = "",
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
     is_suspended: bool = False,
     in_stock: bool = False,
     search_type: SearchType = SearchType._or,
 ) -> t.List[schemas.IProductListOut]:
+    if filter_string:
+        return await search.search(
+            filter_string=filter_string,
+            per_page=per_page,
+            page=page,
+            cursor=cursor,
+            count=count,
+            select=select,
+            load_related=load_related,
+            expand=expand,
+            sort_by=sort_by,
+            order_by=order_by,
+            is_suspended=is_suspended,
+            in_stock=in_stock,
+            search_type=search_type,
+        )
     query = None
     if search_type == SearchType._or:
         query = models.Product.filter(
@@ -114,36 +135,15 @@ async def filter(
         query = models.Product.filter(
             Q(in_stock=in_stock),
             Q(is_suspended=is_suspended),
-            Q(is_suspended=is_suspended),
-            Q(name__icontains=filter_string),
-            Q(slug__icontains=filter_string),
-            Q(details__description__icontains=filter_string),
-            Q(details__title__icontains=filter_string),
-            Q(sku__icontains=filter_string),
-            Q(categories__name__icontains=filter_string),
-        )
-    if filter_string:
-        query = query.filter(
-            Q(in_stock=in_stock)
-            | Q(is_suspended=is_suspended)
-            | Q(is_suspended=is_suspended)
-            | Q(name__icontains=filter_string)
-            | Q(slug__icontains=filter_string)
-            | Q(description__icontains=filter_string)
-            | Q(details__title__icontains=filter_string)
-            | Q(details__description__icontains=filter_string)
-            | Q(sku__icontains=filter_string)
-            | Q(categories__name__icontains=filter_string)
-        )
-        query = query.filter(
-            Q(vendor__business_name__icontains=filter_string),
-            Q(vendor__is_suspended=False),
         )
     result = await filter_and_list(
         model=models.Product,
         query=query,
         page=page,
+        cursor=cursor,
+        count=count,
         load_related=load_related,
+        expand=expand,
         per_page=per_page,
         select=select,
         sort_by=sort_by,
@@ -0,0 +1,64 @@
+import pytest
+from fermerce.app.product import models, search, services
+from fermerce.app.vendor.models import Vendor
+from fermerce.core.enum.sort_type import SearchType, SortOrder
+
+
+@pytest.fixture
+async def products(db):
+    vendor = await Vendor.create(business_name="farm", password="x", phone_number="1")
+    products = [
+        await models.Product.create(
+            name=f"{kind} {index}",
+            slug=f"{kind}-{index}",
+            description="fresh",
+            vendor=vendor,
+            sku=f"{kind[:3]}{index}",
+        )
+        for kind in ("tomato", "yam")
+        for index in range(5)
+    ]
+    await search.refresh_documents([product.id for product in products])
+    return products
+
+
+async def test_search_pages_with_a_cursor(products):
+    names, cursor = [], ""
+    while cursor is not None:
+        page = await services.filter(
+            "tomato",
+            per_page=2,
+            cursor=cursor,
+            sort_by=SortOrder.asc,
+            search_type=SearchType._and,
+        )
+        names.extend(row["name"] for row in page["results"])
+        cursor = page["next_cursor"]
+    assert sorted(names) == [f"tomato {index}" for index in range(5)]
+    assert len(set(names)) == 5
+
+
+async def test_search_follows_order_by(products):
+    page = await services.filter(
+        "yam",
+        per_page=10,
+        order_by="name",
+        sort_by=SortOrder.desc,
+        search_type=SearchType._and,
+    )
+    # same direction as the plain listing gives for these parameters
+    names = [row["name"] for row in page["results"]]
+    assert names == [f"yam {index}" for index in range(5)]
+
+
+@pytest.mark.parametrize("order_by", [None, "name"])
+async def test_search_type_or_matches_any_word(products, order_by):
+    page = await services.filter(
+        "yam 3", per_page=20, order_by=order_by, search_type=SearchType._or
+    )
+    names = sorted(row["name"] for row in page["results"])
+    assert names == ["tomato 3", *[f"yam {index}" for index in range(5)]]
+    page = await services.filter(
+        "yam 3", per_page=20, order_by=order_by, search_type=SearchType._and
+    )
+    assert [row["name"] for row in page["results"]] == ["yam 3"]
@@ -4,6 +4,7 @@ from fastapi import status, Response
 from tortoise.expressions import Q
 from fermerce.app.vendor.models import Vendor
 from fermerce.app.product.models import Product
+from fermerce.app.product import search
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import IResponseMessage
 from fermerce.core.services.base import filter_and_list, filter_and_single
@@ -21,6 +22,7 @@ async def create_details(data_in: schemas.IProductDetailsIn, vendor: Vendor):
     ]
     created_details = await models.ProductDetail.bulk_create(to_create)
     if created_details:
+        await search.refresh_documents([get_product.id])
         return IResponseMessage(message="Product details was created successfully")
     raise error.ServerError("error creating product details")
 
@@ -43,8 +45,11 @@ async def filter(
     filter_string: str,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     select: str = "",
     load_related: bool = False,
+    expand: str = "",
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
 ) -> t.List[models.ProductDetail]:
@@ -60,7 +65,10 @@ async def filter(
         model=models.ProductDetail,
         query=query,
         page=page,
+        cursor=cursor,
+        count=count,
         load_related=load_related,
+        expand=expand,
         per_page=per_page,
         select=select,
         sort_by=sort_by,
@@ -85,6 +93,7 @@ async def update_product_detail(
         data_in.dict(exclude={"product_id", "detail_id"})
     )
     await get_product_detail.save()
+    await search.refresh_documents([get_product.id])
     return get_product_detail
 
 
@@ -99,5 +108,6 @@ async def delete_product_detail(
         id__in=data_in.detail_ids, product=get_product
     ).delete()
     if get_product_detail:
+        await search.refresh_documents([get_product.id])
         return Response(status_code=status.HTTP_204_NO_CONTENT)
     raise error.NotFoundError("product or product details is not found")
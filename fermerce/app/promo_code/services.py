@@ -42,6 +42,8 @@ async def filter(
     filter_string: str,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     select: str = None,
     order_by: str = None,
     sort_by: SortOrder = SortOrder.asc,
@@ -55,6 +57,8 @@ async def filter(
         query=query,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         select=select,
         sort_by=sort_by,
         order_by=order_by,
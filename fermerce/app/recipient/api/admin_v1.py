@@ -29,6 +29,12 @@ async def get_vendor_bank_detail_list(
     ),
     per_page: int = 10,
     page: int = 1,
+    cursor: t.Optional[str] = Query(
+        default=None,
+        description="cursor pagination, send an empty value for the first page "
+        "and the returned next_cursor afterwards",
+    ),
+    count: bool = Query(default=False, description="total_results over all pages"),
     sort_by: t.Optional[SortOrder] = Query(
         default=SortOrder.desc, description="order by attribute, e.g. id"
     ),
@@ -36,15 +42,21 @@ async def get_vendor_bank_detail_list(
         default="id", description="order by attribute, e.g. id"
     ),
     load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. vendor"
+    ),
 ):
     return await services.list_bank_details_list(
         filter_string=filter_string,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         select=select,
         order_by=order_by,
         sort_by=sort_by,
         load_related=load_related,
+        expand=expand,
         is_verified=is_verified,
     )
 
@@ -110,10 +110,13 @@ async def list_bank_details_list(
     filter_string: str,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     select: str = "",
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
     load_related: bool = False,
+    expand: str = "",
     vendor: Vendor = None,
     is_verified: bool = False,
 ) -> t.List[models.BankDetail]:
@@ -140,10 +143,13 @@ async def list_bank_details_list(
         query=query,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         select=select,
         order_by=order_by,
         sort_by=sort_by,
         load_related=load_related,
+        expand=expand,
     )
 
 
@@ -1,7 +1,7 @@
 import uuid
 import typing as t
 from tortoise.expressions import Q
-from fermerce.app.status.models import Status
+from fermerce.app.status import services as status_services
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import IResponseMessage
 from fermerce.core.services.base import filter_and_list, filter_and_single
@@ -29,7 +29,7 @@ async def refund_charges(
                 payment=get_payment
             )
             if new_refund:
-                get_status = await Status.get_or_create(name="refunded")
+                get_status = await status_services.get_or_create_by_name("refunded")
                 get_payment.update_from_dict({"status": get_status})
                 await get_payment.save()
                 return IResponseMessage(
@@ -43,6 +43,7 @@ async def refund_charges(
 async def get_refund(
     refund_id: uuid.UUID,
     load_related: bool = False,
+    expand: str = "",
 ) -> models.Refund:
     query = models.Refund
     query = query.filter(id=refund_id)
@@ -50,6 +51,7 @@ async def get_refund(
         model=models.Refund,
         query=query,
         load_related=load_related,
+        expand=expand,
         order_by="id",
     )
     if not result:
@@ -61,10 +63,13 @@ async def list_refund(
     filter_string: str,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     select: str = "",
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
     load_related: bool = False,
+    expand: str = "",
     user_id: uuid.UUID = None,
 ) -> t.List[models.Refund]:
     query = models.Refund
@@ -83,8 +88,11 @@ async def list_refund(
         query=query,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         select=select,
         order_by=order_by,
         sort_by=sort_by,
         load_related=load_related,
+        expand=expand,
     )
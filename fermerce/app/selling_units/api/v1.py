@@ -27,6 +27,12 @@ async def get_product_detail_list(
     ),
     per_page: int = 10,
     page: int = 1,
+    cursor: t.Optional[str] = Query(
+        default=None,
+        description="cursor pagination, send an empty value for the first page "
+        "and the returned next_cursor afterwards",
+    ),
+    count: bool = Query(default=False, description="total_results over all pages"),
     sort_by: t.Optional[SortOrder] = Query(
         default=SortOrder.desc, description="order by attribute, e.g. id"
     ),
@@ -34,15 +40,21 @@ async def get_product_detail_list(
         default="id", description="order by attribute, e.g. id"
     ),
     load_related: t.Optional[bool] = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. product,unit"
+    ),
 ):
     return await services.filter(
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         product_id=product_id,
         select=select,
         sort_by=sort_by,
         order_by=order_by,
         load_related=load_related,
+        expand=expand,
     )
 
 
@@ -3,7 +3,7 @@ import typing as t
 from fastapi import status
 from tortoise.expressions import Q
 from fermerce.app.vendor.models import Vendor
-from fermerce.app.measuring_unit.models import MeasuringUnit
+from fermerce.app.measuring_unit.services import measuring_unit_cache
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import IResponseMessage
 from fermerce.core.services.base import filter_and_list, filter_and_single
@@ -19,7 +19,7 @@ async def create(
     get_product = await Product.get_or_none(pk=data_in.product_id, vendor=vendor)
     if not get_product:
         raise error.NotFoundError("Product not found")
-    get_measuring_unit = await MeasuringUnit.get_or_none(id=data_in.selling_unit_id)
+    get_measuring_unit = await measuring_unit_cache.get(data_in.selling_unit_id)
     check_existing_unit = await models.ProductSellingUnit.get_or_none(
         unit=get_measuring_unit, product=get_product
     )
@@ -49,8 +49,11 @@ async def filter(
     product_id: uuid.UUID,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     select: str = "",
     load_related: bool = False,
+    expand: str = "",
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
 ) -> t.List[models.ProductSellingUnit]:
@@ -61,7 +64,10 @@ async def filter(
         model=models.ProductSellingUnit,
         query=query,
         page=page,
+        cursor=cursor,
+        count=count,
         load_related=load_related,
+        expand=expand,
         per_page=per_page,
         select=select,
         sort_by=sort_by,
@@ -1,43 +1,85 @@
+import dataclasses
+import typing as t
+import uuid
 from fastapi import Depends
+from fermerce.core.settings import config
 from fermerce.lib.shared.dependency import AppAuth, AppWrite
+from fermerce.lib.utils.ttl_cache import TTLCache
 from fermerce.app.staff.models import Staff
 from fermerce.lib.errors import error
 from fermerce.app.user.dependency import require_user
 
 
-async def require_admin(get_user: dict = Depends(AppAuth.authenticate)):
-    staff = await Staff.get_or_none(user=get_user.get("user_id", None))
-    if staff:
-        perm = await staff.permissions.filter(name="admin")
-        if perm:
-            return staff
-    raise error.UnauthorizedError()
-
-
-async def require_dispatcher(get_user: dict = Depends(AppAuth.authenticate)):
-    staff = await Staff.get_or_none(user=get_user.get("user_id", None))
-    if staff:
-        perm = await staff.permissions.filter(name="dispatcher")
-        if perm:
-            return staff
-    raise error.UnauthorizedError()
-
-
-async def require_super_admin(get_user: dict = Depends(AppAuth.authenticate)):
-    staff = await Staff.get_or_none(user=get_user.get("user_id", None))
-    if staff:
-        perm = await staff.permissions.filter(name="super_admin")
-        if perm:
-            return staff
-    raise error.UnauthorizedError()
-
-
-async def require_super_admin_or_admin(
-    get_user: dict = Depends(AppAuth.authenticate),
-):
-    staff = await Staff.get_or_none(user=get_user.get("user_id", None))
-    if staff:
-        perm = await staff.permissions.filter(name__in=["super_admin", "admin"])
-        if perm:
-            return staff
-    raise error.UnauthorizedError()
+@dataclasses.dataclass(frozen=True)
+class StaffAccess:
+    """A staff member that passed ``require_permissions``."""
+
+    user_id: str
+    permissions: t.FrozenSet[str]
+    # None when authorized from the token's permissions claim alone
+    staff: t.Optional[Staff] = None
+
+
+# user id -> (staff, permission names), cleared when a staff's permissions change
+staff_access_cache = TTLCache(maxsize=10000, ttl=config.principal_cache_ttl)
+
+
+def invalidate_staff_access(user_id: t.Union[uuid.UUID, str]) -> None:
+    staff_access_cache.delete(str(user_id))
+
+
+def clear_staff_access() -> None:
+    staff_access_cache.clear()
+
+
+async def get_staff_access(
+    user_id: t.Union[uuid.UUID, str]
+) -> t.Tuple[t.Optional[Staff], t.FrozenSet[str]]:
+    access = staff_access_cache.get(str(user_id))
+    if access is not None:
+        return access
+    # one LEFT JOIN over the staff row and its permissions, a row per permission
+    columns = tuple(Staff._meta.db_fields)
+    rows = await Staff.filter(user_id=user_id).values_list(
+        *columns, "permissions__name"
+    )
+    if not rows:
+        access = (None, frozenset())
+    else:
+        staff = Staff._init_from_db(**dict(zip(columns, rows[0])))
+        access = (staff, frozenset(row[-1] for row in rows if row[-1]))
+    staff_access_cache.set(str(user_id), access)
+    return access
+
+
+def require_permissions(*names: str, load_staff: bool = False):
+    """Allow staff holding any of ``names``.
+
+    Tokens issued with a ``permissions`` claim are authorized from the claim
+    alone; ``load_staff`` looks the Staff row up anyway, for handlers that need
+    ``StaffAccess.staff``.
+    """
+    allowed = frozenset(names)
+
+    async def dependency(
+        get_user: dict = Depends(AppAuth.authenticate),
+    ) -> StaffAccess:
+        user_id = get_user.get("user_id", None)
+        claimed = get_user.get("permissions", None)
+        if claimed is not None and not load_staff:
+            staff, permissions = None, frozenset(claimed)
+        else:
+            staff, permissions = await get_staff_access(user_id)
+            if not staff:
+                raise error.UnauthorizedError()
+        if not allowed.intersection(permissions):
+            raise error.UnauthorizedError()
+        return StaffAccess(user_id=str(user_id), permissions=permissions, staff=staff)
+
+    return dependency
+
+
+require_admin = require_permissions("admin")
+require_dispatcher = require_permissions("dispatcher")
+require_super_admin = require_permissions("super_admin")
+require_super_admin_or_admin = require_permissions("super_admin", "admin")
@@ -26,3 +26,4 @@ class Staff(models.Model):
 
     class Meta:
         table = "fm_staff"
+        expandable = ("user", "permissions")
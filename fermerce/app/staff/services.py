@@ -6,7 +6,10 @@ from tortoise.expressions import Q
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import ITotalCount, IResponseMessage
 from fermerce.app.user.models import User
+from fermerce.app.user.dependency import invalidate_principal
+from fermerce.app.staff.dependency import invalidate_staff_access
 from fermerce.app.permission.models import Permission
+from fermerce.app.permission.services import permission_cache
 from fermerce.core.enum.sort_type import SearchType
 from fermerce.core.services.base import filter_and_list, filter_and_single
 from fermerce.lib.errors import error
@@ -25,6 +28,7 @@ async def create(
         raise error.DuplicateError("Staff already exist")
     new_Staff = await models.Staff.create(user=check_user)
     if new_Staff:
+        invalidate_staff_access(check_user.id)
         return IResponseMessage(
             message="Staff account was created successfully"
         )
@@ -35,8 +39,11 @@ async def filter(
     filter_string: str,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     select: str = "",
     load_related: bool = False,
+    expand: str = "",
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
     is_active: bool = False,
@@ -70,7 +77,10 @@ async def filter(
         model=models.Staff,
         query=query,
         page=page,
+        cursor=cursor,
+        count=count,
         load_related=load_related,
+        expand=expand,
         per_page=per_page,
         select=select,
         sort_by=sort_by,
@@ -87,6 +97,8 @@ async def remove_staff_data(data_in: schemas.IRemoveStaff) -> None:
             await staff_to_remove.update_from_dict(
                 dict(is_active=False, archived=True)
             )
+        invalidate_principal(staff_to_remove.user_id)
+        invalidate_staff_access(staff_to_remove.user_id)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
     raise error.NotFoundError(
         f"Staff with staff_id {data_in.staff_id} does not exist"
@@ -129,7 +141,7 @@ async def add_staff_permission(
     get_staff = await models.Staff.get_or_none(id=data_in.staff_id)
     if not get_staff:
         raise error.NotFoundError("Staff not found")
-    get_perms = await Permission.filter(id__in=data_in.permissions).all()
+    get_perms = await permission_cache.get_many(data_in.permissions)
     existed_perm = []
     if not get_perms:
         raise error.NotFoundError("permissions not found")
@@ -142,6 +154,8 @@ async def add_staff_permission(
             f"Permission `{','.join(existed_perm)}` already exists"
         )
     await get_staff.permissions.add(*get_perms)
+    invalidate_principal(get_staff.user_id)
+    invalidate_staff_access(get_staff.user_id)
     return IResponseMessage(message="Staff permission was updated successfully")
 
 
@@ -163,8 +177,10 @@ async def remove_staff_permissions(
 
     if not get_staff:
         raise error.NotFoundError("Staff not found")
-    check_perms = await Permission.filter(id__in=data_in.permissions)
+    check_perms = await permission_cache.get_many(data_in.permissions)
     if not check_perms:
         raise error.NotFoundError(detail=" Permissions not found")
     await get_staff.permissions.remove(*check_perms)
+    invalidate_principal(get_staff.user_id)
+    invalidate_staff_access(get_staff.user_id)
     return IResponseMessage(message="Staff role was updated successfully")
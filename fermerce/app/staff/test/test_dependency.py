@@ -0,0 +1,86 @@
+import uuid
+import pytest
+from fermerce.app.permission.models import Permission
+from fermerce.app.permission.services import permission_cache
+from fermerce.app.staff import dependency, schemas, services
+from fermerce.app.staff.models import Staff
+from fermerce.app.user.models import User
+from fermerce.lib.errors import error
+
+require_admin = dependency.require_permissions("admin")
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    dependency.clear_staff_access()
+    permission_cache.invalidate()
+
+
+@pytest.fixture
+async def staff(db):
+    name = uuid.uuid4().hex[:16]
+    user = await User.create(
+        id=uuid.uuid4(), username=name, email=f"{name}@test", lastname=name
+    )
+    staff = await Staff.create(user=user)
+    await Permission.create(name="admin")
+    await Permission.create(name="dispatcher")
+    return staff
+
+
+async def update_permissions(staff: Staff, name: str, add: bool) -> None:
+    permission = await Permission.get(name=name)
+    data_in = schemas.IStaffRoleUpdate(
+        staff_id=str(staff.id), permissions=[permission.id]
+    )
+    if add:
+        await services.add_staff_permission(data_in)
+    else:
+        await services.remove_staff_permissions(data_in)
+
+
+async def test_claim_is_enough_without_a_database():
+    user_id = uuid.uuid4()
+    access = await require_admin({"user_id": str(user_id), "permissions": ["admin"]})
+    assert access == dependency.StaffAccess(
+        user_id=str(user_id), permissions=frozenset(["admin"])
+    )
+    with pytest.raises(error.UnauthorizedError):
+        await require_admin({"user_id": str(user_id), "permissions": ["dispatcher"]})
+
+
+async def test_staff_row_is_loaded_without_a_claim(staff):
+    await update_permissions(staff, "admin", add=True)
+    access = await require_admin({"user_id": str(staff.user_id)})
+    assert isinstance(access, dependency.StaffAccess)
+    assert access.staff.id == staff.id
+    assert access.permissions == frozenset(["admin"])
+
+
+async def test_load_staff_ignores_the_claim(staff):
+    require = dependency.require_permissions("admin", load_staff=True)
+    claims = {"user_id": str(staff.user_id), "permissions": ["admin"]}
+    # the claim says admin, but the database does not
+    with pytest.raises(error.UnauthorizedError):
+        await require(claims)
+    await update_permissions(staff, "admin", add=True)
+    assert (await require(claims)).staff.id == staff.id
+
+
+async def test_users_without_a_staff_row_are_refused(db):
+    with pytest.raises(error.UnauthorizedError):
+        await require_admin({"user_id": str(uuid.uuid4())})
+
+
+async def test_permission_changes_invalidate_the_cache(staff):
+    claims = {"user_id": str(staff.user_id)}
+    with pytest.raises(error.UnauthorizedError):
+        await require_admin(claims)
+    await update_permissions(staff, "admin", add=True)
+    assert await require_admin(claims)
+    await update_permissions(staff, "dispatcher", add=True)
+    access = await require_admin(claims)
+    assert access.permissions == frozenset(["admin", "dispatcher"])
+    await update_permissions(staff, "admin", add=False)
+    with pytest.raises(error.UnauthorizedError):
+        await require_admin(claims)
@@ -5,11 +5,15 @@ from tortoise.expressions import Q
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import ITotalCount
 from fermerce.core.services.base import filter_and_list
+from fermerce.core.services.reference import ReferenceCache
 from fermerce.lib.errors import error
 from fermerce.app.state import schemas, models
 from fastapi import Response
 
 
+state_cache = ReferenceCache(models.State)
+
+
 # create permission
 async def create(
     data_in: schemas.IStateIn,
@@ -20,13 +24,14 @@ async def create(
     new_type = await models.State.create(**data_in.dict())
     if not new_type:
         raise error.ServerError("Internal server error")
+    state_cache.invalidate()
     return new_type
 
 
 async def get(
     state_id: uuid.UUID,
 ) -> models.State:
-    perm = await models.State.get_or_none(id=state_id)
+    perm = await state_cache.get(state_id)
     if not perm:
         raise error.NotFoundError("state not found")
     return perm
@@ -37,6 +42,8 @@ async def filter(
     filter_string: str = None,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     select: str = "",
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
@@ -51,6 +58,8 @@ async def filter(
         sort_by=sort_by,
         order_by=order_by,
         page=page,
+        cursor=cursor,
+        count=count,
         per_page=per_page,
     )
     return results
@@ -76,6 +85,7 @@ async def update(
         return check_state
     check_state.update_from_dict(data_in.dict())
     await check_state.save()
+    state_cache.invalidate()
 
     return check_state
 
@@ -87,4 +97,5 @@ async def delete(
     deleted_state = await models.State.filter(id=state_id).delete()
     if not deleted_state:
         raise error.NotFoundError("state does not exist")
+    state_cache.invalidate()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -5,11 +5,15 @@ from tortoise.expressions import Q
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import ITotalCount
 from fermerce.core.services.base import filter_and_list
+from fermerce.core.services.reference import ReferenceCache
 from fermerce.lib.errors import error
 from fermerce.app.status import schemas, models
 from fastapi import Response
 
 
+status_cache = ReferenceCache(models.Status)
+
+
 # create permission
 async def create(
     data_in: schemas.IStatusIn,
@@ -20,13 +24,18 @@ async def create(
     new_type = await models.Status.create(**data_in.dict())
     if not new_type:
         raise error.ServerError("Internal server error")
+    status_cache.invalidate()
     return new_type
 
 
+async def get_or_create_by_name(name: str) -> models.Status:
+    return await status_cache.get_or_create_by_name(name)
+
+
 async def get(
     status_id: uuid.UUID,
 ) -> models.Status:
-    perm = await models.Status.get_or_none(id=status_id)
+    perm = await status_cache.get(status_id)
     if not perm:
         raise error.NotFoundError("status not found")
     return perm
@@ -37,6 +46,8 @@ async def filter(
     filter_string: str,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     select: str = "",
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
@@ -47,6 +58,8 @@ async def filter(
         query=query,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         order_by=order_by,
         select=select,
         sort_by=sort_by,
@@ -74,6 +87,7 @@ async def update(
         return check_status
     check_status.update_from_dict(data_in.dict())
     await check_status.save()
+    status_cache.invalidate()
     return check_status
 
 
@@ -84,4 +98,5 @@ async def delete(
     deleted_status = await models.Status.filter(id=status_id).delete()
     if not deleted_status:
         raise error.NotFoundError("status does not exist")
+    status_cache.invalidate()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -43,6 +43,12 @@ async def get_trackings(
     order_item_id: str,
     per_page: int = 10,
     page: int = 1,
+    cursor: t.Optional[str] = Query(
+        default=None,
+        description="cursor pagination, send an empty value for the first page "
+        "and the returned next_cursor afterwards",
+    ),
+    count: bool = Query(default=False, description="total_results over all pages"),
     select: t.Optional[str] = Query(
         default="", description="select order direct attributes, e.g. id"
     ),
@@ -50,13 +56,19 @@ async def get_trackings(
         default="", alias="filter", description="filter all shipping_address"
     ),
     load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. order_item"
+    ),
 ):
     return await services.filter(
         order_item_id=order_item_id,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         select=select,
         load_related=load_related,
+        expand=expand,
         filter_string=filter_string,
     )
 
@@ -70,8 +70,11 @@ async def filter(
     order_item_id: str,
     per_page: int = 10,
     page: int = 1,
+    cursor: str = None,
+    count: bool = False,
     select: str = "",
     load_related: bool = False,
+    expand: str = "",
     filter_string: str = None,
 ) -> t.List[models.Tracking]:
     query = models.Tracking.filter(order_item__tracking_id=order_item_id)
@@ -85,8 +88,11 @@ async def filter(
         query=query,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         select=select,
         load_related=load_related,
+        expand=expand,
     )
     return results
 
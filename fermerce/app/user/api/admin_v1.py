@@ -24,6 +24,12 @@ async def get_users_list(
     ),
     per_page: int = 10,
     page: int = 1,
+    cursor: t.Optional[str] = Query(
+        default=None,
+        description="cursor pagination, send an empty value for the first page "
+        "and the returned next_cursor afterwards",
+    ),
+    count: bool = Query(default=False, description="total_results over all pages"),
     sort_by: t.Optional[SortOrder] = Query(
         default=SortOrder.desc, description="order by attribute, e.g. id"
     ),
@@ -35,11 +41,16 @@ async def get_users_list(
     is_archived: t.Optional[bool] = False,
     search_type: t.Optional[SearchType] = SearchType._and,
     load_related: t.Optional[bool] = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. staff,shipping_address"
+    ),
 ):
     return await services.filter(
         filter_string=filter_string,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         select=select,
         sort_by=sort_by,
         order_by=order_by,
@@ -48,6 +59,7 @@ async def get_users_list(
         is_archived=is_archived,
         search_type=search_type,
         load_related=load_related,
+        expand=expand,
     )
 
 
@@ -78,5 +90,8 @@ async def delete_user(data_in: schemas.IUserRemove) -> None:
 async def get_user(
     users_id: uuid.UUID,
     load_related: bool = True,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. staff,shipping_address"
+    ),
 ) -> t.Union[schemas.IUserOutFull, schemas.IUserOut]:
-    return await services.get_user(users_id, load_related)
+    return await services.get_user(users_id, load_related, expand)
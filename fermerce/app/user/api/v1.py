@@ -1,5 +1,5 @@
 import typing as t
-from fastapi import APIRouter, BackgroundTasks, Depends, Request, status
+from fastapi import APIRouter, Depends, Query, Request, status
 from fastapi.security.oauth2 import OAuth2PasswordRequestForm
 from fermerce.app.user import dependency, schemas, services
 from fermerce.core.schemas.response import IResponseMessage
@@ -29,11 +29,14 @@ async def create_user(data_in: schemas.IUserIn):
 async def get_users_current_data(
     user: dict = Depends(dependency.AppAuth.authenticate),
     load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. staff,shipping_address"
+    ),
 ) -> t.Union[schemas.IUserOutFull, schemas.IUserOut]:
     if not user.get("user_id", None):
         raise error.UnauthorizedError()
     return await services.get_user(
-        user.get("user_id", None), load_related=load_related
+        user.get("user_id", None), load_related=load_related, expand=expand
     )
 
 
@@ -58,10 +61,9 @@ async def update_user_details(
 )
 async def login(
     request: Request,
-    task: BackgroundTasks,
     data_in: OAuth2PasswordRequestForm = Depends(),
 ) -> t.Union[auth_schemas.IToken, IResponseMessage]:
-    result = await services.login(data_in=data_in, request=request, task=task)
+    result = await services.login(data_in=data_in, request=request)
     return result
 
 
@@ -73,12 +75,10 @@ async def login(
 async def login_token_refresh(
     data_in: auth_schemas.IRefreshToken,
     request: Request,
-    task: BackgroundTasks,
 ):
-    return await services.login_token_refresh(
+    return await services.refresh_login_token(
         data_in=data_in,
         request=request,
-        task=task,
     )
 
 
@@ -99,7 +99,7 @@ async def update_users_password(
 @auth.put("/password/no_token", status_code=status.HTTP_200_OK)
 async def update_user_password_no_token(
     data_in: schemas.IUserResetPasswordNoToken,
-    user_data: User = Depends(dependency.require_user),
+    user_data: User = Depends(dependency.require_user_full),
 ) -> IResponseMessage:
     return await services.update_users_password_no_token(data_in, user_data)
 
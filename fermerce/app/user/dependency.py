@@ -1,13 +1,35 @@
+import typing as t
+import uuid
 from fastapi import Depends
 
 from fermerce.lib.shared.dependency import AppAuth, AppWrite
+from fermerce.app.permission.models import Permission
 from fermerce.app.user.models import User
 
 
-__users_write = AppWrite(model=User)
+async def get_user_roles(user_id: uuid.UUID) -> t.List[str]:
+    return await Permission.filter(staffs__user_id=user_id).values_list(
+        "name", flat=True
+    )
+
+
+__users_write = AppWrite(model=User, roles_loader=get_user_roles)
+
+
+def invalidate_principal(user_id: t.Union[uuid.UUID, str]) -> None:
+    __users_write.invalidate(user_id)
+
+
+def clear_principals() -> None:
+    # a renamed or deleted permission changes the roles of every staff holding it
+    __users_write.principals.clear()
 
 
 async def require_user(get_user: dict = Depends(AppAuth.authenticate)):
     return await __users_write.get_user_data(
         user_id=get_user.get("user_id", None)
     )
+
+
+async def require_user_full(get_user: dict = Depends(AppAuth.authenticate)):
+    return await __users_write.current_user(user_id=get_user.get("user_id", None))
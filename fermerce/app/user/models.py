@@ -34,13 +34,20 @@ class User(models.Model):
     class Meta:
         table = "fm_user"
         ordering = ("-created_at", "-id")
+        expandable = ("staff", "shipping_address", "staff__permissions")
 
     @staticmethod
-    def generate_hash(password: str) -> str:
-        return Hasher.hash_password(password)
+    async def generate_hash(password: str) -> str:
+        return await Hasher.hash_password_async(password)
 
-    def check_password(self, plain_password: str) -> bool:
-        check_pass = Hasher.check_password(plain_password, self.password)
+    async def check_password(self, plain_password: str) -> bool:
+        check_pass, new_hash = await Hasher.verify_and_update(
+            plain_password, self.password
+        )
+        if check_pass and new_hash:
+            # stored with outdated parameters; upgrade while the plaintext is known
+            self.password = new_hash
+            await self.__class__.filter(id=self.id).update(password=new_hash)
         if check_pass:
             return True
         return False
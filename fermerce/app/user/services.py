@@ -1,29 +1,66 @@
 from datetime import timedelta
 import typing as t
 import uuid
-from fastapi import BackgroundTasks, Request, status
+from fastapi import Request, status
 from fastapi import Response
+from tortoise import connections
 from tortoise.expressions import Q
+from tortoise.functions import Lower
 from fastapi.security.oauth2 import OAuth2PasswordRequestForm
 from fermerce.core.enum.sort_type import SortOrder, SearchType
 from fermerce.core.schemas.response import ITotalCount, IResponseMessage
 from fermerce.core.services.base import filter_and_list, filter_and_single
 from fermerce.taskiq.user import tasks
+from fermerce.lib.db.config import is_postgres
 from fermerce.lib.errors import error
 from fermerce.app.user import schemas, models
+from fermerce.app.user.dependency import invalidate_principal
 from fermerce.lib.utils import security
 from fermerce.app.auth import services as auth_services, schemas as auth_schemas
 
 
+# built concurrently so adding them never locks fm_user; each statement runs
+# on its own since CONCURRENTLY is not allowed inside a transaction
+LOGIN_INDEX_SQL = [
+    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS fm_user_{column}_lower_idx "
+    f"ON {models.User._meta.db_table} (LOWER({column}))"
+    for column in ("username", "email")
+]
+
+
+async def setup_login_indexes() -> None:
+    if is_postgres():
+        connection = connections.get("default")
+        for statement in LOGIN_INDEX_SQL:
+            await connection.execute_script(statement)
+
+
+def filter_by_login(*identifiers: str):
+    """Users whose username or email equals one of ``identifiers``, ignoring case.
+
+    Compares LOWER(column) so the lookup uses the functional login indexes.
+    """
+    values = [identifier.strip().lower() for identifier in identifiers]
+    return models.User.annotate(
+        username_lower=Lower("username"), email_lower=Lower("email")
+    ).filter(Q(username_lower__in=values) | Q(email_lower__in=values))
+
+
+async def get_by_login(identifier: str) -> t.Optional[models.User]:
+    users = await filter_by_login(identifier).limit(2)
+    if len(users) > 1:
+        # accounts created before lookups ignored case; only an exact match counts
+        users = [user for user in users if identifier in (user.username, user.email)]
+    return users[0] if len(users) == 1 else None
+
+
 async def create(data_in=schemas.IUserIn):
-    check_user = await models.User.get_or_none(
-        Q(email=data_in.email) | Q(username=data_in.username)
-    )
+    check_user = await filter_by_login(data_in.email, data_in.username).exists()
     if check_user:
         raise error.DuplicateError("Account already exist")
     new_user = await models.User.create(
         **data_in.dict(exclude={"password"}),
-        password=models.User.generate_hash(data_in.password.get_secret_value()),
+        password=await models.User.generate_hash(data_in.password.get_secret_value()),
     )
     full_name = None
     if new_user.firstname and new_user.lastname:
@@ -60,6 +97,7 @@ async def update_user_details(data_in=schemas.IUserUpdateIn):
         data_in.dict(exclude={"id"}, exclude_unset=True),
     )
     await users_update.save()
+    invalidate_principal(check_user.id)
 
     if not users_update:
         raise error.ServerError("Could not updating  details, please try again")
@@ -69,14 +107,11 @@ async def update_user_details(data_in=schemas.IUserUpdateIn):
 async def login(
     request: Request,
     data_in: OAuth2PasswordRequestForm,
-    task: BackgroundTasks,
 ) -> t.Union[auth_schemas.IToken, IResponseMessage]:
-    check_user = await models.User.get_or_none(
-        Q(username__icontains=data_in.username) | Q(email=data_in.username)
-    )
+    check_user = await get_by_login(data_in.username)
     if not check_user:
         raise error.UnauthorizedError(detail="incorrect email, username or password")
-    if not check_user.check_password(data_in.password):
+    if not await check_user.check_password(data_in.password):
         raise error.UnauthorizedError(detail="incorrect email or password")
     if check_user.is_archived:
         raise error.UnauthorizedError()
@@ -95,18 +130,16 @@ async def login(
         return IResponseMessage(
             message="Your is not verified, Please check your for verification link before continuing"
         )
-    token = await auth_services.login(request=request, task=task, user_id=check_user.id)
+    token = await auth_services.login(request=request, user_id=check_user.id)
     if not token:
         raise error.ServerError("Count not authenticate user")
     return token
 
 
 async def refresh_login_token(
-    data_in: auth_schemas.IRefreshToken, request: Request, task: BackgroundTasks
+    data_in: auth_schemas.IRefreshToken, request: Request
 ) -> auth_schemas.IToken:
-    token = await auth_services.login_token_refresh(
-        request=request, task=task, data_in=data_in
-    )
+    token = await auth_services.login_token_refresh(request=request, data_in=data_in)
     if not token:
         raise error.ServerError("Count not authenticate user")
     return token
@@ -117,8 +150,11 @@ async def filter(
     filter_string: str,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     select: str = "",
     load_related: bool = False,
+    expand: str = "",
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
     is_active: bool = False,
@@ -151,7 +187,10 @@ async def filter(
         model=models.User,
         query=query,
         page=page,
+        cursor=cursor,
+        count=count,
         load_related=load_related,
+        expand=expand,
         per_page=per_page,
         select=select,
         sort_by=sort_by,
@@ -174,9 +213,11 @@ async def verify_users_email(
         raise error.BadDataError(
             detail="Account has been already verified",
         )
-    users_obj = await models.User.filter(id=users_obj.id).update(
+    user_id = users_obj.id
+    users_obj = await models.User.filter(id=user_id).update(
         is_active=True, is_verified=True, is_suspended=False
     )
+    invalidate_principal(user_id)
     if users_obj:
         return IResponseMessage(message="Account was verified successfully")
     raise error.ServerError("Could not activate account, please try again")
@@ -230,7 +271,7 @@ async def update_user_password(
             raise error.NotFoundError("User not found")
         if users_obj.reset_token != data_in.token:
             raise error.UnauthorizedError()
-        if users_obj.check_password(data_in.password.get_secret_value()):
+        if await users_obj.check_password(data_in.password.get_secret_value()):
             raise error.BadDataError("Try another password you have not used before")
         token = security.JWTAUTH.data_encoder(
             data={"user_id": str(users_obj.id)}, duration=timedelta(days=1)
@@ -238,8 +279,11 @@ async def update_user_password(
         if token:
             await models.User.filter(id=users_obj.id).update(
                 reset_token=None,
-                password=models.User.generate_hash(data_in.password.get_secret_value()),
+                password=await models.User.generate_hash(
+                    data_in.password.get_secret_value()
+                ),
             )
+            await auth_services.revoke_sessions(users_obj.id)
             await tasks.send_verify_users_password_reset.kiq(
                 dict(
                     email=users_obj.email,
@@ -260,13 +304,17 @@ async def update_users_password_no_token(
 ) -> IResponseMessage:
     if not user_obj:
         raise error.NotFoundError("User not found")
-    if not user_obj.check_password(data_in.old_password.get_secret_value()):
+    if not await user_obj.check_password(data_in.old_password.get_secret_value()):
         raise error.BadDataError("Old password is incorrect")
 
-    if user_obj.check_password(data_in.password.get_secret_value()):
+    if await user_obj.check_password(data_in.password.get_secret_value()):
         raise error.BadDataError("Try another password you have not used before")
     user_obj.update_from_dict(
-        dict(password=models.User.generate_hash(data_in.password.get_secret_value()))
+        dict(
+            password=await models.User.generate_hash(
+                data_in.password.get_secret_value()
+            )
+        )
     )
     await user_obj.save()
     await tasks.send_users_password_reset_link.kiq(
@@ -288,6 +336,7 @@ async def remove_users_data(data_in: schemas.IUserRemove) -> None:
             await models.User.filter(id=user_to_remove.id).delete()
         else:
             await models.User.filter(id=user_to_remove.id).update(is_archived=True)
+        invalidate_principal(user_to_remove.id)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
     raise error.NotFoundError(f"User with  user id {data_in.user_id} does not exist")
 
@@ -297,11 +346,13 @@ async def get_total_users():
     return ITotalCount(count=total_count).dict()
 
 
-async def get_user(user_id: uuid.UUID, load_related: bool = False) -> models.User:
+async def get_user(
+    user_id: uuid.UUID, load_related: bool = False, expand: str = ""
+) -> models.User:
     query = models.User.filter(id=user_id)
     try:
         result = await filter_and_single(
-            model=models.User, query=query, load_related=load_related
+            model=models.User, query=query, load_related=load_related, expand=expand
         )
         if not result:
             raise error.NotFoundError("No user with the provided credential")
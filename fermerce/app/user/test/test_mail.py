@@ -0,0 +1,163 @@
+import asyncio
+import smtplib
+import typing as t
+import pytest
+from fermerce.lib.shared.mail import transport
+
+
+class FakeSMTP:
+    """Stands in for smtplib.SMTP, recording what each connection sent."""
+
+    connections: t.List["FakeSMTP"] = []
+    # sends after which a connection drops, None to keep it up
+    drop_after: t.Optional[int] = None
+    refused: t.Set[str] = set()
+
+    def __init__(self, host: str, port: int, timeout: float) -> None:
+        self.logins = 0
+        self.sent: t.List[t.Tuple[str, t.List[str], str]] = []
+        self.closed = False
+        self.alive = True
+        self.connections.append(self)
+
+    def login(self, user: str, password: str) -> None:
+        self.logins += 1
+
+    def sendmail(self, sender: str, recipients: t.List[str], message: str) -> None:
+        if not self.alive or len(self.sent) == self.drop_after:
+            self.alive = False
+            raise smtplib.SMTPServerDisconnected("connection dropped")
+        if set(recipients) & self.refused:
+            raise smtplib.SMTPRecipientsRefused({r: (550, b"no") for r in recipients})
+        self.sent.append((sender, recipients, message))
+
+    def noop(self) -> t.Tuple[int, bytes]:
+        if not self.alive:
+            raise smtplib.SMTPServerDisconnected("connection dropped")
+        return 250, b"ok"
+
+    def quit(self) -> None:
+        self.closed = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_smtp(monkeypatch):
+    monkeypatch.setattr(transport.smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(FakeSMTP, "connections", [])
+    monkeypatch.setattr(FakeSMTP, "drop_after", None)
+    monkeypatch.setattr(FakeSMTP, "refused", set())
+
+
+def make_pool(**kwargs: t.Any) -> transport.SMTPPool:
+    options = dict(size=2, use_ssl=False)
+    options.update(kwargs)
+    return transport.SMTPPool("smtp.test", 25, "admin", "secret", **options)
+
+
+def envelope(recipient: str) -> transport.Envelope:
+    return ("admin@test", [recipient], f"hello {recipient}")
+
+
+async def test_pool_reuses_a_logged_in_connection():
+    pool = make_pool()
+    assert await pool.send_many([envelope("a@test")]) == [None]
+    assert await pool.send_many([envelope("b@test"), envelope("c@test")]) == [
+        None,
+        None,
+    ]
+    assert len(FakeSMTP.connections) == 1
+    assert FakeSMTP.connections[0].logins == 1
+    assert len(FakeSMTP.connections[0].sent) == 3
+    await pool.close()
+
+
+async def test_pool_retries_a_dropped_connection_once():
+    FakeSMTP.drop_after = 1
+    pool = make_pool()
+    results = await pool.send_many([envelope("a@test"), envelope("b@test")])
+    assert results == [None, None]
+    first, second = FakeSMTP.connections
+    assert first.closed and [m[1] for m in first.sent] == [["a@test"]]
+    assert [m[1] for m in second.sent] == [["b@test"]]
+    await pool.close()
+
+
+async def test_pool_reports_refused_messages_and_keeps_the_connection():
+    FakeSMTP.refused = {"bad@test"}
+    pool = make_pool()
+    results = await pool.send_many([envelope("bad@test"), envelope("a@test")])
+    assert isinstance(results[0], smtplib.SMTPRecipientsRefused)
+    assert results[1] is None
+    assert len(FakeSMTP.connections) == 1
+    await pool.close()
+
+
+async def test_pool_replaces_idle_connections_that_went_away():
+    pool = make_pool(max_idle=0)
+    await pool.send_many([envelope("a@test")])
+    FakeSMTP.connections[0].alive = False
+    assert await pool.send_many([envelope("b@test")]) == [None]
+    assert len(FakeSMTP.connections) == 2
+    assert FakeSMTP.connections[0].closed
+    await pool.close()
+
+
+async def test_pool_close_quits_idle_connections():
+    pool = make_pool()
+    await asyncio.gather(
+        pool.send_many([envelope("a@test")]), pool.send_many([envelope("b@test")])
+    )
+    await pool.close()
+    assert pool.idle == []
+    assert all(smtp.closed for smtp in FakeSMTP.connections)
+
+
+async def test_outbox_batches_concurrent_sends_over_one_connection():
+    pool = make_pool()
+    outbox = transport.MailOutbox(pool, batch_size=10, interval=0.05)
+    await asyncio.gather(*[outbox.send(envelope(f"{i}@test")) for i in range(5)])
+    assert len(FakeSMTP.connections) == 1
+    assert len(FakeSMTP.connections[0].sent) == 5
+    await outbox.close()
+
+
+async def test_outbox_splits_batches_at_batch_size(monkeypatch):
+    pool = make_pool()
+    batches = []
+    send_many = pool.send_many
+
+    async def record(envelopes):
+        batches.append(len(envelopes))
+        return await send_many(envelopes)
+
+    monkeypatch.setattr(pool, "send_many", record)
+    outbox = transport.MailOutbox(pool, batch_size=2, interval=0.05)
+    await asyncio.gather(*[outbox.send(envelope(f"{i}@test")) for i in range(5)])
+    assert sorted(batches) == [1, 2, 2]
+    await outbox.close()
+
+
+async def test_outbox_raises_delivery_errors_to_the_sender():
+    FakeSMTP.refused = {"bad@test"}
+    outbox = transport.MailOutbox(make_pool(), batch_size=10, interval=0.01)
+    results = await asyncio.gather(
+        outbox.send(envelope("bad@test")),
+        outbox.send(envelope("a@test")),
+        return_exceptions=True,
+    )
+    assert isinstance(results[0], smtplib.SMTPRecipientsRefused)
+    assert results[1] is None
+    await outbox.close()
+
+
+async def test_outbox_close_stops_the_worker():
+    outbox = transport.MailOutbox(make_pool(), batch_size=10, interval=0.01)
+    await outbox.send(envelope("a@test"))
+    worker = outbox.worker
+    await outbox.close()
+    await asyncio.sleep(0)
+    assert worker.cancelled()
+    assert all(smtp.closed for smtp in FakeSMTP.connections)
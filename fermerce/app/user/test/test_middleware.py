@@ -0,0 +1,95 @@
+import json
+import typing as t
+import httpx
+import pytest
+from starlette.types import Receive, Scope, Send
+from fermerce.lib.middleware.response_formatter import ResponseEnvelopeMiddleware
+
+
+def make_app(
+    status: int,
+    chunks: t.List[bytes],
+    content_type: bytes = b"application/json",
+):
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", content_type),
+                    (b"content-length", str(sum(map(len, chunks))).encode()),
+                ],
+            }
+        )
+        for index, chunk in enumerate(chunks):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": index < len(chunks) - 1,
+                }
+            )
+
+    return ResponseEnvelopeMiddleware(app)
+
+
+async def request(app, method: str = "GET", path: str = "/items") -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        return await client.request(method, path)
+
+
+async def test_multi_chunk_body_is_wrapped_once():
+    app = make_app(200, [b'{"items": [1', b", 2", b", 3]}"])
+    response = await request(app)
+    assert response.json() == {
+        "status": 200,
+        "data": {"items": [1, 2, 3]},
+        "error": None,
+    }
+    assert response.headers["content-length"] == str(len(response.content))
+
+
+async def test_empty_success_body_becomes_null():
+    response = await request(make_app(201, [b""]))
+    assert response.json() == {"status": 201, "data": None, "error": None}
+
+
+@pytest.mark.parametrize(
+    "status, body, expected",
+    [
+        (404, {"detail": "not found"}, "not found"),
+        (400, {"detail": {"field": "bad"}}, {"detail": {"field": "bad"}}),
+        (
+            422,
+            {"detail": [{"loc": ["body", "email"], "msg": "invalid email"}]},
+            {"email": "invalid email"},
+        ),
+        (
+            500,
+            {"detail": "secret stack trace"},
+            "Internal Server Error, please try again",
+        ),
+    ],
+)
+async def test_error_bodies_are_moved_to_error(status, body, expected):
+    encoded = json.dumps(body).encode()
+    response = await request(make_app(status, [encoded[:5], encoded[5:]]))
+    assert response.status_code == status
+    assert response.json() == {"status": status, "data": None, "error": expected}
+
+
+async def test_error_body_that_is_not_json_is_kept_as_text():
+    response = await request(make_app(400, [b"plain ", b"failure"]))
+    assert response.json()["error"] == "plain failure"
+
+
+async def test_other_responses_pass_through():
+    body = [b"a,b\n", b"1,2\n"]
+    response = await request(make_app(200, body, content_type=b"text/csv"))
+    assert response.content == b"".join(body)
+    response = await request(make_app(200, [b"{}"]), path="/openapi.json")
+    assert response.json() == {}
+    response = await request(make_app(200, [b"{}"]), method="HEAD")
+    assert response.content == b""
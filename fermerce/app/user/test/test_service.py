@@ -0,0 +1,67 @@
+import uuid
+import pytest
+from fermerce.app.staff.models import Staff
+from fermerce.app.user.models import User
+from fermerce.core.services.base import filter_and_list, filter_and_single
+
+
+@pytest.fixture
+async def staff(db):
+    staff = []
+    for index in range(3):
+        user = await User.create(
+            id=uuid.uuid4(),
+            username=f"user{index}",
+            email=f"user{index}@test",
+            lastname=f"last{index}",
+            password=f"hash{index}",
+            reset_token=f"token{index}",
+        )
+        staff.append(await Staff.create(id=uuid.uuid4(), user=user, tel=str(index)))
+    return staff
+
+
+@pytest.mark.parametrize("kwargs", [dict(expand="user"), dict(load_related=True)])
+async def test_expanded_rows_keep_their_own_values(staff, kwargs):
+    page = await filter_and_list(model=Staff, query=Staff, per_page=10, **kwargs)
+    rows = sorted(page["results"], key=lambda row: row["tel"])
+    assert [(row["tel"], row["user"]["username"]) for row in rows] == [
+        ("0", "user0"),
+        ("1", "user1"),
+        ("2", "user2"),
+    ]
+    assert len({id(row["user"]) for row in rows}) == 3
+    for row in rows:
+        assert row["user_id"] == row["user"]["id"]
+        assert "password" not in row["user"]
+        assert "reset_token" not in row["user"]
+
+
+async def test_listing_users_leaves_out_secrets(staff):
+    page = await filter_and_list(model=User, query=User, per_page=10, expand="staff")
+    assert sorted(row["username"] for row in page["results"]) == [
+        "user0",
+        "user1",
+        "user2",
+    ]
+    for row in page["results"]:
+        assert row["staff"]["user_id"] == row["id"]
+        assert "password" not in row and "reset_token" not in row
+
+
+async def test_single_with_a_field_selection(staff):
+    user = await User.get(username="user1")
+    result = await filter_and_single(
+        model=User,
+        query=User.filter(id=user.id),
+        select="username,email,password",
+    )
+    assert result == {"username": "user1", "email": "user1@test"}
+
+
+async def test_single_with_an_expanded_relation(staff):
+    result = await filter_and_single(
+        model=Staff, query=Staff.filter(tel="2"), expand="user"
+    )
+    assert result["user"]["username"] == "user2"
+    assert "password" not in result["user"]
@@ -2,7 +2,7 @@ import uuid
 import typing as t
 from fastapi import status, Response
 from tortoise.expressions import Q
-from fermerce.app.state.models import State
+from fermerce.app.state.services import state_cache
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.services.base import filter_and_list, filter_and_single
 from fermerce.lib.errors import error
@@ -10,7 +10,7 @@ from fermerce.app.warehouse import schemas, models
 
 
 async def create_warehouse(data_in: schemas.IWarehouseIn):
-    get_state = await State.get_or_none(id=data_in.state)
+    get_state = await state_cache.get(data_in.state)
     if not get_state:
         raise error.NotFoundError("state not found")
     check_warehouse = await models.WereHouse.get_or_none(
@@ -34,12 +34,14 @@ async def create_warehouse(data_in: schemas.IWarehouseIn):
 async def get_warehouse(
     warehouse_id: uuid.UUID,
     load_related: bool = False,
+    expand: str = "",
 ) -> models.WereHouse:
     query = models.WereHouse.filter(id=warehouse_id)
     result = await filter_and_single(
         model=models.WereHouse,
         query=query,
         load_related=load_related,
+        expand=expand,
     )
     if not result:
         raise error.NotFoundError("address not found")
@@ -59,7 +61,7 @@ async def update_warehouse(
         raise error.NotFoundError("warehouse not found")
     state = get_warehouse.state
     if state.id != data_in.state:
-        state = await State.get_or_none(id=data_in.state)
+        state = await state_cache.get(data_in.state)
     if not state:
         raise error.NotFoundError("state not found")
 
@@ -97,9 +99,12 @@ async def warehouse_filter(
     filter_string: str = "",
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
     load_related: bool = False,
+    expand: str = "",
 ) -> t.List[models.WereHouse]:
     query = models.WereHouse
     if filter_string:
@@ -115,9 +120,12 @@ async def warehouse_filter(
         model=models.WereHouse,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         sort_by=sort_by,
         order_by=order_by,
         load_related=load_related,
+        expand=expand,
     )
 
 
@@ -33,6 +33,12 @@ async def get_carts(
     ),
     per_page: int = 10,
     page: int = 1,
+    cursor: t.Optional[str] = Query(
+        default=None,
+        description="cursor pagination, send an empty value for the first page "
+        "and the returned next_cursor afterwards",
+    ),
+    count: bool = Query(default=False, description="total_results over all pages"),
     sort_by: t.Optional[SortOrder] = Query(
         default=SortOrder.desc,
         description="order by attribute, e.g. ascending, descending",
@@ -44,6 +50,9 @@ async def get_carts(
         default="", description="order by attribute, e.g. id, created_at"
     ),
     load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. product,selling_unit"
+    ),
     user: User = Depends(dependency.require_user),
 ):
     return await services.filter(
@@ -51,9 +60,12 @@ async def get_carts(
         filter_string=filter_string,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         sort_by=sort_by,
         order_by=order_by,
         load_related=load_related,
+        expand=expand,
         select=select,
     )
 
@@ -63,11 +75,15 @@ async def get_cart(
     wish_item_id: uuid.UUID,
     user: User = Depends(dependency.require_user),
     load_related: bool = False,
+    expand: t.Optional[str] = Query(
+        default="", description="relations to include, e.g. product,selling_unit"
+    ),
 ):
     return await services.get(
         wish_item_id=wish_item_id,
         user=user,
         load_related=load_related,
+        expand=expand,
     )
 
 
@@ -17,3 +17,9 @@ class WishList(models.Model):
 
     class Meta:
         table = "fm_wish_list"
+        expandable = (
+            "product",
+            "selling_unit",
+            "product__cover_media",
+            "selling_unit__unit",
+        )
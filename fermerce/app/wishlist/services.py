@@ -72,12 +72,14 @@ async def get(
     wish_item_id: uuid.UUID,
     user: User,
     load_related: bool = False,
+    expand: str = "",
 ) -> models.WishList:
     query = models.WishList.filter(id=wish_item_id, user=user)
     result = await filter_and_single(
         model=models.WishList,
         query=query,
         load_related=load_related,
+        expand=expand,
     )
     if not result:
         raise error.NotFoundError("wish list item not found")
@@ -89,9 +91,12 @@ async def filter(
     filter_string: str = None,
     per_page: int = 10,
     page: int = 0,
+    cursor: str = None,
+    count: bool = False,
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = "id",
     load_related: bool = False,
+    expand: str = "",
     select: str = "",
 ) -> t.List[models.WishList]:
     query = models.WishList.filter(user=user)
@@ -102,9 +107,12 @@ async def filter(
         query=query,
         per_page=per_page,
         page=page,
+        cursor=cursor,
+        count=count,
         sort_by=sort_by,
         order_by=order_by,
         load_related=load_related,
+        expand=expand,
         select=select,
     )
 
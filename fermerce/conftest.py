@@ -0,0 +1,13 @@
+import pytest
+from tortoise import Tortoise
+
+
+@pytest.fixture
+async def db():
+    await Tortoise.init(
+        db_url="sqlite://:memory:",
+        modules={"models": ["fermerce.core.model.models"]},
+    )
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
@@ -11,7 +11,12 @@ from fermerce.app.selling_units.models import ProductSellingUnit
 from fermerce.app.cart.models import Cart
 from fermerce.app.delivery_mode.models import DeliveryMode
 
-from fermerce.app.order.models import Order, OrderItem
+from fermerce.app.order.models import (
+    Order,
+    OrderItem,
+    OrderRouting,
+    RoutingWatermark,
+)
 from fermerce.app.cards.models import SaveCard
 
 from fermerce.app.charge.models import Charge
@@ -39,6 +44,6 @@ from fermerce.app.category.models import ProductCategory
 from fermerce.app.reviews.models import Review
 from fermerce.app.warehouse.models import WereHouse
 from fermerce.app.status.models import Status
-from fermerce.app.product.models import Product, ProductDetail
+from fermerce.app.product.models import Product, ProductDetail, ProductSearchDocument
 from fermerce.app.tracking.models import Tracking
 from fermerce.app.message.models import Message
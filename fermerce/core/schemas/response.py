@@ -5,6 +5,7 @@ from pydantic import BaseModel
 class IResponseFilterOut(BaseModel):
     previous: t.Optional[int] = None
     next: t.Optional[int] = None
+    next_cursor: t.Optional[str] = None
     total_results: t.Optional[int] = None
     results: t.List[dict] = []
 
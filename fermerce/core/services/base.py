@@ -1,34 +1,126 @@
+import base64
+import datetime
+import json
+import typing as t
+from tortoise.expressions import Q
 from fermerce.core.enum.sort_type import SortOrder
+from fermerce.core.services.serializer import get_serializer
+from fermerce.core.settings import config
+from fermerce.lib.errors import error
+from fermerce.lib.utils.ttl_cache import TTLCache
 from tortoise.models import Model
+from tortoise.queryset import QuerySet
 
 
-def remove_password(objec):
-    if isinstance(objec, list):
-        for index, obj in enumerate(objec):
-            if isinstance(obj, Model):
-                obj = dict(obj)
-                if obj.get("password", None) is not None:
-                    del obj["password"]
-                    objec[index] = obj
-            elif isinstance(obj, dict):
-                if obj.get("password", None) is not None:
-                    del obj["password"]
-                    objec[index] = obj
-        if isinstance(objec, list):
-            if "password" in objec:
-                objec.remove("password")
-
-    if isinstance(objec, dict):
-        for _, value in objec.items():
-            if isinstance(value, dict):
-                if "password" in value.keys():
-                    del value["password"]
-        if "password" in objec.keys():
-            del objec["password"]
-    if isinstance(objec, Model):
-        if "password" in dict(objec).keys():
-            del objec["password"]
-    return objec
+# total counts keyed by the generated COUNT sql, so identical filters share one query
+count_cache = TTLCache(maxsize=2048, ttl=config.list_count_cache_ttl)
+# how many relations deep `expand` may reach, e.g. "vendor__logo" is depth 2
+MAX_EXPAND_DEPTH = 2
+
+
+def get_cursor_fields(model: Model) -> t.Tuple[str, ...]:
+    if "created_at" in model._meta.fields_map:
+        return ("created_at", model._meta.pk_attr)
+    return (model._meta.pk_attr,)
+
+
+def encode_cursor(model: Model, item: t.Union[Model, dict]) -> str:
+    values = []
+    for field in get_cursor_fields(model):
+        value = item.get(field) if isinstance(item, dict) else getattr(item, field)
+        if isinstance(value, datetime.datetime):
+            value = value.isoformat()
+        values.append(str(value) if value is not None else None)
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(model: Model, cursor: str) -> t.List[t.Any]:
+    fields = get_cursor_fields(model)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(fields):
+            raise ValueError("cursor does not match model")
+        if fields[0] == "created_at":
+            values[0] = datetime.datetime.fromisoformat(values[0])
+        return values
+    except (ValueError, TypeError):
+        raise error.BadDataError("Invalid pagination cursor")
+
+
+def apply_cursor(
+    model: Model,
+    query: QuerySet,
+    cursor: t.Optional[str],
+    sort_by: SortOrder = SortOrder.desc,
+) -> QuerySet:
+    fields = get_cursor_fields(model)
+    descending = sort_by == SortOrder.desc
+    query = query.order_by(*[f"-{field}" if descending else field for field in fields])
+    if not cursor:
+        return query
+    values = decode_cursor(model, cursor)
+    lookup = "lt" if descending else "gt"
+    conditions = []
+    for index, field in enumerate(fields):
+        equal_to = {fields[i]: values[i] for i in range(index)}
+        conditions.append(Q(**equal_to, **{f"{field}__{lookup}": values[index]}))
+    return query.filter(Q(*conditions, join_type=Q.OR))
+
+
+async def get_total_count(query: QuerySet) -> int:
+    count_query = query.count()
+    key = count_query.sql()
+    total = count_cache.get(key)
+    if total is None:
+        total = await count_query
+        count_cache.set(key, total)
+    return total
+
+
+def get_relation_fields(model: Model) -> t.Set[str]:
+    return set.union(
+        model._meta.m2m_fields,
+        model._meta.fk_fields,
+        model._meta.o2o_fields,
+        model._meta.backward_o2o_fields,
+        model._meta.backward_fk_fields,
+    )
+
+
+def get_expandable(model: Model) -> t.Tuple[str, ...]:
+    """Relations a client may request through `expand`.
+
+    Declared per model as ``Meta.expandable``; models without one only allow
+    their forward single relations, which cost one query each.
+    """
+    expandable = getattr(model.Meta, "expandable", None)
+    if expandable is None:
+        return tuple(sorted(set.union(model._meta.fk_fields, model._meta.o2o_fields)))
+    return tuple(expandable)
+
+
+def get_expansions(model: Model, expand: str = "", load_related: bool = False):
+    allowed = get_expandable(model)
+    if expand:
+        requested = [name.strip() for name in expand.split(",") if name.strip()]
+    elif load_related:
+        requested = [name for name in allowed if "__" not in name]
+    else:
+        return []
+    return [
+        name
+        for name in dict.fromkeys(requested)
+        if name in allowed and name.count("__") < MAX_EXPAND_DEPTH
+    ]
+
+
+def get_expansion_tree(expansions: t.List[str]) -> t.Dict[str, dict]:
+    tree = {}
+    for name in expansions:
+        node = tree
+        for part in name.split("__"):
+            node = node.setdefault(part, {})
+    return tree
 
 
 async def filter_and_list(
@@ -40,14 +132,22 @@ async def filter_and_list(
     load_related: bool = False,
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
+    cursor: t.Optional[str] = None,
+    count: bool = False,
+    expand: str = "",
 ):
+    page = max(page, 1)
     offset = (page - 1) * per_page
     limit = per_page
 
-    # Query the model with the filter and pagination parameters.
-    query = query
-    query = query.all().offset(offset).limit(limit)
-    if sort_by == SortOrder.asc and bool(order_by):
+    query = query.all()
+    total = await get_total_count(query) if count else None
+    # Cursor mode seeks past the last row of the previous page instead of
+    # skipping `offset` rows, so every page costs the same.
+    use_cursor = cursor is not None
+    if use_cursor:
+        query = apply_cursor(model, query, cursor or None, sort_by)
+    elif sort_by == SortOrder.asc and bool(order_by):
         query = query.order_by(
             *[f"-{col}" for col in order_by.split(",") if col in model._meta.fields]
         )
@@ -57,69 +157,68 @@ async def filter_and_list(
         )
     else:
         query = query.order_by("-id")
-    to_pre_fetch = set.union(
-        model._meta.m2m_fields,
-        model._meta.fk_fields,
-        model._meta.o2o_fields,
-        model._meta.backward_o2o_fields,
-        model._meta.backward_fk_fields,
-    )
-
-    if load_related:
-        query = query.prefetch_related(*to_pre_fetch)
+    # one extra row tells us whether another page exists without counting
+    query = query.limit(limit + 1)
+    if not use_cursor:
+        query = query.offset(offset)
+    to_pre_fetch = get_relation_fields(model)
+    expansions = get_expansions(model, expand, load_related)
+    if expansions:
+        query = query.prefetch_related(*expansions)
+    # cursor fields read only to build next_cursor, left out of the results
+    cursor_only: t.List[str] = []
     if select:
-        query = query.values(
-            *[
-                col.strip()
-                for col in select.split(",")
-                if col.strip() in model._meta.fields and col.strip() not in to_pre_fetch
+        columns = [
+            col.strip()
+            for col in select.split(",")
+            if col.strip() in model._meta.fields and col.strip() not in to_pre_fetch
+        ]
+        if use_cursor:
+            cursor_only = [
+                field for field in get_cursor_fields(model) if field not in columns
             ]
-        )
-    results = await query
-    items_list = []
-    items = {}
-    if load_related and results and not select:
-        for result in results:
-            # return results
-            for field_name in model._meta.m2m_fields:
-                if hasattr(result, field_name):
-                    items[field_name] = remove_password(
-                        list(getattr(result, field_name))
-                    )
-            for field_name in model._meta.fk_fields:
-                if getattr(result, field_name):
-                    items[field_name] = remove_password(
-                        dict(getattr(result, field_name))
-                    )
-            for field_name in model._meta.o2o_fields:
-                if getattr(result, field_name):
-                    items[field_name] = remove_password(
-                        dict(getattr(result, field_name))
-                    )
-            for field_name in model._meta.backward_o2o_fields:
-                if getattr(result, field_name):
-                    items[field_name] = remove_password(
-                        dict(getattr(result, field_name))
-                    )
-            for field_name in model._meta.backward_fk_fields:
-                if getattr(result, field_name):
-                    items[field_name] = remove_password(
-                        list(getattr(result, field_name))
-                    )
-            items.update(remove_password(dict(result)))
-            items_list.append(items)
+            columns.extend(cursor_only)
+        query = query.values_list(*columns)
+    results = list(await query)
+    has_more = len(results) > limit
+    results = results[:limit]
+    serializer = get_serializer(model)
+    if select:
+        items_list = serializer.from_values(columns, results)
+    elif expansions:
+        expansion_tree = get_expansion_tree(expansions)
+        items_list = [
+            serializer.with_relations(result, expansion_tree) for result in results
+        ]
     else:
-        items_list = remove_password([dict(item) for item in results])
-
-    # Count the total number of results with the same filter.
+        items_list = [serializer.to_dict(result) for result in results]
+    next_cursor = (
+        encode_cursor(model, items_list[-1]) if has_more and items_list else None
+    )
+    if cursor_only:
+        for item in items_list:
+            for field in cursor_only:
+                item.pop(field, None)
+    if total is None:
+        # without count, total_results stays the page length as it always was
+        total = len(items_list)
 
+    if use_cursor:
+        return {
+            "previous": None,
+            "next": None,
+            "next_cursor": next_cursor,
+            "total_results": total,
+            "results": items_list,
+        }
     prev_page = page - 1 if page > 1 else None
-    next_page = page + 1 if (offset + limit) < len(items_list) else None
+    next_page = page + 1 if has_more else None
     # Return the pagination information and results as a dictionary
     return {
         "previous": prev_page,
         "next": next_page,
-        "total_results": len(items_list),
+        "next_cursor": None,
+        "total_results": total,
         "results": items_list,
     }
 
@@ -131,6 +230,7 @@ async def filter_and_single(
     load_related: bool = False,
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
+    expand: str = "",
 ):
     query = query
     if sort_by == SortOrder.asc and bool(order_by):
@@ -143,44 +243,24 @@ async def filter_and_single(
         )
     else:
         query = query.order_by("-id")
-    to_pre_fetch = set.union(
-        model._meta.m2m_fields,
-        model._meta.fk_fields,
-        model._meta.o2o_fields,
-        model._meta.backward_o2o_fields,
-        model._meta.backward_fk_fields,
-    )
-
-    if load_related:
-        query = query.prefetch_related(*to_pre_fetch)
+    to_pre_fetch = get_relation_fields(model)
+    expansions = get_expansions(model, expand, load_related)
+    if expansions:
+        query = query.prefetch_related(*expansions)
+    query = query.first()
     if select:
-        query = query.values(
-            *[
-                col.strip()
-                for col in select.split(",")
-                if col.strip() in model._meta.fields and col.strip() not in to_pre_fetch
-            ]
-        )
-    result = await query.first()
+        columns = [
+            col.strip()
+            for col in select.split(",")
+            if col.strip() in model._meta.fields and col.strip() not in to_pre_fetch
+        ]
+        query = query.values_list(*columns)
+    result = await query
     if not result:
         return None
-    item = {}
-    if load_related and result and not select:
-        for field_name in model._meta.m2m_fields:
-            if hasattr(result, field_name):
-                item[field_name] = remove_password(list(getattr(result, field_name)))
-        for field_name in model._meta.fk_fields:
-            if getattr(result, field_name):
-                item[field_name] = remove_password(dict(getattr(result, field_name)))
-        for field_name in model._meta.o2o_fields:
-            if getattr(result, field_name):
-                item[field_name] = remove_password(dict(getattr(result, field_name)))
-        for field_name in model._meta.backward_o2o_fields:
-            if getattr(result, field_name):
-                item[field_name] = remove_password(dict(getattr(result, field_name)))
-        for field_name in model._meta.backward_fk_fields:
-            if getattr(result, field_name):
-                item[field_name] = remove_password(list(getattr(result, field_name)))
-    if load_related:
-        return remove_password(dict(item, **dict(result)))
-    return remove_password(dict(result))
+    serializer = get_serializer(model)
+    if select:
+        return serializer.from_values(columns, [result])[0]
+    if expansions:
+        return serializer.with_relations(result, get_expansion_tree(expansions))
+    return serializer.to_dict(result)
@@ -0,0 +1,81 @@
+import asyncio
+import time
+import typing as t
+from tortoise.models import Model
+
+
+# every cache created at import time, loaded together by `preload` on startup
+registry: t.List["ReferenceCache"] = []
+
+
+class ReferenceCache:
+    """All rows of a small lookup table held in memory and reloaded after ``ttl``.
+
+    Services that write to the table call ``invalidate``; other workers pick the
+    change up once their copy expires. Cached rows are shared between requests
+    and must not be modified by callers.
+    """
+
+    def __init__(
+        self, model: t.Type[Model], ttl: float = 300, name_field: str = "name"
+    ) -> None:
+        self.model = model
+        self.ttl = ttl
+        self.name_field = name_field
+        self._by_id: t.Dict[str, Model] = {}
+        self._by_name: t.Dict[str, Model] = {}
+        self._expires_at = 0.0
+        # bumped by invalidate, so a load that overlapped a write is not trusted
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        registry.append(self)
+
+    async def load(self) -> None:
+        generation = self._generation
+        rows = await self.model.all()
+        self._by_id = {str(row.pk): row for row in rows}
+        self._by_name = {
+            str(getattr(row, self.name_field)).lower(): row
+            for row in rows
+            if getattr(row, self.name_field) is not None
+        }
+        if generation == self._generation:
+            self._expires_at = time.monotonic() + self.ttl
+
+    async def _ensure_loaded(self) -> None:
+        if self._expires_at > time.monotonic():
+            return
+        async with self._lock:
+            if self._expires_at <= time.monotonic():
+                await self.load()
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._expires_at = 0.0
+
+    async def all(self) -> t.List[Model]:
+        await self._ensure_loaded()
+        return list(self._by_id.values())
+
+    async def get(self, pk: t.Any) -> t.Optional[Model]:
+        await self._ensure_loaded()
+        return self._by_id.get(str(pk))
+
+    async def get_many(self, pks: t.Iterable[t.Any]) -> t.List[Model]:
+        await self._ensure_loaded()
+        return [self._by_id[str(pk)] for pk in pks if str(pk) in self._by_id]
+
+    async def get_by_name(self, name: str) -> t.Optional[Model]:
+        await self._ensure_loaded()
+        return self._by_name.get(name.lower())
+
+    async def get_or_create_by_name(self, name: str) -> Model:
+        row = await self.get_by_name(name)
+        if row is None:
+            row, _ = await self.model.get_or_create(**{self.name_field: name})
+            self.invalidate()
+        return row
+
+
+async def preload() -> None:
+    await asyncio.gather(*[cache.load() for cache in registry])
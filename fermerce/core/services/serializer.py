@@ -0,0 +1,63 @@
+import functools
+import typing as t
+from tortoise.models import Model
+
+# never sent back to clients, whichever model or relation they come from
+REDACTED_FIELDS = frozenset({"password", "reset_token"})
+
+
+class ModelSerializer:
+    """Turns rows of one model into response dicts.
+
+    The emitted fields are worked out once from ``model._meta`` when the
+    serializer is built, so converting a row is a single pass over a tuple.
+    """
+
+    def __init__(self, model: t.Type[Model]) -> None:
+        self.model = model
+        self.fields: t.Tuple[str, ...] = tuple(
+            field for field in model._meta.db_fields if field not in REDACTED_FIELDS
+        )
+
+    def to_dict(self, row: t.Union[Model, dict]) -> dict:
+        if isinstance(row, dict):
+            return {
+                key: value for key, value in row.items() if key not in REDACTED_FIELDS
+            }
+        return {field: getattr(row, field) for field in self.fields}
+
+    def from_values(
+        self, columns: t.Sequence[str], rows: t.Iterable[t.Sequence[t.Any]]
+    ) -> t.List[dict]:
+        """Build dicts from ``values_list`` tuples selected with ``columns``."""
+        keep = [
+            (index, column)
+            for index, column in enumerate(columns)
+            if column not in REDACTED_FIELDS
+        ]
+        return [{column: row[index] for index, column in keep} for row in rows]
+
+    def relation(self, value: t.Any, children: t.Dict[str, dict]):
+        """Serialize a prefetched relation and any nested relations below it."""
+        if value is None:
+            return None
+        if isinstance(value, Model):
+            serializer = get_serializer(type(value))
+            data = serializer.to_dict(value)
+            for field_name, nested in children.items():
+                data[field_name] = serializer.relation(
+                    getattr(value, field_name), nested
+                )
+            return data
+        return [self.relation(item, children) for item in value]
+
+    def with_relations(self, row: Model, expansion_tree: t.Dict[str, dict]) -> dict:
+        data = self.to_dict(row)
+        for field_name, children in expansion_tree.items():
+            data[field_name] = self.relation(getattr(row, field_name), children)
+        return data
+
+
+@functools.lru_cache(maxsize=None)
+def get_serializer(model: t.Type[Model]) -> ModelSerializer:
+    return ModelSerializer(model)
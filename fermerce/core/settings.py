@@ -26,6 +26,11 @@ class Settings(pyd.BaseSettings):
     email_port: int = os.getenv("EMAIL_PORT")
     email_host: str = os.getenv("EMAIL_HOST")
     email_backend: str = os.getenv("EMAIL_BACKEND")
+    email_use_ssl: bool = os.getenv("EMAIL_USE_SSL", True)
+    # open smtp connections per worker, and how sends are grouped over them
+    email_pool_size: int = os.getenv("EMAIL_POOL_SIZE", 4)
+    email_batch_size: int = os.getenv("EMAIL_BATCH_SIZE", 50)
+    email_batch_interval: float = os.getenv("EMAIL_BATCH_INTERVAL", 0.05)
     # developer contact information
     contact_email: str = os.getenv("CONTACT_EMAIL")
     contact_name: str = os.getenv("CONTACT_NAME")
@@ -60,11 +65,65 @@ class Settings(pyd.BaseSettings):
     base_payment_url: str = os.getenv("BASE_PAYMENT_URL")
     payment_secret_key: str = os.getenv("PAYMENT_SECRET_KEY")
     payment_public_key: str = os.getenv("PAYMENT_PUBLIC_KEY")
+    payment_timeout: float = os.getenv("PAYMENT_TIMEOUT", 10)
+    payment_connect_timeout: float = os.getenv("PAYMENT_CONNECT_TIMEOUT", 3)
+    payment_max_connections: int = os.getenv("PAYMENT_MAX_CONNECTIONS", 50)
+    payment_max_keepalive: int = os.getenv("PAYMENT_MAX_KEEPALIVE", 10)
+    payment_max_retries: int = os.getenv("PAYMENT_MAX_RETRIES", 2)
+    # consecutive failures that open the circuit, and seconds it stays open
+    payment_failure_threshold: int = os.getenv("PAYMENT_FAILURE_THRESHOLD", 5)
+    payment_reset_timeout: float = os.getenv("PAYMENT_RESET_TIMEOUT", 30)
     # project template, static files path settings
     base_dir: pyd.DirectoryPath = get_path.get_base_dir()
     email_template_dir: pyd.DirectoryPath = get_path.get_template_dir()
+    # optional directory for compiled template bytecode shared across restarts
+    email_template_cache_dir: str = os.getenv("EMAIL_TEMPLATE_CACHE_DIR", "")
     static_file_dir: pyd.DirectoryPath = get_path.get_static_file_dir()
     media_url_endpoint_name: str = os.getenv("MEDIA_URL_ENDPOINT_NAME")
+    # where media files are stored: deta, local or memory
+    media_storage: str = os.getenv("MEDIA_STORAGE", "deta")
+    media_root: str = os.getenv("MEDIA_ROOT", f"{get_path.get_static_file_dir()}/media")
+    # in-process cache of served media; a size of 0 turns it off
+    media_cache_size: int = os.getenv("MEDIA_CACHE_SIZE", 64 * 1024 * 1024)
+    media_cache_max_entry: int = os.getenv("MEDIA_CACHE_MAX_ENTRY", 4 * 1024 * 1024)
+    media_cache_ttl: int = os.getenv("MEDIA_CACHE_TTL", 3600)
+    # directory shared by the workers of a host as a second cache tier
+    media_cache_dir: str = os.getenv("MEDIA_CACHE_DIR", "")
+    # largest accepted uploads, in bytes
+    max_image_upload_size: int = os.getenv("MAX_IMAGE_UPLOAD_SIZE", 20 * 1024 * 1024)
+    max_video_upload_size: int = os.getenv("MAX_VIDEO_UPLOAD_SIZE", 200 * 1024 * 1024)
+    # processes compressing uploaded images, and uploads allowed to queue for them
+    image_workers: int = os.getenv("IMAGE_WORKERS", 2)
+    image_queue_size: int = os.getenv("IMAGE_QUEUE_SIZE", 32)
+    # wrap JSON responses as {status, data, error}
+    response_envelope: bool = os.getenv("RESPONSE_ENVELOPE", True)
+    # listing settings
+    list_count_cache_ttl: int = os.getenv("LIST_COUNT_CACHE_TTL", 30)
+    # stock reservation settings
+    cart_reservation_ttl: int = os.getenv("CART_RESERVATION_TTL", 900)
+    reservation_sweep_interval: int = os.getenv("RESERVATION_SWEEP_INTERVAL", 60)
+    # route new orders from a periodic batch job instead of one task per order
+    route_orders_in_batches: bool = os.getenv("ROUTE_ORDERS_IN_BATCHES", False)
+    order_routing_cron: str = os.getenv("ORDER_ROUTING_CRON", "* * * * *")
+    order_routing_batch_size: int = os.getenv("ORDER_ROUTING_BATCH_SIZE", 1000)
+    # seconds an order waits before batching, so checkouts still committing
+    # are never skipped by the watermark
+    order_routing_settle_time: int = os.getenv("ORDER_ROUTING_SETTLE_TIME", 10)
+    # seconds an authenticated principal is reused before it is read again
+    principal_cache_ttl: int = os.getenv("PRINCIPAL_CACHE_TTL", 30)
+    # bcrypt cost for new hashes; older hashes are upgraded on the next login
+    password_hash_rounds: int = os.getenv("PASSWORD_HASH_ROUNDS", 12)
+    password_hash_workers: int = os.getenv("PASSWORD_HASH_WORKERS", 4)
+    # where login sessions live: database or memory (single process only)
+    auth_session_store: str = os.getenv("AUTH_SESSION_STORE", "database")
+    auth_session_cleanup_interval: int = os.getenv(
+        "AUTH_SESSION_CLEANUP_INTERVAL", 3600
+    )
+    # recently verified tokens kept by digest; a size of 0 turns it off
+    jwt_verify_cache_size: int = os.getenv("JWT_VERIFY_CACHE_SIZE", 10000)
+    jwt_verify_cache_ttl: int = os.getenv("JWT_VERIFY_CACHE_TTL", 60)
+    # embed staff permission names in access tokens so admin routes skip the db
+    jwt_permission_claim: bool = os.getenv("JWT_PERMISSION_CLAIM", False)
 
     def get_access_expires_time(self):
         return datetime.timedelta(seconds=self.access_token_expire_time)
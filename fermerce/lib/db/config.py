@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from tortoise import connections
 from tortoise.contrib.fastapi import register_tortoise
 from fermerce.core.settings import config
 
@@ -11,3 +12,7 @@ def register_tortoise_to_fastapi(app: FastAPI):
         generate_schemas=True,
         add_exception_handlers=True,
     )
+
+
+def is_postgres() -> bool:
+    return connections.get("default").capabilities.dialect == "postgres"
@@ -104,3 +104,16 @@ class ServerError(HTTPException):
             headers=headers,
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
+
+
+class ServiceUnavailableError(HTTPException):
+    def __init__(
+        self,
+        detail: t.Any = "Service is temporarily unavailable, please try again",
+        headers: t.Optional[t.Dict[str, t.Any]] = None,
+    ) -> None:
+        super().__init__(
+            detail=detail,
+            headers=headers,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
@@ -1,76 +1,87 @@
+import json
 import typing as t
-from fastapi import Request, status
-from fastapi.responses import JSONResponse, Response
-from fastapi.concurrency import iterate_in_threadpool
+from fastapi import status
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
-async def transform(s: t.Union[str, bytearray, bytes], status_code: int):
-    import json
-
-    response_data = dict(status=status_code, data=None, error=None)
-    if status_code <= status.HTTP_226_IM_USED:
-        try:
-            data: dict = json.loads(s)
-            if isinstance(data, dict) and len(list(data.keys())) == 1:
-                response_data["data"] = data
-                # response_data["data"] = ",".join(list(data.values()))
-            else:
-                response_data["data"] = data
-        except Exception:
-            response_data["data"] = s
-            return response_data
-        finally:
-            return response_data
-
-    if status_code == status.HTTP_422_UNPROCESSABLE_ENTITY:
-        try:
-            data: dict = json.loads(s)
-            response_data["error"] = {
-                k.get("loc")[-1]: k.get("msg") for k in data["detail"]
-            }
-        except Exception:
-            response_data["error"] = s
-        finally:
-            return response_data
+def get_error(body: bytes, status_code: int) -> t.Any:
     if status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
-        response_data["error"] = "Internal Server Error, please try again"
-        return response_data
-    if status_code >= status.HTTP_400_BAD_REQUEST:
+        return "Internal Server Error, please try again"
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body.decode(errors="replace")
+    if status_code == status.HTTP_422_UNPROCESSABLE_ENTITY:
         try:
-            data: dict = json.loads(s)
-            if len(list(data.keys())) == 1:
-                response_data["error"] = ",".join(list(data.values()))
-        except Exception:
-            response_data["error"] = s
-        finally:
-            return response_data
-    return response_data
+            return {k.get("loc")[-1]: k.get("msg") for k in data["detail"]}
+        except (KeyError, TypeError, IndexError, AttributeError):
+            return data
+    if isinstance(data, dict) and len(data) == 1:
+        value = next(iter(data.values()))
+        return value if isinstance(value, str) else data
+    return data
 
 
-async def response_data_transformer(request: Request, call_next):
-    response: Response = await call_next(request)
-    try:
-        content_type: str = str(
-            response.headers.get("content-type", None)
-        ).lower()
-        exclude_url: str = str(request.url).split("/")[-1].lower()
+def envelope(body: bytes, status_code: int) -> bytes:
+    """Wrap a JSON body in ``{status, data, error}``.
+
+    Successful bodies are already valid JSON, so they are spliced in as bytes
+    rather than parsed and serialized again.
+    """
+    if status_code < status.HTTP_400_BAD_REQUEST:
+        return b'{"status":%d,"data":%s,"error":null}' % (status_code, body or b"null")
+    error = json.dumps(get_error(body, status_code), separators=(",", ":"))
+    return b'{"status":%d,"data":null,"error":%s}' % (status_code, error.encode())
+
+
+class ResponseEnvelopeMiddleware:
+    """Pure ASGI middleware putting JSON responses in the standard envelope.
+
+    Other content types, bodiless responses and the excluded paths stream
+    through untouched.
+    """
+
+    def __init__(
+        self, app: ASGIApp, exclude_paths: t.Iterable[str] = ("/openapi.json",)
+    ) -> None:
+        self.app = app
+        self.exclude_paths = tuple(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         if (
-            content_type.split(";")[0] == "text/html"
-            or exclude_url == "openapi.json"
+            scope["type"] != "http"
+            or scope["method"] == "HEAD"
+            or scope["path"].endswith(self.exclude_paths)
         ):
-            return response
-        response_body = [chunk async for chunk in response.body_iterator]
-        response.body_iterator = iterate_in_threadpool(iter(response_body))
-        data = await transform(
-            s=response_body[0].decode(),
-            status_code=response.status_code,
-        )
+            await self.app(scope, receive, send)
+            return
+
+        start: t.Optional[Message] = None
+        chunks: t.List[bytes] = []
 
-        return JSONResponse(
-            status_code=response.status_code,
-            content=data,
-            media_type=response.media_type,
-        )
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if content_type.split(";")[0].strip() == "application/json" and (
+                    message["status"]
+                    not in (status.HTTP_204_NO_CONTENT, status.HTTP_304_NOT_MODIFIED)
+                ):
+                    # held back until the body is complete, for its new length
+                    start = message
+                    return
+            elif message["type"] == "http.response.body" and start is not None:
+                chunks.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                body = envelope(b"".join(chunks), start["status"])
+                headers = MutableHeaders(raw=start["headers"])
+                headers["content-length"] = str(len(body))
+                await send(start)
+                await send({"type": "http.response.body", "body": body})
+                return
+            await send(message)
 
-    except Exception:
-        return response
+        await self.app(scope, receive, send_wrapper)
@@ -1,6 +1,12 @@
+import asyncio
+import random
+import time
 import typing as t
+from collections import defaultdict
 import httpx
 from fermerce.core.settings import config
+from fermerce.lib.errors import error
+from fermerce.lib.utils.circuit_breaker import CircuitBreaker
 
 endpoint: t.Dict[str, t.Union[str, t.Dict[str, str]]] = {
     "transfers_recipient": {
@@ -19,6 +25,9 @@ endpoint: t.Dict[str, t.Union[str, t.Dict[str, str]]] = {
     "transfer": {
         # use this for creating single or add id_or_transfer_code to get single transfer data,
         "create": "transfer",
+        "list": "transfer",
+        # add id_or_transfer_code as path parameter
+        "fetch": "transfer",
         "bulk_create": "transfer/bulk",
         "validate": "transfer/finalize_transfer",
         # add reference id as path parameter,
@@ -31,19 +40,165 @@ endpoint: t.Dict[str, t.Union[str, t.Dict[str, str]]] = {
 }
 
 
+# read timeouts for calls Paystack is known to answer slowly, by path prefix
+endpoint_timeouts: t.Dict[str, float] = {
+    "transfer/bulk": 30,
+    "transferrecipient/bulk": 30,
+    "transaction/charge_authorization": 20,
+}
+
+# failures worth another attempt; connect errors are safe for any method since
+# the request never reached Paystack
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
 class Client:
+    """Shared Paystack client, opened and closed with the application.
+
+    Calls go through one pooled ``httpx.AsyncClient``. Idempotent calls are
+    retried with jittered backoff, and a circuit breaker fails calls fast with
+    ``ServiceUnavailableError`` while Paystack keeps erroring. Latency and
+    errors are counted per path in ``metrics``.
+    """
+
     def __init__(
         self,
         base_url: str = config.base_payment_url,
+        transport: t.Optional[httpx.AsyncBaseTransport] = None,
     ):
         self.base_url = base_url
-        self.request = httpx.AsyncClient(base_url=self.base_url)
-        self.request.headers.update(
-            {
+        self.transport = transport
+        self.request: t.Optional[httpx.AsyncClient] = None
+        self.breaker = CircuitBreaker(
+            failure_threshold=config.payment_failure_threshold,
+            reset_timeout=config.payment_reset_timeout,
+        )
+        self.metrics: t.Dict[str, t.Dict[str, float]] = defaultdict(
+            lambda: dict(calls=0, errors=0, retries=0, total_ms=0.0, max_ms=0.0)
+        )
+
+    async def open(self) -> None:
+        if self.request is not None:
+            return
+        self.request = httpx.AsyncClient(
+            base_url=self.base_url,
+            transport=self.transport,
+            timeout=httpx.Timeout(
+                config.payment_timeout, connect=config.payment_connect_timeout
+            ),
+            limits=httpx.Limits(
+                max_connections=config.payment_max_connections,
+                max_keepalive_connections=config.payment_max_keepalive,
+            ),
+            headers={
                 "Authorization": f"Bearer {config.payment_secret_key}",
                 "Content-type": "application/json",
-            }
+            },
         )
 
+    async def close(self) -> None:
+        if self.request is not None:
+            await self.request.aclose()
+            self.request = None
+
+    def get_timeout(self, url: str) -> t.Optional[httpx.Timeout]:
+        for prefix, read_timeout in endpoint_timeouts.items():
+            if url.startswith(prefix):
+                return httpx.Timeout(
+                    config.payment_timeout,
+                    connect=config.payment_connect_timeout,
+                    read=read_timeout,
+                )
+        return None
+
+    def record(self, url: str, started: float, failed: bool) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats = self.metrics[url.split("?")[0]]
+        stats["calls"] += 1
+        stats["errors"] += int(failed)
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def get_metrics(self) -> t.Dict[str, t.Any]:
+        paths = {}
+        for path, stats in self.metrics.items():
+            average = stats["total_ms"] / stats["calls"] if stats["calls"] else 0
+            paths[path] = dict(stats, avg_ms=average)
+        return dict(circuit=self.breaker.state, paths=paths)
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        idempotent: t.Optional[bool] = None,
+        **kwargs: t.Any,
+    ) -> t.Any:
+        """Send a request and return the decoded json body.
+
+        Paystack answers client errors with a json ``status``/``message`` body,
+        so other responses are returned for the caller to inspect. ``idempotent``
+        defaults to True for GET, PUT and DELETE.
+        """
+        if self.request is None:
+            await self.open()
+        if idempotent is None:
+            idempotent = method.upper() in ("GET", "PUT", "DELETE")
+        timeout = self.get_timeout(url)
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        attempt = 0
+        while True:
+            trial = self.breaker.state == "half_open"
+            if not self.breaker.allow():
+                raise error.ServiceUnavailableError(
+                    "Payment service is temporarily unavailable"
+                )
+            started = time.perf_counter()
+            failure = None
+            try:
+                try:
+                    response = await self.request.request(method, url, **kwargs)
+                except httpx.TransportError as exc:
+                    failure = exc
+                    retryable = idempotent or isinstance(exc, CONNECT_ERRORS)
+                else:
+                    if response.status_code not in RETRYABLE_STATUS:
+                        self.breaker.record_success()
+                        self.record(url, started, failed=response.status_code >= 400)
+                        try:
+                            return response.json()
+                        except ValueError:
+                            raise error.ServerError(
+                                "Invalid response from payment service"
+                            )
+                    retryable = idempotent
+                self.breaker.record_failure()
+                self.record(url, started, failed=True)
+                if not retryable or attempt >= config.payment_max_retries:
+                    raise error.ServiceUnavailableError(
+                        "Payment service is temporarily unavailable"
+                    ) from failure
+            finally:
+                if trial:
+                    # a cancelled or crashed trial must not keep the circuit shut
+                    self.breaker.end_trial()
+            attempt += 1
+            self.metrics[url.split("?")[0]]["retries"] += 1
+            # full jitter keeps retries from many workers from arriving together
+            await asyncio.sleep(random.uniform(0, 0.2 * 2**attempt))
+
+    async def get(self, url: str, **kwargs: t.Any) -> t.Any:
+        return await self.send("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: t.Any) -> t.Any:
+        return await self.send("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: t.Any) -> t.Any:
+        return await self.send("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: t.Any) -> t.Any:
+        return await self.send("DELETE", url, **kwargs)
+
 
 client = Client()
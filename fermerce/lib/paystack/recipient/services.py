@@ -5,62 +5,54 @@ from fermerce.lib.errors import error
 
 
 async def create_trans_recipient(data_in: schemas.ITransactionRecipientIn):
+    response = await client.post(
+        url=endpoint.get("transfers_recipient").get("create"),
+        json=data_in.dict(),
+    )
     try:
-        response = await client.request.post(
-            url=endpoint.get("transfers_recipient").get("create"),
-            json=data_in.dict(),
-        )
-        data = schemas.TransferRecipientResponse(**response.json())
-        return data
-    except Exception:
+        return schemas.TransferRecipientResponse(**response)
+    except ValueError:
         raise error.ServerError("Error creating payment recipient")
 
 
 async def update_trans_recipient(
     data_in: schemas.ITransactionRecipientIn, recipient_code: str
 ):
+    response = await client.put(
+        url=f'{endpoint.get("transfers_recipient").get("create")}/{recipient_code}',
+        json=data_in.dict(),
+    )
     try:
-        response = await client.request.post(
-            url=f'{endpoint.get("transfers_recipient").get("create")}/{recipient_code}',
-            json=data_in.dict(),
-        )
-        data = schemas.TransferRecipientResponse(response.json())
-        return data
-    except Exception:
+        return schemas.TransferRecipientResponse(**response)
+    except ValueError:
         raise error.ServerError("Error updating payment recipient")
 
 
 async def create_bulk_trans_recipient(
     data_in: t.List[schemas.ITransactionRecipientIn],
 ):
+    response = await client.post(
+        url=endpoint.get("transfers_recipient").get("create"),
+        json=data_in.dict(),
+    )
     try:
-        response = await client.request.post(
-            url=endpoint.get("transfers_recipient").get("create"),
-            json=data_in.dict(),
-        )
-        data = schemas.TransferRecipientBulkResponse(response.json())
-        return data
-    except Exception:
+        return schemas.TransferRecipientBulkResponse(**response)
+    except ValueError:
         raise error.ServerError("Error creating payment request")
 
 
 async def get_trans_recipient(recipient_code: str):
+    response = await client.get(
+        url=f'{endpoint.get("transfers_recipient").get("create")}/{recipient_code}'
+    )
     try:
-        response = await client.request.post(
-            url=f'{endpoint.get("transfers_recipient").get("create")}/{recipient_code}'
-        )
-        data = schemas.TransferRecipientResponse(response.json())
-        return data
-    except Exception:
+        return schemas.TransferRecipientResponse(**response)
+    except ValueError:
         raise error.ServerError("Error getting payment recipient information")
 
 
 async def delete_trans_recipient(recipient_code: str):
-    try:
-        response = await client.request.post(
-            url=f'{endpoint.get("transfers_recipient").get("create")}/{recipient_code}'
-        )
-        data: t.Dict[t.Dict] = response.json()
-        return data
-    except Exception:
-        raise error.ServerError("Error deleting payment recipient")
+    data: t.Dict[t.Dict] = await client.delete(
+        url=f'{endpoint.get("transfers_recipient").get("create")}/{recipient_code}'
+    )
+    return data
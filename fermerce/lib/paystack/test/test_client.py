@@ -0,0 +1,129 @@
+import asyncio
+import typing as t
+import httpx
+import pytest
+from fermerce.core.settings import config
+from fermerce.lib.errors import error
+from fermerce.lib.paystack import paystack_base
+from fermerce.lib.paystack.transfer import services as transfer_services
+
+
+class Upstream:
+    """Answers each request with the next queued status, then 200."""
+
+    def __init__(self, *statuses: t.Union[int, Exception]) -> None:
+        self.statuses = list(statuses)
+        self.requests: t.List[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        outcome = self.statuses.pop(0) if self.statuses else 200
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, json={"status": outcome < 400})
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(config, "payment_max_retries", 2)
+    monkeypatch.setattr(config, "payment_failure_threshold", 3)
+    monkeypatch.setattr(config, "payment_reset_timeout", 30)
+    monkeypatch.setattr(paystack_base.random, "uniform", lambda low, high: 0)
+
+
+def make_client(upstream: Upstream) -> paystack_base.Client:
+    return paystack_base.Client(
+        base_url="https://paystack.test/",
+        transport=httpx.MockTransport(upstream),
+    )
+
+
+async def test_get_is_retried_until_it_succeeds():
+    upstream = Upstream(503, 502)
+    client = make_client(upstream)
+    assert await client.get("transfer") == {"status": True}
+    assert len(upstream.requests) == 3
+    stats = client.get_metrics()["paths"]["transfer"]
+    assert (stats["calls"], stats["errors"], stats["retries"]) == (3, 2, 2)
+    await client.close()
+
+
+async def test_post_is_not_retried_after_reaching_paystack():
+    upstream = Upstream(503)
+    client = make_client(upstream)
+    with pytest.raises(error.ServiceUnavailableError):
+        await client.post("transfer", json={})
+    assert len(upstream.requests) == 1
+    await client.close()
+
+
+async def test_post_is_retried_when_the_connection_failed():
+    upstream = Upstream(httpx.ConnectError("refused"))
+    client = make_client(upstream)
+    assert await client.post("transfer", json={}) == {"status": True}
+    assert len(upstream.requests) == 2
+    await client.close()
+
+
+async def test_client_errors_are_returned_without_retrying():
+    upstream = Upstream(400)
+    client = make_client(upstream)
+    assert await client.get("transfer") == {"status": False}
+    assert len(upstream.requests) == 1
+    assert client.get_metrics()["paths"]["transfer"]["errors"] == 1
+    assert client.breaker.state == "closed"
+    await client.close()
+
+
+async def test_breaker_opens_then_lets_one_trial_through(monkeypatch):
+    upstream = Upstream(503, 503, 503)
+    client = make_client(upstream)
+    with pytest.raises(error.ServiceUnavailableError):
+        await client.get("transfer")
+    assert client.breaker.state == "open"
+    with pytest.raises(error.ServiceUnavailableError):
+        await client.get("transfer")
+    assert len(upstream.requests) == 3
+
+    monkeypatch.setattr(client.breaker, "opened_at", 0.0)
+    assert client.breaker.state == "half_open"
+    assert await client.get("transfer") == {"status": True}
+    assert client.breaker.state == "closed"
+    await client.close()
+
+
+async def test_cancelled_trial_does_not_keep_the_circuit_shut():
+    started = asyncio.Event()
+
+    async def hang(request: httpx.Request) -> httpx.Response:
+        started.set()
+        await asyncio.sleep(60)
+
+    client = paystack_base.Client(
+        base_url="https://paystack.test/", transport=httpx.MockTransport(hang)
+    )
+    client.breaker.failures = config.payment_failure_threshold
+    assert client.breaker.state == "half_open"
+    trial = asyncio.create_task(client.get("transfer"))
+    await started.wait()
+    assert not client.breaker.allow()
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+    assert client.breaker.allow()
+    await client.close()
+
+
+async def test_transfer_reads_use_get(monkeypatch):
+    upstream = Upstream()
+    client = make_client(upstream)
+    monkeypatch.setattr(transfer_services, "client", client)
+    await transfer_services.list_transfer()
+    await transfer_services.get_transfer("TRF_1")
+    await transfer_services.verify_transfer("TRF_1")
+    assert [(r.method, r.url.path) for r in upstream.requests] == [
+        ("GET", "/transfer"),
+        ("GET", "/transfer/TRF_1"),
+        ("GET", "/transfer/verify/TRF_1"),
+    ]
+    await client.close()
@@ -11,7 +11,7 @@ class IMetaData(pyd.BaseModel):
     pageCount: int
 
 
-class ITransferValidatedIn(pyd.pyd.BaseModel):
+class ITransferValidatedIn(pyd.BaseModel):
     otp: str
     transfer_code: str
 
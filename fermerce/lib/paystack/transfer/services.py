@@ -6,69 +6,48 @@ from fermerce.lib.errors import error
 
 # Create Transfers
 async def create_transfer(data_in: schemas.ITransferDataIn):
-    try:
-        response = await client.request.post(
-            url=endpoint.get("transfer").get("create"), json=data_in.dict()
-        )
-        data: schemas.ICreateTransferResponse = response.json()
-        return data
-    except Exception:
-        raise error.ServerError("Error creating transfer")
+    data: schemas.ICreateTransferResponse = await client.post(
+        url=endpoint.get("transfer").get("create"), json=data_in.dict()
+    )
+    return data
 
 
 async def finalize_transfer(data_in: schemas.ITransferValidatedIn):
-    try:
-        response = await client.request.post(
-            url=f'{endpoint.get("transfer").get("validate")}',
-            json=data_in.dict(),
-        )
-        data: schemas.ICreateTransferResponse = response.json()
-        return data
-    except Exception:
-        raise error.ServerError("Error validating transfer")
+    data: schemas.ICreateTransferResponse = await client.post(
+        url=f'{endpoint.get("transfer").get("validate")}',
+        json=data_in.dict(),
+    )
+    return data
 
 
 async def create_bulk_transfer(
     data_in: t.List[t.List[schemas.ITransferDataIn]],
 ):
-    try:
-        response = await client.request.post(
-            url=endpoint.get("transfer").get("bulk"), json=data_in.dict()
-        )
-        data: schemas.ICreateTransferListResponse = response.json()
-        return data
-    except Exception:
-        raise error.ServerError("Error creating bulk transfer")
+    data: schemas.ICreateTransferListResponse = await client.post(
+        url=endpoint.get("transfer").get("bulk"), json=data_in.dict()
+    )
+    return data
 
 
 async def list_transfer():
-    try:
-        response = await client.request.post(
-            url=endpoint.get("transfer").get("create")
-        )
-        data: schemas.ITransferListResponse = response.json()
-        return data
-    except Exception:
-        raise error.ServerError("Error listing payment recipient")
+    data: schemas.ITransferListResponse = await client.get(
+        url=endpoint.get("transfer").get("list")
+    )
+    return data
 
 
 async def get_transfer(transfer_code: str):
-    try:
-        response = await client.request.post(
-            url=f'{endpoint.get("transfers_recipient").get("create")}/{transfer_code}'
-        )
-        data: schemas.ICreateTransferResponse = response.json()
-        return data
-    except Exception:
-        raise error.ServerError("Error getting payment recipient information")
+    data: schemas.ICreateTransferResponse = await client.get(
+        url=f'{endpoint.get("transfer").get("fetch")}/{transfer_code}'
+    )
+    return data
 
 
 async def verify_transfer(transfer_code: str):
+    response = await client.get(
+        url=f'{endpoint.get("transfer").get("verify")}/{transfer_code}'
+    )
     try:
-        response = await client.request.post(
-            url=f'{endpoint.get("transfer").get("verify")}/{transfer_code}'
-        )
-        data = schemas.ICreateTransferResponse(**response.json())
-        return data
-    except Exception:
-        raise error.ServerError("Error deleting payment recipient")
+        return schemas.ICreateTransferResponse(**response)
+    except ValueError:
+        raise error.ServerError("Error verifying transfer")
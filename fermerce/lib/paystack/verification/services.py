@@ -4,33 +4,26 @@ from fermerce.lib.errors import error
 
 
 async def verify_account_number(data_in: schemas.IAccountResolveIn):
-    # try:
-    response = await client.request.get(
+    response = await client.get(
         url=endpoint.get("bank").get("resolve"),
         params={
             "account_number": data_in.account_number,
             "bank_code": data_in.bank_code,
         },
     )
-    data = schemas.IAccountResolveResponse(**response.json())
-    return data
-
-
-# except Exception:
-#     raise error.BadDataError(detail="Error validating account")
+    try:
+        return schemas.IAccountResolveResponse(**response)
+    except ValueError:
+        raise error.BadDataError(detail="Error validating account")
 
 
 async def validate_account(data_in: schemas.IBankAccountValidateIn):
-    # try:
-    response = await client.request.post(
+    response = await client.post(
         url=endpoint.get("bank").get("validate"),
         json=data_in.dict(),
+        idempotent=True,
     )
-
-    data = schemas.IAccountVerificationResponse(**response.json())
-    print(response.json())
-    return data
-
-
-# except Exception as e:
-#     raise error.BadDataError(detail="Error refunding transaction")
+    try:
+        return schemas.IAccountVerificationResponse(**response)
+    except ValueError:
+        raise error.BadDataError(detail="Error validating account")
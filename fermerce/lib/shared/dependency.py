@@ -1,3 +1,4 @@
+import asyncio
 import typing as t
 import uuid
 import jose
@@ -6,8 +7,10 @@ from fastapi.security import OAuth2PasswordBearer
 
 # from fermerce.app.permission.model import Permission
 from fermerce.lib.errors import error
+from fermerce.core.services.serializer import get_serializer
 from fermerce.core.settings import config as base_config
-from fermerce.lib.utils import get_api_prefix
+from fermerce.lib.utils import get_api_prefix, token_verifier
+from fermerce.lib.utils.ttl_cache import TTLCache
 from tortoise.models import Model
 
 
@@ -28,11 +31,7 @@ class AppAuth:
         token: str = Depends(Oauth_schema),
     ):
         try:
-            payload: dict = jose.jwt.decode(
-                token=token,
-                key=base_config.secret_key,
-                algorithms=[base_config.algorithm],
-            )
+            payload: dict = token_verifier.access_tokens().decode(token)
 
             if not payload.get("user_id", None):
                 raise AppAuth.credentials_exception
@@ -47,11 +46,7 @@ class AppAuth:
         )
     ):
         try:
-            payload: dict = jose.jwt.decode(
-                token=x_api_key,
-                key=base_config.secret_key,
-                algorithms=[base_config.algorithm],
-            )
+            payload: dict = token_verifier.access_tokens().decode(x_api_key)
 
             if not payload.get("api_key", None):
                 raise AppAuth.credentials_exception
@@ -64,38 +59,63 @@ ModelType = t.TypeVar("ModelType", bound=Model)
 
 
 class AppWrite(t.Generic[ModelType]):
-    def __init__(self, model: t.Type[ModelType]) -> None:
+    """Resolves the authenticated principal behind a token.
+
+    The principal is the model loaded with its own columns only, minus redacted
+    ones, plus a ``roles`` set from ``roles_loader``. It is cached per id for a
+    short ttl and is a partial instance, so it cannot be saved by accident;
+    handlers that write to the account use ``current_user`` instead.
+    """
+
+    def __init__(
+        self,
+        model: t.Type[ModelType],
+        roles_loader: t.Optional[
+            t.Callable[[uuid.UUID], t.Awaitable[t.Iterable[str]]]
+        ] = None,
+    ) -> None:
         self.model = model
+        self.roles_loader = roles_loader
+        self.principal_fields = get_serializer(model).fields
+        self.principals = TTLCache(maxsize=10000, ttl=base_config.principal_cache_ttl)
+
+    def invalidate(self, user_id: t.Union[uuid.UUID, str]) -> None:
+        self.principals.delete(str(user_id))
+
+    async def load_principal(self, user_id: uuid.UUID) -> t.Optional[ModelType]:
+        query = self.model.get_or_none(id=user_id).only(*self.principal_fields)
+        if not self.roles_loader:
+            principal = await query
+            roles = ()
+        else:
+            principal, roles = await asyncio.gather(query, self.roles_loader(user_id))
+        if principal:
+            principal.roles = frozenset(roles)
+        return principal
+
+    @staticmethod
+    def check_access(get_user: t.Optional[ModelType]) -> ModelType:
+        if not get_user:
+            raise error.UnauthorizedError("Authorization failed")
+        if not get_user.is_verified or get_user.is_archived or get_user.is_suspended:
+            raise error.ForbiddenError("Authorization failed")
+        return get_user
 
     async def get_user_data(
         self,
         user_id: uuid.UUID,
-    ) -> t.Union[ModelType, None]:
-        if user_id:
-            get_user = self.model.get_or_none(id=user_id)
-            to_pre_fetch = set.union(
-                self.model._meta.m2m_fields,
-                self.model._meta.fk_fields,
-                self.model._meta.o2o_fields,
-                self.model._meta.backward_o2o_fields,
-                self.model._meta.backward_fk_fields,
-            )
-            get_user = get_user.prefetch_related(*to_pre_fetch)
-            get_user = await get_user
-            if (
-                get_user
-                and get_user.is_verified
-                and not get_user.is_archived
-                and not get_user.is_suspended
-            ):
-                if get_user:
-                    return get_user
-
-                raise error.ForbiddenError("Authorization failed")
-        return error.UnauthorizedError("Authorization failed")
-
-    async def current_user(self, user_id: str = None):
-        user: ModelType = await self.get_user_data(user_id=user_id)
-        if user:
-            return user
-        raise error.UnauthorizedError("Authorization failed")
+    ) -> ModelType:
+        if not user_id:
+            raise error.UnauthorizedError("Authorization failed")
+        get_user = self.principals.get(str(user_id))
+        if get_user is None:
+            get_user = await self.load_principal(user_id)
+            if get_user:
+                self.principals.set(str(user_id), get_user)
+        return self.check_access(get_user)
+
+    async def current_user(self, user_id: str = None) -> ModelType:
+        """The full, saveable model for handlers that update the account."""
+        if not user_id:
+            raise error.UnauthorizedError("Authorization failed")
+        return self.check_access(await self.model.get_or_none(id=user_id))
@@ -1,13 +1,12 @@
 from email import encoders
 from email.mime.base import MIMEBase
 import os
-import smtplib
 from email.mime import multipart, text
 from email.utils import formataddr
 from typing import Optional, List, Union
 import pydantic
 from fermerce.lib.shared.mail import exception
-from fermerce.lib.shared.mail import template_finder
+from fermerce.lib.shared.mail import template_finder, transport
 from fermerce.core.settings import config
 
 from fermerce.lib.errors import error
@@ -57,10 +56,10 @@ class Mailer(template_finder.MailTemplate):
                 )
                 self.attachments.append(attachment)
 
-    def send_mail(
+    def build_message(
         self,
         email: Union[List[pydantic.EmailStr], pydantic.EmailStr],
-    ):
+    ) -> multipart.MIMEMultipart:
         message = multipart.MIMEMultipart()
         if isinstance(email, list):
             message["To"] = ", ".join(email)
@@ -84,15 +83,17 @@ class Mailer(template_finder.MailTemplate):
         if self.attachments:
             for attachment in self.attachments:
                 message.attach(attachment)
+        return message
+
+    async def send_mail(
+        self,
+        email: Union[List[pydantic.EmailStr], pydantic.EmailStr],
+    ):
+        message = self.build_message(email)
+        recipients = email if isinstance(email, list) else [email]
         try:
-            with smtplib.SMTP_SSL(
-                host=self.email_host, port=self.email_server_port
-            ) as smtp:
-                smtp.login(
-                    user=self.admin_email,
-                    password=self.admin_password,
-                )
-                smtp.sendmail(from_email, email, message.as_string())
-            pass
+            await transport.get_outbox().send(
+                (self.admin_email, recipients, message.as_string())
+            )
         except Exception:
             raise error.ServerError("Could not connect to mail server")
@@ -1,32 +1,89 @@
-from typing import Optional
+from typing import Dict, Optional
 import jinja2 as jj2
 from jinja2.exceptions import TemplateNotFound
 
 import pydantic
 
+from fermerce.core.settings import config
 from fermerce.lib.shared.mail.exception import (
     EmailTemplateNotFoundError,
 )
 
 
+class TemplateRegistry:
+    """Email templates of one folder, compiled once and kept for the process."""
+
+    def __init__(
+        self,
+        template_folder: pydantic.DirectoryPath,
+        bytecode_cache_dir: Optional[str] = None,
+    ) -> None:
+        self.template_folder = template_folder
+        self.env = jj2.Environment(
+            loader=jj2.FileSystemLoader(template_folder),
+            autoescape=jj2.select_autoescape(),
+            auto_reload=False,
+            bytecode_cache=(
+                jj2.FileSystemBytecodeCache(bytecode_cache_dir)
+                if bytecode_cache_dir
+                else None
+            ),
+        )
+        self.templates: Dict[str, jj2.Template] = {}
+
+    def load(self) -> None:
+        for name in self.env.list_templates():
+            self.templates[name] = self.env.get_template(name)
+
+    def get(self, template_name: str) -> jj2.Template:
+        template = self.templates.get(template_name)
+        if template is None:
+            try:
+                template = self.env.get_template(template_name)
+            except TemplateNotFound:
+                raise EmailTemplateNotFoundError(
+                    f"Template not found in {self.template_folder}"
+                )
+            self.templates[template_name] = template
+        return template
+
+    def render(self, template_name: str, context: Optional[dict] = None) -> str:
+        return self.get(template_name).render(**(context or {}))
+
+
+_registries: Dict[str, TemplateRegistry] = {}
+
+
+def get_registry(
+    template_folder: pydantic.DirectoryPath = config.email_template_dir,
+) -> TemplateRegistry:
+    registry = _registries.get(str(template_folder))
+    if registry is None:
+        registry = TemplateRegistry(
+            template_folder, config.email_template_cache_dir or None
+        )
+        _registries[str(template_folder)] = registry
+    return registry
+
+
+def preload() -> None:
+    get_registry().load()
+
+
+def render(template_name: str, context: Optional[dict] = None) -> str:
+    return get_registry().render(template_name, context)
+
+
 class MailTemplate:
     def __init__(self, template_folder: pydantic.DirectoryPath = None) -> None:
         self.template = None
-        try:
-            self.template_folder = template_folder
-            self.env: jj2.Environment = jj2.Environment(
-                loader=jj2.FileSystemLoader(self.template_folder),
-                autoescape=jj2.select_autoescape(),
-            )
-        except TemplateNotFound:
-            raise EmailTemplateNotFoundError(
-                f"Template not found in {self.template_folder}"
-            )
+        self.template_folder = template_folder
 
     def render(
         self,
         template_name: str,
         context: Optional[dict] = {},
     ) -> str:
-        self.template = self.env.get_template(template_name)
+        registry = get_registry(self.template_folder or config.email_template_dir)
+        self.template = registry.get(template_name)
         return self.template.render(**context)
@@ -0,0 +1,208 @@
+import asyncio
+import smtplib
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from fermerce.core.settings import config
+
+# (sender, recipients, message as string)
+Envelope = t.Tuple[str, t.List[str], str]
+
+
+class SMTPPool:
+    """Authenticated SMTP connections kept open and reused across sends.
+
+    Each connection is used by one thread at a time; a batch of messages goes
+    over a single connection without logging in again. Connections idle for
+    longer than ``max_idle`` are checked with NOOP before reuse.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        size: int = 4,
+        use_ssl: bool = True,
+        timeout: float = 30,
+        max_idle: float = 60,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.executor = ThreadPoolExecutor(max_workers=size)
+        self.slots = asyncio.Semaphore(size)
+        self.idle: t.List[t.Tuple[smtplib.SMTP, float]] = []
+
+    def connect(self) -> smtplib.SMTP:
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        smtp = smtp_class(host=self.host, port=self.port, timeout=self.timeout)
+        if self.username and self.password:
+            smtp.login(user=self.username, password=self.password)
+        return smtp
+
+    def is_alive(self, smtp: smtplib.SMTP, last_used: float) -> bool:
+        if time.monotonic() - last_used < self.max_idle:
+            return True
+        try:
+            return smtp.noop()[0] == 250
+        except OSError:
+            return False
+
+    def deliver(
+        self,
+        idle: t.Optional[t.Tuple[smtplib.SMTP, float]],
+        envelopes: t.List[Envelope],
+    ) -> t.Tuple[t.Optional[smtplib.SMTP], t.List[t.Optional[Exception]]]:
+        """Send ``envelopes`` in order; runs in the pool's threads."""
+        smtp = None
+        if idle is not None:
+            if self.is_alive(*idle):
+                smtp = idle[0]
+            else:
+                self.discard(idle[0])
+        results: t.List[t.Optional[Exception]] = []
+        for sender, recipients, message in envelopes:
+            for attempt in range(2):
+                try:
+                    if smtp is None:
+                        smtp = self.connect()
+                    smtp.sendmail(sender, recipients, message)
+                    results.append(None)
+                    break
+                except smtplib.SMTPServerDisconnected as exc:
+                    failure = exc
+                except smtplib.SMTPException as exc:
+                    # refused by the server; the connection is still usable
+                    results.append(exc)
+                    break
+                except OSError as exc:
+                    failure = exc
+                # a dropped connection is retried once on a fresh one
+                self.discard(smtp)
+                smtp = None
+                if attempt:
+                    results.append(failure)
+        return smtp, results
+
+    def discard(self, smtp: t.Optional[smtplib.SMTP]) -> None:
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except OSError:
+            smtp.close()
+
+    async def send_many(
+        self, envelopes: t.List[Envelope]
+    ) -> t.List[t.Optional[Exception]]:
+        async with self.slots:
+            idle = self.idle.pop() if self.idle else None
+            loop = asyncio.get_running_loop()
+            smtp, results = await loop.run_in_executor(
+                self.executor, self.deliver, idle, envelopes
+            )
+            if smtp is not None:
+                self.idle.append((smtp, time.monotonic()))
+            return results
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self.idle:
+            smtp, _ = self.idle.pop()
+            await loop.run_in_executor(self.executor, self.discard, smtp)
+        self.executor.shutdown(wait=False)
+
+
+class MailOutbox:
+    """Group messages queued by concurrent tasks into batched sends.
+
+    ``send`` waits for its own message to go out, so tasks still see delivery
+    errors; messages queued within ``interval`` seconds of each other, up to
+    ``batch_size``, share a connection.
+    """
+
+    def __init__(self, pool: SMTPPool, batch_size: int, interval: float) -> None:
+        self.pool = pool
+        self.batch_size = batch_size
+        self.interval = interval
+        self.queue: "asyncio.Queue[t.Tuple[Envelope, asyncio.Future]]" = asyncio.Queue()
+        self.worker: t.Optional[asyncio.Task] = None
+        self.flushing: t.Set[asyncio.Task] = set()
+
+    async def send(self, envelope: Envelope) -> None:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((envelope, future))
+        if self.worker is None or self.worker.done():
+            self.worker = asyncio.create_task(self.drain())
+        await future
+
+    async def drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # flush without waiting so further batches use other connections
+            task = asyncio.create_task(self.flush(batch))
+            self.flushing.add(task)
+            task.add_done_callback(self.flushing.discard)
+
+    async def flush(self, batch: t.List[t.Tuple[Envelope, asyncio.Future]]) -> None:
+        try:
+            results = await self.pool.send_many([envelope for envelope, _ in batch])
+        except Exception as exc:
+            results = [exc] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if result is None:
+                future.set_result(None)
+            else:
+                future.set_exception(result)
+
+    async def close(self) -> None:
+        if self.worker is not None:
+            self.worker.cancel()
+        await self.pool.close()
+
+
+_outbox: t.Optional[MailOutbox] = None
+
+
+def get_outbox() -> MailOutbox:
+    global _outbox
+    if _outbox is None:
+        pool = SMTPPool(
+            host=config.email_host,
+            port=config.email_port,
+            username=config.admin_email,
+            password=config.admin_password,
+            size=config.email_pool_size,
+            use_ssl=config.email_use_ssl,
+        )
+        _outbox = MailOutbox(
+            pool,
+            batch_size=config.email_batch_size,
+            interval=config.email_batch_interval,
+        )
+    return _outbox
+
+
+async def close_outbox() -> None:
+    global _outbox
+    if _outbox is not None:
+        await _outbox.close()
+        _outbox = None
@@ -0,0 +1,48 @@
+import time
+
+
+class CircuitBreaker:
+    """Stop calling a failing upstream for ``reset_timeout`` seconds.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    ``allow`` refuses calls; once the timeout passes a single trial call is let
+    through, and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.failures < self.failure_threshold:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def end_trial(self) -> None:
+        """Let the next call through if the trial ended without an outcome."""
+        self._trial_running = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_running = False
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
@@ -1,6 +1,19 @@
+import asyncio
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
 from passlib import context
+from fermerce.core.settings import config
 
-pwd_context = context.CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = context.CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=config.password_hash_rounds,
+)
+# bcrypt releases the GIL, so hashes run in parallel here while the event
+# loop keeps serving requests
+hash_executor = ThreadPoolExecutor(
+    max_workers=config.password_hash_workers, thread_name_prefix="hasher"
+)
 
 
 class Hasher:
@@ -17,3 +30,24 @@ class Hasher:
         if password:
             return True
         return False
+
+    @staticmethod
+    async def hash_password_async(plaintext_password: str) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            hash_executor, Hasher.hash_password, plaintext_password
+        )
+
+    @staticmethod
+    async def verify_and_update(
+        plaintext_password: str, hashed_password: str
+    ) -> t.Tuple[bool, t.Optional[str]]:
+        """Check a password; also returns a new hash when the stored one uses
+        outdated parameters (scheme or rounds), else None."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            hash_executor,
+            pwd_context.verify_and_update,
+            plaintext_password,
+            hashed_password,
+        )
@@ -0,0 +1,31 @@
+import decimal
+import typing as t
+import orjson
+import pydantic
+from fastapi import responses
+
+
+def default(value: t.Any) -> t.Any:
+    # orjson handles uuid, datetime, date and enums itself
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, pydantic.BaseModel):
+        return value.dict()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ORJSONResponse(responses.ORJSONResponse):
+    """The application's default response, rendered with orjson.
+
+    Streaming and file endpoints opt out with ``response_class=Response`` on
+    their route, or by returning their own response object.
+    """
+
+    def render(self, content: t.Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=default,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
@@ -4,6 +4,7 @@ from fastapi import HTTPException, status
 from jose import JWTError
 from jose import jwt
 from fermerce.lib.errors import error
+from fermerce.lib.utils import token_verifier
 from fermerce.core.settings import config
 
 
@@ -11,16 +12,10 @@ class JWTAUTH:
     @staticmethod
     def data_decoder(encoded_data: str, secret_key: str = None):
         try:
-            if not secret_key:
-                secret_key = config.refresh_secret_key
-            else:
-                secret_key = secret_key
-            payload = jwt.decode(
-                token=encoded_data,
-                key=secret_key,
-                algorithms=[config.algorithm],
+            verifier = token_verifier.get_verifier(
+                secret_key or config.refresh_secret_key
             )
-
+            payload = verifier.decode(encoded_data)
             if payload:
                 return payload
             raise error.UnauthorizedError("Invalid token provided")
@@ -46,10 +41,13 @@ class JWTAUTH:
                         + config.get_refresh_expires_time()
                     }
                 )
+            keys = token_verifier.get_verifier(
+                secret_key or config.refresh_secret_key, algorithm
+            ).keys
             encoded_data = jwt.encode(
                 claims=to_encode,
-                key=secret_key if secret_key else config.refresh_secret_key,
-                algorithm=algorithm if algorithm else config.algorithm,
+                key=keys.signing_key,
+                algorithm=keys.algorithm,
             )
             return encoded_data
         except JWTError:
@@ -79,12 +77,12 @@ class JWTAUTH:
         try:
             encode_jwt_refresh = jwt.encode(
                 claims=refresh_data,
-                key=config.refresh_secret_key,
+                key=token_verifier.refresh_tokens().keys.signing_key,
                 algorithm=config.algorithm,
             )
             encode_jwt_access = jwt.encode(
                 claims=access_data,
-                key=config.secret_key,
+                key=token_verifier.access_tokens().keys.signing_key,
                 algorithm=config.algorithm,
             )
             return encode_jwt_access, encode_jwt_refresh
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import time
+import typing as t
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from jose import JWTError, ExpiredSignatureError, jwk, jws
+from jose.backends.base import Key
+from jose.exceptions import JOSEError, JWKError
+from fermerce.core.settings import config
+from fermerce.lib.utils.ttl_cache import TTLCache
+
+
+class Ed25519Key(Key):
+    """EdDSA keys for python-jose, which only ships HMAC, RSA and EC keys."""
+
+    def __init__(self, key, algorithm: str) -> None:
+        if algorithm != "EdDSA":
+            raise JWKError(f"{algorithm} is not an EdDSA algorithm")
+        if isinstance(key, str):
+            key = key.encode()
+        if isinstance(key, bytes):
+            if b"PRIVATE" in key:
+                key = serialization.load_pem_private_key(key, password=None)
+            else:
+                key = serialization.load_pem_public_key(key)
+        if not isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+            raise JWKError("EdDSA tokens need an Ed25519 key")
+        self.prepared_key = key
+        self.algorithm = algorithm
+
+    def is_private(self) -> bool:
+        return isinstance(self.prepared_key, ed25519.Ed25519PrivateKey)
+
+    def sign(self, msg: bytes) -> bytes:
+        return self.prepared_key.sign(msg)
+
+    def verify(self, msg: bytes, sig: bytes) -> bool:
+        try:
+            self.public_key().prepared_key.verify(sig, msg)
+            return True
+        except InvalidSignature:
+            return False
+
+    def public_key(self) -> "Ed25519Key":
+        if not self.is_private():
+            return self
+        return Ed25519Key(self.prepared_key.public_key(), self.algorithm)
+
+    def to_pem(self) -> bytes:
+        return self.public_key().prepared_key.public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+
+
+jwk.register_key("EdDSA", Ed25519Key)
+
+
+def is_symmetric(algorithm: str) -> bool:
+    return algorithm.startswith("HS")
+
+
+def load_key_data(value: str) -> str:
+    """A secret or PEM key from settings, given inline or as a file path."""
+    if os.path.isfile(value):
+        with open(value) as key_file:
+            return key_file.read()
+    return value.replace("\\n", "\n")
+
+
+class TokenKeys:
+    """Key objects for one kind of token, built once instead of per call.
+
+    HMAC algorithms sign and verify with the same secret; for asymmetric ones
+    (RS*, ES*, EdDSA) the setting holds the private key and verification only
+    needs its public half, which other services can use on their own.
+    """
+
+    def __init__(self, key_data: str, algorithm: str) -> None:
+        self.algorithm = algorithm
+        self.signing_key = jwk.construct(load_key_data(key_data), algorithm)
+        self.verifying_key = (
+            self.signing_key
+            if is_symmetric(algorithm)
+            else self.signing_key.public_key()
+        )
+
+    def public_pem(self) -> t.Optional[bytes]:
+        if is_symmetric(self.algorithm):
+            return None
+        return self.verifying_key.to_pem()
+
+
+class TokenVerifier:
+    """Verify signed tokens, remembering recent results by token digest.
+
+    Only the signature and ``exp`` are checked: tokens here carry no audience,
+    issuer or not-before claims, so the rest of python-jose's claim checks are
+    skipped. A cached result is reused until the token or the entry expires.
+    """
+
+    def __init__(self, keys: TokenKeys, cache_size: int, cache_ttl: float) -> None:
+        self.keys = keys
+        self.cache = None
+        if cache_size:
+            self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+
+    def decode(self, token: str) -> dict:
+        digest = hashlib.sha256(token.encode()).digest()
+        now = time.time()
+        if self.cache is not None:
+            claims = self.cache.get(digest)
+            if claims is not None and claims["exp"] > now:
+                return dict(claims)
+        try:
+            payload = jws.verify(
+                token, self.keys.verifying_key, algorithms=[self.keys.algorithm]
+            )
+            claims = json.loads(payload)
+        except (JOSEError, ValueError):
+            raise JWTError("Signature verification failed.")
+        if not isinstance(claims, dict) or not isinstance(
+            claims.get("exp"), (int, float)
+        ):
+            raise JWTError("Token has no valid expiry")
+        if claims["exp"] <= now:
+            raise ExpiredSignatureError("Signature has expired.")
+        if self.cache is not None:
+            ttl = min(self.cache.ttl, claims["exp"] - now)
+            self.cache.set(digest, claims, ttl=ttl)
+        return dict(claims)
+
+
+_verifiers: t.Dict[t.Tuple[str, str], TokenVerifier] = {}
+
+
+def get_verifier(key_data: str, algorithm: t.Optional[str] = None) -> TokenVerifier:
+    algorithm = algorithm or config.algorithm
+    verifier = _verifiers.get((key_data, algorithm))
+    if verifier is None:
+        verifier = TokenVerifier(
+            TokenKeys(key_data, algorithm),
+            cache_size=config.jwt_verify_cache_size,
+            cache_ttl=config.jwt_verify_cache_ttl,
+        )
+        _verifiers[(key_data, algorithm)] = verifier
+    return verifier
+
+
+def access_tokens() -> TokenVerifier:
+    return get_verifier(config.secret_key)
+
+
+def refresh_tokens() -> TokenVerifier:
+    return get_verifier(config.refresh_secret_key)
@@ -0,0 +1,44 @@
+import time
+import typing as t
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Small in-process LRU cache whose entries expire after ``ttl`` seconds."""
+
+    _missing = object()
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[t.Hashable, t.Tuple[float, t.Any]]" = OrderedDict()
+
+    def get(self, key: t.Hashable, default: t.Any = None) -> t.Any:
+        entry = self._data.get(key, self._missing)
+        if entry is self._missing:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: t.Hashable, value: t.Any, ttl: t.Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: t.Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: t.Hashable) -> bool:
+        return self.get(key, self._missing) is not self._missing
+
+    def __len__(self) -> int:
+        return len(self._data)
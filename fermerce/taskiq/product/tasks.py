@@ -0,0 +1,8 @@
+import typing as t
+from fermerce.app.product import search
+from fermerce.taskiq.broker import broker
+
+
+@broker.task
+async def refresh_product_search_documents(product_ids: t.List[str]):
+    await search.refresh_documents(product_ids)
@@ -5,7 +5,7 @@ from fermerce.core.settings import config
 
 
 @broker.task
-def send_users_activation_email(user: dict):
+async def send_users_activation_email(user: dict):
     token: str = security.JWTAUTH.data_encoder(
         data={"user_id": str(user.get("id"))}
     )
@@ -27,11 +27,11 @@ def send_users_activation_email(user: dict):
         context=mail_template_context,
     )
 
-    new_mail.send_mail(email=[user.get("email")])
+    await new_mail.send_mail(email=[user.get("email")])
 
 
 @broker.task
-def send_email_verification_email(user: dict):
+async def send_email_verification_email(user: dict):
     token: str = security.JWTAUTH.data_encoder(
         data={"user_id": str(user.get("id"))}
     )
@@ -52,7 +52,7 @@ def send_email_verification_email(user: dict):
         context=mail_template_context,
     )
 
-    new_mail.send_mail(email=[user.get("email")])
+    await new_mail.send_mail(email=[user.get("email")])
 
 
 @broker.task
@@ -73,7 +73,7 @@ async def send_users_password_reset_link(user: dict):
             context=mail_template_context,
             subject="Password reset link",
         )
-        new_mail.send_mail(email=user.get("email"))
+        await new_mail.send_mail(email=user.get("email"))
 
 
 @broker.task
@@ -95,4 +95,4 @@ async def send_verify_users_password_reset(user: dict):
             context=mail_template_context,
             subject="Password reset link",
         )
-        new_mail.send_mail(email=user.get("email"))
+        await new_mail.send_mail(email=user.get("email"))
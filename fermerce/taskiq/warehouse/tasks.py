@@ -1,32 +1,23 @@
-import typing as t
-import uuid
-from fermerce.app.order.models import Order, OrderItem
-from fermerce.app.warehouse.models import WereHouse
+from fermerce.app.order import routing
+from fermerce.core.settings import config
 from fermerce.taskiq.broker import broker
 
 
 @broker.task
-async def add_order_to_warehouse_and_vendor(order_id: uuid.UUID):
-    get_order = await Order.get_or_none(
-        id=order_id,
-    ).select_related(
-        "shipping_address",
-        "shipping_address__state",
-    )
-    if get_order:
-        get_warehouse = await WereHouse.filter(
-            state=get_order.shipping_address.state,
-        ).first()
-    if get_warehouse:
-        await get_warehouse.orders.add(get_order)
-    if get_order:
-        get_order_items: t.List[OrderItem] = (
-            OrderItem.filter(order=get_order)
-            .select_related("product__vendor", "product")
-            .all()
+async def add_order_to_warehouse_and_vendor(order_id: str) -> None:
+    await routing.route_orders([order_id])
+
+
+@broker.task(schedule=[{"cron": config.order_routing_cron}])
+async def route_pending_orders() -> int:
+    """Drain orders queued since the last run, a batch at a time, after
+    retrying those still waiting for a warehouse."""
+    await routing.retry_unrouted(config.order_routing_batch_size)
+    routed = 0
+    while True:
+        count = await routing.route_pending(
+            config.order_routing_batch_size, config.order_routing_settle_time
         )
-        if get_order_items:
-            if isinstance(get_order_items, list):
-                for item in get_order_items:
-                    await item.product.vendor.orders.add(order=item)
-            await item.product.vendor.orders.add(order=item)
+        routed += count
+        if count < config.order_routing_batch_size:
+            return routed
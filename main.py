@@ -1,9 +1,19 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fermerce.core.settings import config
+from fermerce.app.auth import sessions as auth_sessions
+from fermerce.app.cart import reservation
+from fermerce.app.medias import utils as media_utils
+from fermerce.app.product import search as product_search
+from fermerce.app.user import services as user_services
 from fermerce.lib.db.config import register_tortoise_to_fastapi
-from fermerce.lib.middleware.response_formatter import response_data_transformer
+from fermerce.lib.middleware.response_formatter import ResponseEnvelopeMiddleware
+from fermerce.lib.paystack import client as paystack_client
+from fermerce.lib.utils.responses import ORJSONResponse
+from fermerce.lib.shared.mail import template_finder, transport as mail_transport
 from fermerce.core.router import v1, admin_v1
+from fermerce.core.services import reference
 from fermerce.core.schemas.response import IHealthCheck
 from fermerce.taskiq.broker import broker
 
@@ -20,8 +30,11 @@ def get_application():
         },
         docs_url=f"/{config.api_prefix}/v{int(config.project_version)}/docs",
         debug=config.debug,
+        default_response_class=ORJSONResponse,
     )
     register_tortoise_to_fastapi(_app)
+    if config.response_envelope:
+        _app.add_middleware(ResponseEnvelopeMiddleware)
     _app.add_middleware(
         CORSMiddleware,
         allow_origins=[str(origin) for origin in config.backend_cors_origins],
@@ -30,8 +43,6 @@ def get_application():
         allow_headers=["*"],
     )
 
-    # _app.middleware("http")(response_data_transformer)
-
     return _app
 
 
@@ -45,6 +56,41 @@ async def start_broker():
         await broker.startup()
 
 
+@app.on_event("startup")
+async def preload_reference_data():
+    await reference.preload()
+
+
+@app.on_event("startup")
+async def preload_email_templates():
+    template_finder.preload()
+
+
+@app.on_event("startup")
+async def setup_product_search():
+    await product_search.setup_search_index()
+
+
+@app.on_event("startup")
+async def setup_login_indexes():
+    await user_services.setup_login_indexes()
+
+
+@app.on_event("startup")
+async def open_payment_client():
+    await paystack_client.open()
+
+
+@app.on_event("startup")
+async def start_reservation_sweeper():
+    app.state.reservation_sweeper = asyncio.create_task(reservation.run_sweeper())
+
+
+@app.on_event("startup")
+async def start_session_cleanup():
+    app.state.session_cleanup = asyncio.create_task(auth_sessions.run_cleanup())
+
+
 @app.on_event("shutdown")
 async def app_shutdown():
     if not broker.is_worker_process:
@@ -52,6 +98,31 @@ async def app_shutdown():
         await broker.shutdown()
 
 
+@app.on_event("shutdown")
+async def stop_reservation_sweeper():
+    app.state.reservation_sweeper.cancel()
+
+
+@app.on_event("shutdown")
+async def stop_session_cleanup():
+    app.state.session_cleanup.cancel()
+
+
+@app.on_event("shutdown")
+async def close_payment_client():
+    await paystack_client.close()
+
+
+@app.on_event("shutdown")
+async def stop_image_pool():
+    media_utils.shutdown_image_pool()
+
+
+@app.on_event("shutdown")
+async def close_mail_outbox():
+    await mail_transport.close_outbox()
+
+
 @app.get("/", response_model=IHealthCheck, tags=["Health status"])
 async def health_check():
     return IHealthCheck(